@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: GroupState vs. the original mention-string lists.
+
+Run from the repo root:
+    python benchmarks/bench_group_state.py [--users 40] [--ops 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.group_state import ROLE_KEYS, GroupState  # noqa: E402
+
+
+class LegacyMembers:
+    """The pre-GroupState implementation, copied from LFGButtonView."""
+
+    def __init__(self, creator_mention: str, creator_role: str):
+        self.creator_mention = creator_mention
+        self.members: dict[str, list[str]] = {role: [] for role in ROLE_KEYS}
+        self.members[creator_role].append(creator_mention)
+
+    def join(self, user_mention: str, role: str):
+        for r in self.members:
+            if user_mention in self.members[r]:
+                self.members[r].remove(user_mention)
+        self.members[role].append(user_mention)
+
+    def leave(self, user_mention: str) -> bool:
+        left = False
+        for role, users in self.members.items():
+            if user_mention in users:
+                users.remove(user_mention)
+                left = True
+        return left
+
+    def render(self) -> list[str]:
+        out = []
+        for role, users in self.members.items():
+            out.append("\n".join(
+                f"{i+1}. {user} 👑" if user == self.creator_mention else f"{i+1}. {user}"
+                for i, user in enumerate(users)
+            ))
+        return out
+
+
+def render_state(state: GroupState) -> list[str]:
+    return ["\n".join(state.numbered(role)) for role in ROLE_KEYS]
+
+
+def make_ops(users: int, ops: int, seed: int = 1) -> list[tuple[str, int, str]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(ops):
+        uid = 1000 + rng.randrange(users)
+        if rng.random() < 0.25:
+            out.append(("leave", uid, ""))
+        else:
+            out.append(("join", uid, rng.choice(ROLE_KEYS)))
+    return out
+
+
+def run_legacy(ops, render_every: int = 0):
+    m = LegacyMembers("<@1>", "tank")
+    for i, (kind, uid, role) in enumerate(ops):
+        mention = f"<@{uid}>"
+        if kind == "join":
+            m.join(mention, role)
+        else:
+            m.leave(mention)
+        if render_every and i % render_every == 0:
+            m.render()
+
+
+def run_state(ops, render_every: int = 0):
+    s = GroupState(1, "tank")
+    for i, (kind, uid, role) in enumerate(ops):
+        if kind == "join":
+            s.join(uid, role)
+        else:
+            s.leave(uid)
+        if render_every and i % render_every == 0:
+            render_state(s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=40, help="distinct users clicking on one listing")
+    parser.add_argument("--ops", type=int, default=20000, help="join/leave operations per run")
+    parser.add_argument("--render-every", type=int, default=0,
+                        help="also render the roster every N ops (0 = mutations only)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ops = make_ops(args.users, args.ops)
+    print(f"{args.ops} ops over {args.users} users, render every {args.render_every or '-'}")
+    for name, fn in (("legacy lists", run_legacy), ("GroupState", run_state)):
+        best = min(timeit.repeat(lambda: fn(ops, args.render_every), number=1, repeat=args.repeat))
+        print(f"{name:>14}: {best * 1e3:8.2f} ms  ({best / args.ops * 1e9:7.0f} ns/op)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: /lfgbrowse queries against tens of thousands of open listings.
+
+Fills the listing index with random listings (dungeon, key level, open roles) across a few
+guilds, then times random browse queries (role / dungeon / key range filters, random page)
+interleaved with the updates a busy bot makes (joins, re-roles, closes, new listings).
+A linear scan over the same listings, which is what finding them without the index costs,
+is timed on the same queries for comparison.
+
+Run from the repo root:
+    python benchmarks/bench_listing_index.py [--listings 50000] [--queries 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import percentile  # noqa: E402
+from src.core.group_state import ROLE_KEYS  # noqa: E402
+from src.core.listing_index import IndexedListing, ListingIndex  # noqa: E402
+from src.core.quick import DUNGEONS  # noqa: E402
+
+PAGE_SIZE = 8
+
+
+def make_listing(rng: random.Random, message_id: int, guilds: int) -> IndexedListing:
+    return IndexedListing(
+        message_id=message_id,
+        channel_id=message_id % 97,
+        guild_id=rng.randrange(guilds),
+        dungeon=rng.choice(DUNGEONS),
+        key_level=rng.randint(2, 25),
+        timing=rng.choice(("Timed", "Completion")),
+        listed_as="bench",
+        open_roles=tuple(role for role in ROLE_KEYS if rng.random() < 0.6),
+        members=rng.randint(1, 4),
+        expires_at=time.time() + 1800,
+    )
+
+
+def make_query(rng: random.Random, guilds: int) -> dict:
+    low = rng.choice((None, rng.randint(2, 20)))
+    return {
+        "guild_id": rng.randrange(guilds),
+        "dungeon": rng.choice((None, None, rng.choice(DUNGEONS))),
+        "role": rng.choice((None, *ROLE_KEYS)),
+        "key_min": low,
+        "key_max": rng.choice((None, (low or 2) + rng.randint(0, 5))),
+        "offset": PAGE_SIZE * rng.choice((0, 0, 0, 1, 2)),
+        "limit": PAGE_SIZE,
+    }
+
+
+def naive_query(listings: dict[int, IndexedListing], guild_id, dungeon, role, key_min, key_max, offset, limit):
+    matches = [
+        listing for listing in listings.values()
+        if listing.guild_id == guild_id
+        and (dungeon is None or listing.dungeon == dungeon)
+        and (role is None or role in listing.open_roles)
+        and (key_min is None or listing.key_level >= key_min)
+        and (key_max is None or listing.key_level <= key_max)
+    ]
+    matches.sort(key=lambda listing: -listing.key_level)
+    return matches[offset:offset + limit], len(matches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the open-listing index behind /lfgbrowse.")
+    parser.add_argument("--listings", type=int, default=50_000)
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--naive", type=int, default=500, help="queries to run through the linear scan")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = ListingIndex()
+    listings: dict[int, IndexedListing] = {}
+    start = time.perf_counter()
+    for message_id in range(1, args.listings + 1):
+        listing = make_listing(rng, message_id, args.guilds)
+        index.put(listing)
+        listings[message_id] = listing
+    print(f"{args.listings:,} listings indexed in {time.perf_counter() - start:.2f}s")
+
+    next_id = args.listings + 1
+    query_times, update_times = [], []
+    for _ in range(args.queries):
+        query = make_query(rng, args.guilds)
+        t0 = time.perf_counter()
+        page, total = index.query(**query)
+        query_times.append(time.perf_counter() - t0)
+        if rng.random() < 0.01:
+            expected, expected_total = naive_query(listings, **query)
+            assert total == expected_total, query
+            assert [listing.key_level for listing in page] == [listing.key_level for listing in expected], query
+
+        # One update per query: join, re-role, close or a new listing
+        message_id = rng.choice(list(listings)) if rng.random() < 0.75 else None
+        t0 = time.perf_counter()
+        if message_id is None:
+            listing = make_listing(rng, next_id, args.guilds)
+            next_id += 1
+            index.put(listing)
+        else:
+            kind = rng.random()
+            if kind < 0.5:
+                listing = dataclasses.replace(listings[message_id], members=min(5, listings[message_id].members + 1))
+                index.put(listing)
+            elif kind < 0.8:
+                listing = dataclasses.replace(listings[message_id], open_roles=tuple(rng.sample(ROLE_KEYS, 2)))
+                index.put(listing)
+            else:
+                listing = None
+                index.remove(message_id)
+        update_times.append(time.perf_counter() - t0)
+        if listing is None:
+            del listings[message_id]
+        else:
+            listings[listing.message_id] = listing
+
+    print(f"  query:  p50 {percentile(query_times, 50) * 1e6:.1f} µs, p99 {percentile(query_times, 99) * 1e6:.1f} µs "
+          f"({len(index):,} open at the end)")
+    print(f"  update: p50 {percentile(update_times, 50) * 1e6:.1f} µs, p99 {percentile(update_times, 99) * 1e6:.1f} µs")
+
+    if args.naive:
+        naive_times = []
+        for _ in range(args.naive):
+            query = make_query(rng, args.guilds)
+            t0 = time.perf_counter()
+            naive_query(listings, **query)
+            naive_times.append(time.perf_counter() - t0)
+        print(f"  naive scan ({args.naive:,} queries): p50 {percentile(naive_times, 50) * 1e6:.1f} µs, "
+              f"p99 {percentile(naive_times, 99) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
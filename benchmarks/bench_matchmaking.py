@@ -0,0 +1,117 @@
+"""
+Benchmark: /queue matchmaking with tens of thousands of queued players.
+
+Players arrive one by one with a random dungeon set, key range, timing and role
+(DPS-heavy, like real queues). Reports per-arrival match latency, groups formed and
+validates every group. A naive linear-scan matcher is timed on a prefix of the same
+arrivals for comparison.
+
+Run from the repo root:
+    python benchmarks/bench_matchmaking.py [--players 50000] [--naive 3000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import percentile  # noqa: E402
+from src.core.matchmaking import GROUP_TEMPLATE, Match, MatchQueue, QueueEntry  # noqa: E402
+from src.core.quick import DUNGEONS  # noqa: E402
+
+ROLE_WEIGHTS = {"tank": 0.12, "healer": 0.15, "meleedps": 0.37, "rangeddps": 0.36}
+
+
+def make_players(count: int, guilds: int, seed: int) -> list[QueueEntry]:
+    rng = random.Random(seed)
+    roles, weights = zip(*ROLE_WEIGHTS.items())
+    players = []
+    for user_id in range(1, count + 1):
+        low = rng.randint(2, 20)
+        players.append(QueueEntry(
+            user_id=user_id,
+            guild_id=rng.randrange(guilds),
+            dungeons=tuple(rng.sample(DUNGEONS, rng.choice((1, 2, 3, 8)))),
+            key_min=low,
+            key_max=low + rng.randint(0, 6),
+            timing=rng.choice(("Timed", "Timed", "Completion")),
+            role=rng.choices(roles, weights)[0],
+        ))
+    return players
+
+
+def validate(match: Match) -> None:
+    slots = [e.slot for e in match.members]
+    assert all(slots.count(slot) == need for slot, need in GROUP_TEMPLATE.items()), slots
+    assert len({e.user_id for e in match.members}) == 5
+    for e in match.members:
+        assert match.dungeon in e.dungeons and e.key_min <= match.key_level <= e.key_max
+        assert e.timing == match.timing and e.guild_id == match.guild_id
+
+
+def naive_match(queue: list[QueueEntry], entry: QueueEntry):
+    """Scan the whole queue for compatible players at each (dungeon, level) of the new entry."""
+    queue.append(entry)
+    for dungeon in entry.dungeons:
+        for level in range(entry.key_max, entry.key_min - 1, -1):
+            found = {"tank": [], "healer": [], "dps": []}
+            for other in queue:
+                if (other.guild_id == entry.guild_id and other.timing == entry.timing and dungeon in other.dungeons
+                        and other.key_min <= level <= other.key_max):
+                    found[other.slot].append(other)
+            if all(len(found[slot]) >= need for slot, need in GROUP_TEMPLATE.items()):
+                members = found["tank"][:1] + found["healer"][:1] + found["dps"][:3]
+                for member in members:
+                    queue.remove(member)
+                return members
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /queue matching engine.")
+    parser.add_argument("--players", type=int, default=50_000)
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--naive", type=int, default=3000, help="arrivals to replay through the naive matcher")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    players = make_players(args.players, args.guilds, args.seed)
+    queue = MatchQueue()
+    latencies = []
+    matched = 0
+    peak = 0
+    start = time.perf_counter()
+    for entry in players:
+        t0 = time.perf_counter()
+        match = queue.enqueue(entry)
+        latencies.append(time.perf_counter() - t0)
+        if match is not None:
+            validate(match)
+            matched += 5
+        peak = max(peak, len(queue))
+    total = time.perf_counter() - start
+
+    print(f"{args.players:,} arrivals in {total:.2f}s — {queue.matches:,} groups formed, "
+          f"{matched:,} players matched, {len(queue):,} still queued (peak {peak:,})")
+    print(f"  indexed: p50 {percentile(latencies, 50) * 1e6:.1f} µs, p99 {percentile(latencies, 99) * 1e6:.1f} µs, "
+          f"max {max(latencies) * 1e3:.2f} ms per arrival")
+
+    if args.naive:
+        naive_queue: list[QueueEntry] = []
+        naive_latencies = []
+        for entry in make_players(args.naive, args.guilds, args.seed):
+            t0 = time.perf_counter()
+            naive_match(naive_queue, entry)
+            naive_latencies.append(time.perf_counter() - t0)
+        print(f"  naive scan (first {args.naive:,} arrivals, queue {len(naive_queue):,}): "
+              f"p50 {percentile(naive_latencies, 50) * 1e6:.1f} µs, p99 {percentile(naive_latencies, 99) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
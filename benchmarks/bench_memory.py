@@ -0,0 +1,224 @@
+"""
+Benchmark: resident memory per guild and per open listing, lean vs. default client profile.
+
+Each profile runs in a fresh interpreter with the real bot client (CLIENT_PROFILE) and an
+isolated data dir. Synthetic gateway payloads are fed straight into discord.py's connection
+state, filtered the way the gateway filters them by intents:
+  1. GUILD_CREATE for every guild: roles, text/voice channels, emojis (with the emoji intent),
+     voice states and their members (with the voice intent), the bot's own member
+  2. channel chatter: MESSAGE_CREATE events from other users (with the guild messages intent)
+  3. open listings through the real /lfg handlers (fake REST), plus the MESSAGE_CREATE the
+     gateway echoes for each posted listing (with the guild messages intent)
+RSS is read after a full GC at each step; the deltas are divided by the guild/listing count.
+
+Run from the repo root (Linux; RSS comes from /proc/self/statm):
+    python benchmarks/bench_memory.py [--guilds 500] [--listings 1000] [--messages 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+PROFILES = ("default", "lean")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+BOT_USER_ID = 900_000_000_000_000_000
+
+
+def rss_bytes() -> int:
+    gc.collect()
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, not current
+
+
+# =========================
+# Synthetic gateway payloads
+# =========================
+
+def _user(user_id: int, name: str) -> dict:
+    return {"id": str(user_id), "username": name, "discriminator": "0", "avatar": None, "global_name": name}
+
+
+def _member(user_id: int, name: str) -> dict:
+    return {"user": _user(user_id, name), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+            "deaf": False, "mute": False, "flags": 0}
+
+
+def make_guild(guild_id: int, intents, roles: int, text: int, voice: int, emojis: int, in_voice: int) -> dict:
+    ids = iter(range(guild_id + 1, guild_id + 100_000))
+    text_ids = [next(ids) for _ in range(text)]
+    voice_ids = [next(ids) for _ in range(voice)]
+    data = {
+        "id": str(guild_id), "name": f"guild-{guild_id}", "icon": None, "owner_id": str(guild_id + 99_999),
+        "afk_timeout": 300, "verification_level": 1, "default_message_notifications": 1,
+        "explicit_content_filter": 0, "features": [], "mfa_level": 0, "system_channel_id": None,
+        "premium_tier": 0, "preferred_locale": "en-US", "member_count": 5000, "large": True,
+        "unavailable": False, "nsfw_level": 0, "threads": [], "stickers": [],
+        "roles": [
+            {"id": str(guild_id if i == 0 else next(ids)), "name": "@everyone" if i == 0 else f"role-{i}",
+             "color": 0, "hoist": False, "position": i, "permissions": "0", "managed": False, "mentionable": True}
+            for i in range(roles)
+        ],
+        "channels": [
+            {"id": str(cid), "type": 0, "name": f"text-{n}", "position": n, "permission_overwrites": [],
+             "nsfw": False, "parent_id": None, "topic": "Keys, keys, keys", "rate_limit_per_user": 0}
+            for n, cid in enumerate(text_ids)
+        ] + [
+            {"id": str(cid), "type": 2, "name": f"voice-{n}", "position": n, "permission_overwrites": [],
+             "bitrate": 64000, "user_limit": 0, "parent_id": None}
+            for n, cid in enumerate(voice_ids)
+        ],
+        "members": [_member(BOT_USER_ID, "partycrusher")],
+        "emojis": [],
+        "voice_states": [],
+    }
+    if intents.emojis_and_stickers:
+        data["emojis"] = [
+            {"id": str(next(ids)), "name": f"emoji{n}", "roles": [], "require_colons": True,
+             "managed": False, "animated": False, "available": True}
+            for n in range(emojis)
+        ]
+    if intents.voice_states and voice_ids:
+        for n in range(in_voice):
+            user_id = next(ids)
+            data["members"].append(_member(user_id, f"player{n}"))
+            data["voice_states"].append({
+                "user_id": str(user_id), "channel_id": str(voice_ids[n % len(voice_ids)]), "session_id": "x",
+                "deaf": False, "mute": False, "self_deaf": False, "self_mute": False, "self_video": False,
+                "suppress": False, "request_to_speak_timestamp": None,
+            })
+    return data
+
+
+def make_message(message_id: int, guild_id: int, channel_id: int, author_id: int, content: str,
+                 embeds: list = (), components: list = ()) -> dict:
+    return {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(guild_id),
+        "author": _user(author_id, f"user{author_id % 1000}"),
+        "member": {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0},
+        "content": content, "timestamp": "2024-06-01T12:00:00+00:00", "edited_timestamp": None,
+        "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+        "embeds": list(embeds), "components": list(components), "pinned": False, "type": 0,
+    }
+
+
+# =========================
+# Child: one profile
+# =========================
+
+async def measure(args) -> dict:
+    os.environ["CLIENT_PROFILE"] = args.child
+    from loadtest import create_listing, load_bot
+    from fakes import DEFAULT_LIMITS, FakeChannel, FakeGuild, FakeUser, SimulatedRest
+
+    app = load_bot(0.0)
+    await app.GROUP_STORE.open()
+    await app.HISTORY.open()
+    state = app.bot._connection
+    state.dispatch = lambda *a, **k: None  # no listeners: only what the cache keeps counts
+    intents = app.bot.intents
+
+    result = {"profile": args.child, "intents": intents.value, "max_messages": state.max_messages}
+    base = rss_bytes()
+
+    guild_ids = [10**15 * (i + 1) for i in range(args.guilds)]
+    for guild_id in guild_ids:
+        state._get_create_guild(make_guild(guild_id, intents, args.roles, args.text_channels,
+                                           args.voice_channels, args.emojis, args.in_voice))
+    after_guilds = rss_bytes()
+
+    message_id = 2 * 10**18
+    if intents.guild_messages:
+        for guild_id in guild_ids:
+            for n in range(args.messages):
+                message_id += 1
+                state.parse_message_create(make_message(
+                    message_id, guild_id, guild_id + 1 + args.roles + (n % args.text_channels),
+                    guild_id + 50_000 + n, "anyone for a +12 pit? need heals " * 2,
+                ))
+    after_chatter = rss_bytes()
+
+    rest = SimulatedRest(latency=0, jitter=0, limits={route: None for route in DEFAULT_LIMITS})
+    guild = FakeGuild()
+    channel = FakeChannel(rest, guild)
+    views = []
+    for _ in range(args.listings):
+        view = await create_listing(app, rest, channel, FakeUser())
+        views.append(view)
+        if intents.guild_messages:
+            guild_id = guild_ids[len(views) % len(guild_ids)]
+            rendered = view.render()
+            state.parse_message_create(make_message(
+                view.message.id, guild_id, guild_id + 1 + args.roles, BOT_USER_ID, "",
+                embeds=[rendered.embed.to_dict()], components=view.to_components(),
+            ))
+    await app.EDIT_SCHEDULER.drain()
+    channel.messages.clear()  # the fake channel's own bookkeeping is not bot memory
+    after_listings = rss_bytes()
+
+    await app.HISTORY.close()
+    await app.GROUP_STORE.close()
+    result.update(
+        base_mb=base / 2**20,
+        per_guild_kb=(after_guilds - base) / args.guilds / 1024,
+        chatter_per_guild_kb=(after_chatter - after_guilds) / args.guilds / 1024,
+        per_listing_kb=(after_listings - after_chatter) / max(1, args.listings) / 1024,
+        total_mb=after_listings / 2**20,
+        cached_messages=len(state._messages) if state._messages is not None else 0,
+        cached_members=sum(len(g._members) for g in state.guilds),
+    )
+    return result
+
+
+# =========================
+# Parent: run every profile
+# =========================
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS per guild and per open listing for each client profile.")
+    parser.add_argument("--guilds", type=int, default=500)
+    parser.add_argument("--listings", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=50, help="chatter messages per guild")
+    parser.add_argument("--roles", type=int, default=40)
+    parser.add_argument("--text-channels", type=int, default=30)
+    parser.add_argument("--voice-channels", type=int, default=10)
+    parser.add_argument("--emojis", type=int, default=50)
+    parser.add_argument("--in-voice", type=int, default=15, help="members in voice per guild")
+    parser.add_argument("--child", choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args))))
+        return
+
+    results = []
+    for profile in PROFILES:
+        proc = subprocess.run([sys.executable, __file__, *sys.argv[1:], "--child", profile],
+                              capture_output=True, text=True, check=True)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{args.guilds} guilds ({args.roles} roles, {args.text_channels}+{args.voice_channels} channels, "
+          f"{args.emojis} emojis, {args.in_voice} in voice), {args.messages} messages/guild, "
+          f"{args.listings} open listings")
+    columns = ("profile", "per_guild_kb", "chatter_per_guild_kb", "per_listing_kb", "total_mb",
+               "cached_messages", "cached_members")
+    print(" | ".join(f"{c:>20}" for c in columns))
+    for row in results:
+        print(" | ".join(f"{row[c]:>20.1f}" if isinstance(row[c], float) else f"{row[c]:>20}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: /lfgquick parser (precompiled tokenizer + alias/prefix index) against a naive
+parser that splits on whitespace and scans every alias list for each word.
+
+The corpus is shorthand as people actually type it in LFG channels.
+Run from the repo root:
+    python benchmarks/bench_quick.py [--repeat 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.quick import (  # noqa: E402
+    DUNGEON_ALIASES, DUNGEONS, NEED_WORDS, ROLE_ALIASES, TIMING_ALIASES, QuickParseError, parse_quick,
+)
+
+CORPUS = [
+    "pos 14 timed heal need tank,dps lust",
+    "pit of saron +12 comp tank lf heal/rdps brez",
+    "sky 15 timed t need h mdps rdps",
+    "Skyreach 10 resto lf tank dps",
+    "aa +18 time tank need heal dps bl",
+    "algethar 7 chill melee need t h",
+    "Algeth'ar Academy 20 timed rdps lf tank healer",
+    "seat 16 timed heal need tank melee ranged lust brez",
+    "sott k13 comp dps lfm tank heal",
+    "seat of the triumvirate 11 ranged need all",
+    "wrs 9 tank need heals and dps",
+    "windrunner spire +15 timed healer lf tank, mdps, rdps",
+    "spire 12 comp t lf h/dps",
+    "npx 17 timed melee need tank heal caster",
+    "nexus 8 heal need tank dps kick",
+    "Nexus-Point Xenas 21 timed tank need healer rdps lust brez",
+    "mgt 14 timed rdps need t h",
+    "magi +10 chill heal lf t dps",
+    "magisters 19 time tank lf heal melee ranged",
+    "mc 6 comp melee need tank heal",
+    "maisara caverns +13 timed h need t, dps",
+    "caverns 16 intime tank lfm heal dps pw:pump",
+    "pos 22 timed tank need h dps name:PushNight",
+    "pit 9 comp resto need prot mdps rdps",
+    "sr +14 timed caster need tank healer",
+    "sky k11 untimed mdps lf t h",
+    "aa 5 chill dps need tank heal dps",
+    "sott 15 timed tank need h dps io 2800+",
+    "wrs 13 timed h need tank mdps bl",
+    "mgt 18 timed melee lf tank heal rdps brez lust",
+]
+
+
+# ---- naive baseline: what a first implementation usually looks like ----
+
+def naive_parse(text: str):
+    dungeon = key = role = timing = None
+    required, extras = [], []
+    needing = False
+    words = text.replace(",", " ").replace("/", " ").split()
+    i = 0
+    while i < len(words):
+        word = words[i].strip("+").lower()
+        i += 1
+        if re.fullmatch(r"k?\d{1,2}", word):
+            key = key or int(word.lstrip("k"))
+            continue
+        if word in NEED_WORDS:
+            needing = True
+            continue
+        found = None
+        for name in DUNGEONS:
+            full = re.sub(r"[^a-z0-9]", "", name.lower())
+            for n in range(4, 0, -1):
+                joined = re.sub(r"[^a-z0-9]", "", "".join(words[i - 1:i - 1 + n]).lower())
+                if joined == full:
+                    found, i = name, i + n - 1
+                    break
+            if found:
+                break
+            for alias in DUNGEON_ALIASES[name]:
+                if word == alias or (len(word) >= 3 and alias.startswith(word)):
+                    found = name
+                    break
+            if found:
+                break
+        if found and dungeon is None:
+            dungeon = found
+            continue
+        for roles, aliases in ROLE_ALIASES.items():
+            if word in aliases:
+                if needing:
+                    required.extend(roles)
+                elif role is None and len(roles) == 1:
+                    role = roles[0]
+                found = roles
+                break
+        if found:
+            continue
+        for value, aliases in TIMING_ALIASES.items():
+            if word in aliases:
+                timing = found = value
+                break
+        if not found:
+            needing = False
+            extras.append(word)
+    return dungeon, key, role, timing, required, extras
+
+
+def fast_parse(text: str):
+    try:
+        return parse_quick(text)
+    except QuickParseError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /lfgquick parser.")
+    parser.add_argument("--repeat", type=int, default=2000, help="passes over the corpus")
+    args = parser.parse_args()
+
+    parsed = sum(fast_parse(s) is not None for s in CORPUS)
+    print(f"Corpus: {len(CORPUS)} strings, {parsed} parse into a listing")
+
+    for name, fn in (("naive split + scan", naive_parse), ("tokenizer + index", fast_parse)):
+        elapsed = timeit.timeit(lambda: [fn(s) for s in CORPUS], number=args.repeat)
+        per_call = elapsed / (args.repeat * len(CORPUS)) * 1e6
+        print(f"{name:>20}: {per_call:7.2f} µs/parse  ({args.repeat * len(CORPUS) / elapsed:,.0f} parses/s)")
+
+
+if __name__ == "__main__":
+    main()
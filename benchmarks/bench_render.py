@@ -0,0 +1,67 @@
+"""
+Benchmark: ListingRenderer with and without section caching (no Discord connection needed).
+
+Simulates a listing receiving a stream of clicks, rendering after each one.
+Run from the repo root:
+    python benchmarks/bench_render.py [--renders 20000] [--users 15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.core.group_state import ROLE_KEYS, GroupState  # noqa: E402
+from src.core.listing import Listing, ListingRenderer  # noqa: E402
+
+
+def make_listing() -> Listing:
+    return Listing(
+        dungeon="Pit of Saron",
+        key_level=14,
+        timing="Timed",
+        your_role="Tank",
+        listed_as="KC: Pit of Saron - abcd1234",
+        passphrase="s3cr3tpw",
+        requirements="Lust, battle res",
+        required_roles=["Healer", "Melee DPS", "Ranged DPS"],
+    )
+
+
+def run(renders: int, users: int, cache: bool, seed: int = 7) -> tuple[int, int]:
+    rng = random.Random(seed)
+    listing = make_listing()
+    state = GroupState(1, "tank")
+    renderer = ListingRenderer(cache=cache)
+    looking_for = "<@&1>, <@&2>, <@&3>"
+    for _ in range(renders):
+        uid = 100 + rng.randrange(users)
+        if rng.random() < 0.2:
+            state.leave(uid)
+        else:
+            state.join(uid, rng.choice(ROLE_KEYS[1:]))
+        renderer.render(listing, state, looking_for)
+    return renderer.hits, renderer.misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, cache in (("uncached", False), ("cached", True)):
+        best = min(timeit.repeat(lambda: run(args.renders, args.users, cache), number=1, repeat=args.repeat))
+        hits, misses = run(args.renders, args.users, cache)
+        print(f"{label:>9}: {best * 1e3:8.2f} ms  ({best / args.renders * 1e6:6.2f} µs/render)"
+              f"  section hits={hits} misses={misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: cold start — import time and time until the bot would connect to the gateway.
+
+Each run is a fresh interpreter with an isolated data dir: it imports `bot`, then runs
+`setup_hook` offline (no token check, no command sync, no metrics port) and reports the
+startup phases the bot records itself (`import`, `setup`), plus what importing the
+on-demand UI modules would have added. `-X importtime` gives the per-module breakdown.
+
+Run from the repo root:
+    python benchmarks/bench_startup.py [--runs 10] [--top 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHILD = r"""
+import asyncio, json, time
+import bot
+
+async def start():
+    async with bot.bot:
+        await bot.bot.setup_hook()
+
+asyncio.run(start())
+t0 = time.perf_counter()
+import src.bot.views, src.bot.pages
+ui = time.perf_counter() - t0
+print(json.dumps({**bot.app.STARTUP, "ui_on_demand": ui}))
+"""
+
+
+def run_once(importtime: bool) -> tuple[dict, str]:
+    env = dict(
+        os.environ,
+        DISCORD_TOKEN="offline-benchmark",
+        DATA_DIR=tempfile.mkdtemp(prefix="lfg-startup-"),
+        METRICS_PORT="0",
+        CLUSTER_ID="1",  # only cluster 0 syncs commands
+    )
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", CHILD]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def top_imports(stderr: str, top: int) -> list[tuple[int, str]]:
+    """(cumulative µs, module) for first-party modules from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit() and (name.startswith("src.") or name in ("bot", "discord")):
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bot import and startup time.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="slowest first-party imports to list")
+    args = parser.parse_args()
+
+    runs = [run_once(importtime=False)[0] for _ in range(args.runs)]
+    for phase in ("import", "setup", "ui_on_demand"):
+        values = [r[phase] * 1000 for r in runs if phase in r]
+        print(f"{phase:>13}: median {statistics.median(values):7.1f} ms   "
+              f"min {min(values):7.1f} ms   max {max(values):7.1f} ms")
+
+    _, stderr = run_once(importtime=True)
+    print("\nslowest imports (cumulative, one run):")
+    for micros, name in top_imports(stderr, args.top):
+        print(f"  {micros / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
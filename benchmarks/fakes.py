@@ -0,0 +1,235 @@
+"""
+Offline stand-ins for the discord.py objects the LFG handlers touch, plus a simulated
+REST layer with Discord-like latency and per-route rate-limit buckets.
+
+Shared by the load-test harness and the trace replayer. Nothing here opens a socket.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict, deque
+from typing import Any, Optional
+
+_ids = itertools.count(1_100_000_000_000_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+# =========================
+# Simulated REST layer
+# =========================
+
+# route -> (requests allowed, window seconds); None = not rate limited
+DEFAULT_LIMITS: dict[str, Optional[tuple[int, float]]] = {
+    "POST /interactions/{interaction_id}/{interaction_token}/callback": None,
+    "DELETE /webhooks/{application_id}/{interaction_token}/messages/@original": (5, 1.0),
+    "POST /webhooks/{application_id}/{interaction_token}": (5, 1.0),
+    "POST /channels/{channel_id}/messages": (5, 5.0),
+    "PATCH /channels/{channel_id}/messages/{message_id}": (5, 5.0),
+    "POST /users/@me/channels": (10, 10.0),
+}
+
+
+class SimulatedRest:
+    """
+    Every fake REST call goes through `call()`: it waits for a free slot in the route's
+    bucket (counting a 429 and the retry-after it would have cost), then sleeps for a
+    jittered network latency.
+    """
+
+    def __init__(self, latency: float = 0.04, jitter: float = 0.02, seed: int = 1,
+                 limits: Optional[dict[str, Optional[tuple[int, float]]]] = None, scheduler=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.rng = random.Random(seed)
+        self.calls: Counter[str] = Counter()
+        self.rate_limited = 0
+        self.retry_after_total = 0.0
+        self._buckets: dict[tuple[str, Any], deque[float]] = defaultdict(deque)
+        self.listeners: list = []
+        # Optional src.core.rest_priority.RestScheduler: every call holds a slot, like the real client
+        self.scheduler = scheduler
+
+    async def call(self, route: str, bucket_key: Any = None) -> None:
+        if self.scheduler is None:
+            return await self._call(route, bucket_key)
+        from src.core.rest_priority import classify
+        async with self.scheduler.slot(classify(*route.split(" ", 1))):
+            await self._call(route, bucket_key)
+
+    async def _call(self, route: str, bucket_key: Any) -> None:
+        limit = self.limits.get(route)
+        if limit is not None:
+            allowed, window = limit
+            bucket = self._buckets[(route, bucket_key)]
+            while True:
+                now = time.perf_counter()
+                while bucket and bucket[0] <= now - window:
+                    bucket.popleft()
+                if len(bucket) < allowed:
+                    bucket.append(now)
+                    break
+                retry_after = bucket[0] + window - now
+                self.rate_limited += 1
+                self.retry_after_total += retry_after
+                await asyncio.sleep(retry_after)
+        self.calls[route] += 1
+        for listener in self.listeners:
+            listener(route)
+        await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+
+
+# =========================
+# Fake Discord objects
+# =========================
+
+class FakeRole:
+    def __init__(self, name: str, guild: "FakeGuild"):
+        self.id = next_id()
+        self.name = name
+        self.guild = guild
+        self.mention = f"<@&{self.id}>"
+
+
+class FakeGuild:
+    def __init__(self, role_names=("Tank", "Healer", "Melee DPS", "Ranged DPS")):
+        self.id = next_id()
+        self.roles: list[FakeRole] = []
+        self.roles = [FakeRole(name, self) for name in role_names]
+        self.shard_id = 0
+
+
+class FakeUser:
+    def __init__(self, user_id: Optional[int] = None, name: str = "user"):
+        self.id = user_id or next_id()
+        self.name = name
+        self.mention = f"<@{self.id}>"
+        self.dm_channel = None
+
+    async def create_dm(self):
+        return self
+
+
+class FakeMessage:
+    def __init__(self, rest: SimulatedRest, channel: "FakeChannel", embed=None, view=None):
+        self.id = next_id()
+        self.rest = rest
+        self.channel = channel
+        self.guild = channel.guild
+        self.embeds = [embed] if embed else []
+        self.view = view
+        self.edits = 0
+
+    async def edit(self, *, embed=None, view=None, **_kwargs):
+        await self.rest.call("PATCH /channels/{channel_id}/messages/{message_id}", self.channel.id)
+        self.edits += 1
+        if embed is not None:
+            self.embeds = [embed]
+        self.view = view
+        return self
+
+
+class FakeChannel:
+    def __init__(self, rest: SimulatedRest, guild: Optional[FakeGuild]):
+        self.id = next_id()
+        self.rest = rest
+        self.guild = guild
+        self.messages: list[FakeMessage] = []
+
+    async def send(self, content=None, *, embed=None, view=None, **_kwargs) -> FakeMessage:
+        await self.rest.call("POST /channels/{channel_id}/messages", self.id)
+        message = FakeMessage(self.rest, self, embed=embed, view=view)
+        self.messages.append(message)
+        return message
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        message = FakeMessage(self.rest, self)
+        message.id = message_id
+        return message
+
+
+class FakeResponse:
+    """interaction.response: the first call acknowledges the interaction."""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+        self.sent: list[dict] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self, kind: str, **payload):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        await self._interaction.rest.call("POST /interactions/{interaction_id}/{interaction_token}/callback")
+        self._interaction.acked_at = time.perf_counter()
+        self.sent.append({"kind": kind, **payload})
+
+    async def send_message(self, content=None, *, view=None, ephemeral=False, **kwargs):
+        await self._ack("message", content=content, view=view, ephemeral=ephemeral, **kwargs)
+
+    async def defer(self, **kwargs):
+        await self._ack("defer", **kwargs)
+
+    async def edit_message(self, **kwargs):
+        await self._ack("edit", **kwargs)
+
+    async def send_modal(self, modal):
+        await self._ack("modal", modal=modal)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        await self._interaction.rest.call("POST /webhooks/{application_id}/{interaction_token}", self._interaction.id)
+        self._interaction.response.sent.append({"kind": "followup", "content": content, **kwargs})
+
+
+class FakeInteraction:
+    def __init__(self, rest: SimulatedRest, user: FakeUser, channel: FakeChannel, message: Optional[FakeMessage] = None,
+                 data: Optional[dict] = None):
+        self.id = next_id()
+        self.rest = rest
+        self.user = user
+        self.channel = channel
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id if channel.guild else None
+        self.message = message
+        self.data = data or {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.created_at = time.perf_counter()
+        self.acked_at: Optional[float] = None
+
+    async def edit_original_response(self, **kwargs):
+        await self.rest.call("PATCH /webhooks/{application_id}/{interaction_token}/messages/@original", self.id)
+        self.response.sent.append({"kind": "edit_original", **kwargs})
+
+    async def delete_original_response(self):
+        await self.rest.call("DELETE /webhooks/{application_id}/{interaction_token}/messages/@original", self.id)
+
+    @property
+    def ack_latency(self) -> Optional[float]:
+        return None if self.acked_at is None else self.acked_at - self.created_at
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
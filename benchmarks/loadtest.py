@@ -0,0 +1,179 @@
+"""
+Offline load test: drives the real LFG handlers with simulated interactions.
+
+Each run creates G listings via /lfg → RoleMultiSelect, then fires N join/leave clicks
+across them with at most C clicks in flight, against a simulated REST layer with
+Discord-like latency and rate limits. Reports throughput, ack latency percentiles,
+edits per group and 429s, and can diff against a saved baseline.
+
+Run from the repo root:
+    python benchmarks/loadtest.py --groups 20 --clicks 500 --concurrency 50,200,500
+    python benchmarks/loadtest.py --json after.json --baseline before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import (  # noqa: E402
+    FakeChannel, FakeGuild, FakeInteraction, FakeUser, SimulatedRest, percentile,
+)
+
+ROLE_HANDLERS = ("_handle_tank", "_handle_healer", "_handle_melee", "_handle_ranged")
+
+
+def load_bot(window: float):
+    """Import bot.py with an isolated data dir and a dummy token (never connects)."""
+    os.environ.setdefault("DISCORD_TOKEN", "offline-benchmark")
+    os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="lfg-bench-")
+    os.environ["EDIT_COALESCE_WINDOW"] = str(window)
+    os.environ["METRICS_PORT"] = "0"
+    import bot as app
+    return app
+
+
+async def create_listing(app, rest: SimulatedRest, channel: FakeChannel, creator: FakeUser):
+    """/lfg → role select → public listing. Returns the LFGButtonView."""
+    interaction = FakeInteraction(rest, creator, channel)
+    await app.lfg.callback(
+        interaction, dungeon="Pit of Saron", key_level=14, timing="Timed", your_role="Tank",
+    )
+    select_view = interaction.response.sent[0]["view"]
+    select = select_view.children[0]
+    select._values = ["Healer", "Melee DPS", "Ranged DPS"]
+
+    select_interaction = FakeInteraction(rest, creator, channel)
+    await select.callback(select_interaction)
+    return channel.messages[-1].view
+
+
+async def run_level(app, groups: int, clicks: int, concurrency: int, leave_ratio: float, seed: int,
+                    rest_slots: int = 0, fifo: bool = False) -> dict:
+    rng = random.Random(seed)
+    scheduler = None
+    if rest_slots:
+        from src.core.rest_priority import RestScheduler
+        scheduler = RestScheduler(max_in_flight=rest_slots, reserve=max(1, rest_slots // 5), prioritize=not fifo)
+    rest = SimulatedRest(seed=seed, scheduler=scheduler)
+    guild = FakeGuild()
+    channels = [FakeChannel(rest, guild) for _ in range(max(1, groups // 5))]
+
+    views = []
+    for i in range(groups):
+        views.append(await create_listing(app, rest, channels[i % len(channels)], FakeUser()))
+
+    users = [FakeUser() for _ in range(max(50, clicks // 4))]
+    render_requests_before = app.EDIT_SCHEDULER.total_requests
+    sem = asyncio.Semaphore(concurrency)
+    interactions: list[FakeInteraction] = []
+    handler_times: list[float] = []
+
+    async def click():
+        view = rng.choice(views)
+        user = rng.choice(users)
+        interaction = FakeInteraction(rest, user, view.message.channel, message=view.message)
+        interactions.append(interaction)
+        if rng.random() < leave_ratio:
+            handler = view._handle_leave
+        else:
+            handler = getattr(view, rng.choice(ROLE_HANDLERS))
+        async with sem:
+            start = time.perf_counter()
+            await handler(interaction)
+            handler_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(click() for _ in range(clicks)))
+    handled = time.perf_counter() - start
+    await app.EDIT_SCHEDULER.drain()
+    settled = time.perf_counter() - start
+
+    acks = [i.ack_latency for i in interactions if i.ack_latency is not None]
+    edits = [v.message.edits for v in views]
+    return {
+        "groups": groups,
+        "clicks": clicks,
+        "concurrency": concurrency,
+        "throughput_per_s": round(clicks / handled, 1),
+        "settle_s": round(settled, 3),
+        "ack_p50_ms": round(percentile(acks, 50) * 1000, 2),
+        "ack_p99_ms": round(percentile(acks, 99) * 1000, 2),
+        "acks_over_3s": sum(a > 3.0 for a in acks),
+        "handler_p50_ms": round(percentile(handler_times, 50) * 1000, 2),
+        "handler_p99_ms": round(percentile(handler_times, 99) * 1000, 2),
+        "render_requests": app.EDIT_SCHEDULER.total_requests - render_requests_before,
+        "edits_per_group_avg": round(sum(edits) / len(edits), 2),
+        "edits_per_group_max": max(edits),
+        "rest_calls": sum(rest.calls.values()),
+        "rate_limited": rest.rate_limited,
+        "retry_after_s": round(rest.retry_after_total, 2),
+    }
+
+
+def print_table(results: list[dict], baseline: dict[int, dict]) -> None:
+    keys = [k for k in results[0] if k not in ("groups", "clicks")]
+    print(" | ".join(f"{k:>18}" for k in keys))
+    for row in results:
+        cells = []
+        for k in keys:
+            value = row[k]
+            base = baseline.get(row["concurrency"], {}).get(k)
+            if base not in (None, 0) and k != "concurrency":
+                cells.append(f"{value} ({(value - base) / base:+.0%})".rjust(18))
+            else:
+                cells.append(f"{value:>18}")
+        print(" | ".join(cells))
+
+
+async def main_async(args) -> list[dict]:
+    app = load_bot(args.window)
+    await app.GROUP_STORE.open()
+    await app.HISTORY.open()
+    results = []
+    for level in args.concurrency:
+        results.append(await run_level(
+            app, args.groups, args.clicks, level, args.leave_ratio, args.seed, args.rest_slots, args.fifo,
+        ))
+    await app.HISTORY.close()
+    await app.GROUP_STORE.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline LFG load test with simulated interactions.")
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--clicks", type=int, default=500)
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[50, 200, 500])
+    parser.add_argument("--leave-ratio", type=float, default=0.2)
+    parser.add_argument("--window", type=float, default=0.75, help="edit coalescing window (EDIT_COALESCE_WINDOW)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rest-slots", type=int, default=0,
+                        help="cap in-flight REST calls with the priority scheduler (0 = no scheduler)")
+    parser.add_argument("--fifo", action="store_true", help="with --rest-slots: same cap, but no priority classes")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against results from a previous --json run")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    baseline = {}
+    if args.baseline and args.baseline.exists():
+        baseline = {row["concurrency"]: row for row in json.loads(args.baseline.read_text())}
+    print_table(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
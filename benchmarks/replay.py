@@ -0,0 +1,364 @@
+"""
+Offline trace replay: feeds a recorded interaction trace (TRACE_FILE, src/core/trace.py)
+back through the real command handlers and LFGButtonView against the simulated REST layer.
+
+Every hashed guild, channel and user of the trace gets its own fake. Each user's interactions
+replay in order, one at a time; different users run concurrently, each interaction starting
+at its recorded time divided by --speed (0 = no waiting).
+  - commands call the slash command's callback with the recorded options (the /lfg
+    passphrase is not recorded, so one is generated)
+  - clicks on a listing go to the listing the trace created under that message hash; a
+    listing created before recording started gets a stand-in /lfg listing in its channel
+  - selects, the other buttons and modal submits go to the view/modal the same user was
+    last sent (ephemeral components have no stable custom_id)
+Reports handler and ack latency per handler next to the recorded handler time, and REST
+calls per route next to the recorded counts. Save with --json and diff two bot versions
+with --baseline, like loadtest.py.
+
+Run from the repo root:
+    python benchmarks/replay.py trace.jsonl [--speed 1] [--json after.json] [--baseline before.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import (  # noqa: E402
+    FakeChannel, FakeGuild, FakeInteraction, FakeUser, SimulatedRest, percentile,
+)
+from loadtest import create_listing, load_bot  # noqa: E402
+
+# custom_ids of the public listing's buttons (see LFGButtonView)
+LISTING_CUSTOM_IDS = frozenset({
+    "tank", "healer", "meleedps", "rangeddps", "edit_requirements", "waitlist", "leave", "cancel",
+})
+COMPONENT_SELECT = 3
+
+
+class Replayer:
+    def __init__(self, app, rest: SimulatedRest, entries: list[dict]):
+        self.app = app
+        self.rest = rest
+        self.entries = entries
+        self.guilds: dict[Optional[str], FakeGuild] = {}
+        self.channels: dict[Optional[str], FakeChannel] = {}
+        self.users: dict[Optional[str], FakeUser] = {}
+        # message hash -> the listing view it was replayed as (None if its creation failed)
+        self.listings: dict[str, asyncio.Future] = {}
+        self.created_in_trace = {h for entry in entries for h in entry.get("created", ())}
+        self.stand_ins: dict[str, asyncio.Task] = {}
+        # user hash -> the last view / modal that user was sent
+        self.pending_view: dict[Optional[str], Any] = {}
+        self.pending_modal: dict[Optional[str], Any] = {}
+        self.results: list[dict] = []
+        self.skipped: Counter[str] = Counter()
+        self.started = 0.0
+
+    # ---- fakes per hash ----
+
+    def channel(self, entry: dict) -> FakeChannel:
+        channel = self.channels.get(entry["channel"])
+        if channel is None:
+            guild = self.guilds.get(entry["guild"])
+            if guild is None and entry["guild"] is not None:
+                guild = self.guilds[entry["guild"]] = FakeGuild()
+            channel = self.channels[entry["channel"]] = FakeChannel(self.rest, guild)
+        return channel
+
+    def user(self, key: Optional[str]) -> FakeUser:
+        user = self.users.get(key)
+        if user is None:
+            user = self.users[key] = FakeUser()
+        return user
+
+    def listing_future(self, message_hash: str) -> asyncio.Future:
+        future = self.listings.get(message_hash)
+        if future is None:
+            future = self.listings[message_hash] = asyncio.get_running_loop().create_future()
+        return future
+
+    async def listing(self, entry: dict):
+        message_hash = entry["message"]
+        if message_hash in self.created_in_trace:
+            return await self.listing_future(message_hash)
+        # Posted before recording started: stand in with a fresh listing in the same channel
+        stand_in = self.stand_ins.get(message_hash)
+        if stand_in is None:
+            stand_in = self.stand_ins[message_hash] = asyncio.create_task(
+                create_listing(self.app, self.rest, self.channel(entry), FakeUser())
+            )
+        return await stand_in
+
+    def _settle_created(self, entry: dict, message_ids: list[int]) -> None:
+        """Hand the listings an interaction posted to the clicks waiting for them."""
+        for n, message_hash in enumerate(entry.get("created", ())):
+            future = self.listing_future(message_hash)
+            if not future.done():
+                future.set_result(self.app.OPEN_VIEWS.get(message_ids[n]) if n < len(message_ids) else None)
+
+    # ---- replay ----
+
+    async def run(self, speed: float) -> float:
+        lanes: dict[Optional[str], list[dict]] = defaultdict(list)
+        for entry in self.entries:
+            lanes[entry["user"]].append(entry)
+        self.started = time.perf_counter()
+        await asyncio.gather(*(self._lane(user, entries, self.started, speed) for user, entries in lanes.items()))
+        return time.perf_counter() - self.started
+
+    async def _lane(self, user: Optional[str], entries: list[dict], start: float, speed: float) -> None:
+        for entry in entries:
+            if speed > 0:
+                delay = start + entry["t"] / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self._dispatch(entry)
+
+    async def _dispatch(self, entry: dict) -> None:
+        from src.core.trace import CURRENT_TRACE, TraceEntry
+
+        kind = entry["kind"]
+        message = None
+        view = None
+        if kind == "component" and entry.get("custom_id") in LISTING_CUSTOM_IDS:
+            view = await self.listing(entry)
+            if view is None:
+                self.skipped[entry.get("handler") or kind] += 1
+                return
+            message = view.message
+        interaction = FakeInteraction(self.rest, self.user(entry["user"]), self.channel(entry), message=message)
+
+        handler = self._handler(entry, interaction, view)
+        if handler is None:
+            self.skipped[entry.get("handler") or kind] += 1
+            self._settle_created(entry, [])
+            return
+        # Collect the listings this interaction posts and the REST calls it makes, like the recorder
+        trace = TraceEntry(None, interaction.created_at, {})
+        token = CURRENT_TRACE.set(trace)
+        try:
+            await handler()
+        except Exception as e:
+            self.skipped[f"{entry.get('handler') or kind} ({type(e).__name__})"] += 1
+            return
+        finally:
+            CURRENT_TRACE.reset(token)
+            self._settle_created(entry, trace.created)
+        handler_s = time.perf_counter() - interaction.created_at
+
+        self._remember_pending(entry["user"], interaction)
+        self.results.append({
+            "handler": entry.get("handler") or kind,
+            "recorded_ms": entry.get("handler_ms"),
+            "recorded_rest": [route for route, _ in entry.get("rest", ())],
+            "handler_s": handler_s,
+            "ack_s": interaction.ack_latency,
+            "rest": [route for route, _ in trace.rest],
+        })
+
+    def _handler(self, entry: dict, interaction: FakeInteraction, view):
+        kind = entry["kind"]
+        if kind == "application_command":
+            name, *path = entry["command"].split()
+            command = self.app.bot.tree.get_command(name)
+            for part in path:
+                command = command.get_command(part) if command is not None else None
+            if command is None:
+                return None
+            return lambda: command.callback(interaction, **entry.get("options", {}))
+
+        if kind == "component":
+            if view is not None:
+                item = next((i for i in view.children if getattr(i, "custom_id", None) == entry["custom_id"]), None)
+            else:
+                item = self._pending_item(entry)
+            if item is None:
+                return None
+            if entry.get("component_type") == COMPONENT_SELECT:
+                item._values = list(entry.get("values", ()))
+            return lambda: item.callback(interaction)
+
+        if kind == "modal_submit":
+            modal = self.pending_modal.pop(entry["user"], None)
+            if modal is None:
+                return None
+            for item, value in zip(modal.children, entry.get("values", ())):
+                item._value = value
+            return lambda: modal.on_submit(interaction)
+        return None
+
+    def _pending_item(self, entry: dict):
+        import discord
+
+        view = self.pending_view.get(entry["user"])
+        if view is None:
+            return None
+        wanted = discord.ui.Select if entry.get("component_type") == COMPONENT_SELECT else discord.ui.Button
+        return next((item for item in view.children if isinstance(item, wanted) and not item.disabled), None)
+
+    def _remember_pending(self, user: Optional[str], interaction: FakeInteraction) -> None:
+        for sent in interaction.response.sent:
+            if sent.get("modal") is not None:
+                self.pending_modal[user] = sent["modal"]
+            elif "view" in sent:
+                # edit_message(view=None) closes the ephemeral view
+                self.pending_view[user] = sent["view"]
+
+
+# =========================
+# Report
+# =========================
+
+def summarize(results: list[dict], rest: SimulatedRest, elapsed: float, settled: float,
+              edits: int, skipped: Counter) -> dict:
+    by_handler: dict[str, list[dict]] = defaultdict(list)
+    for result in results:
+        by_handler[result["handler"]].append(result)
+
+    handlers = []
+    for name, rows in sorted(by_handler.items(), key=lambda item: -len(item[1])):
+        recorded = [r["recorded_ms"] for r in rows if r["recorded_ms"] is not None]
+        acks = [r["ack_s"] for r in rows if r["ack_s"] is not None]
+        times = [r["handler_s"] for r in rows]
+        handlers.append({
+            "handler": name,
+            "count": len(rows),
+            "recorded_p50_ms": round(percentile(recorded, 50), 2),
+            "p50_ms": round(percentile(times, 50) * 1000, 2),
+            "p99_ms": round(percentile(times, 99) * 1000, 2),
+            "ack_p50_ms": round(percentile(acks, 50) * 1000, 2),
+            "ack_p99_ms": round(percentile(acks, 99) * 1000, 2),
+            "recorded_rest": sum(len(r["recorded_rest"]) for r in rows),
+            "rest": sum(len(r["rest"]) for r in rows),
+        })
+
+    recorded_routes = Counter(route for r in results for route in r["recorded_rest"])
+    routes = [
+        {"route": route, "recorded": recorded_routes.get(route, 0), "calls": rest.calls.get(route, 0)}
+        for route in sorted(set(recorded_routes) | set(rest.calls))
+    ]
+    acks = [r["ack_s"] for r in results if r["ack_s"] is not None]
+    totals = {
+        "interactions": len(results),
+        "skipped": sum(skipped.values()),
+        "replay_s": round(elapsed, 3),
+        "settle_s": round(settled, 3),
+        "ack_p50_ms": round(percentile(acks, 50) * 1000, 2),
+        "ack_p99_ms": round(percentile(acks, 99) * 1000, 2),
+        "acks_over_3s": sum(a > 3.0 for a in acks),
+        "rest_calls": sum(rest.calls.values()),
+        "rate_limited": rest.rate_limited,
+        "retry_after_s": round(rest.retry_after_total, 2),
+        "listing_edits": edits,
+    }
+    return {"totals": totals, "handlers": handlers, "routes": routes, "skipped": dict(skipped)}
+
+
+def _cell(value, base, width: int) -> str:
+    if isinstance(value, (int, float)) and isinstance(base, (int, float)) and base:
+        return f"{value} ({(value - base) / base:+.0%})".rjust(width)
+    return f"{value}".rjust(width)
+
+
+def print_report(report: dict, baseline: dict) -> None:
+    base_totals = baseline.get("totals", {})
+    for key, value in report["totals"].items():
+        print(f"{key:>16}: {_cell(value, base_totals.get(key), 0).strip()}")
+
+    base_rows = {row["handler"]: row for row in baseline.get("handlers", ())}
+    keys = list(report["handlers"][0]) if report["handlers"] else []
+    print()
+    print(" | ".join(f"{k:>18}" for k in keys))
+    for row in report["handlers"]:
+        base = base_rows.get(row["handler"], {})
+        print(" | ".join(
+            _cell(row[k], base.get(k) if k not in ("handler", "count", "recorded_p50_ms", "recorded_rest") else None, 18)
+            for k in keys
+        ))
+
+    base_routes = {row["route"]: row for row in baseline.get("routes", ())}
+    print()
+    print(f"{'route':>72} | {'recorded':>10} | {'calls':>14}")
+    for row in report["routes"]:
+        print(f"{row['route']:>72} | {row['recorded']:>10} | "
+              f"{_cell(row['calls'], base_routes.get(row['route'], {}).get('calls'), 14)}")
+    if report["skipped"]:
+        print("\nnot replayed:", ", ".join(f"{name} ×{n}" for name, n in report["skipped"].items()))
+
+
+# =========================
+# Main
+# =========================
+
+async def main_async(args) -> dict:
+    from src.core.trace import on_rest, read_trace
+
+    header, entries = read_trace(args.trace)
+    if args.limit:
+        entries = entries[:args.limit]
+    app = load_bot(args.window)
+    await app.GROUP_STORE.open()
+    await app.HISTORY.open()
+
+    rest = SimulatedRest(seed=args.seed)
+    rest.listeners.append(on_rest)
+
+    async def open_dm(user_id: int) -> int:
+        await rest.call("POST /users/@me/channels")
+        return user_id
+
+    async def send_dm(channel_id: int, content: str) -> None:
+        await rest.call("POST /channels/{channel_id}/messages", channel_id)
+
+    app.DM_QUEUE.open_dm, app.DM_QUEUE.send = open_dm, send_dm
+    app.DM_QUEUE.start()
+
+    replayer = Replayer(app, rest, entries)
+    elapsed = await replayer.run(args.speed)
+    await app.EDIT_SCHEDULER.drain()
+    await app.DM_QUEUE.drain()
+    settled = time.perf_counter() - replayer.started
+
+    edits = sum(message.edits for channel in replayer.channels.values() for message in channel.messages)
+    await app.DM_QUEUE.stop()
+    await app.HISTORY.close()
+    await app.GROUP_STORE.close()
+    report = summarize(replayer.results, rest, elapsed, settled, edits, replayer.skipped)
+    report["trace"] = {"path": str(args.trace), "entries": len(entries), "speed": args.speed,
+                       "started_at": header.get("started_at")}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded interaction trace against the offline fakes.")
+    parser.add_argument("trace", type=Path, help="a TRACE_FILE recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = as fast as possible)")
+    parser.add_argument("--limit", type=int, default=0, help="replay only the first N interactions")
+    parser.add_argument("--window", type=float, default=0.75, help="edit coalescing window (EDIT_COALESCE_WINDOW)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="write the report to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a report from a previous --json run")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    baseline = {}
+    if args.baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    print_report(report, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
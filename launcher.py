@@ -0,0 +1,110 @@
+# launcher.py
+# -----------------------
+# PartyCrusher — multi-process cluster launcher
+# Runs groups of shards in separate processes (one gateway connection per shard,
+# one event loop per cluster) and prints per-shard latency / event counters.
+#
+#   python launcher.py --shards 8 --per-cluster 2
+# -----------------------
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import time
+
+from src.core.sharding import plan_clusters
+
+
+def run_cluster(cluster_id: int, shard_ids: list[int], shard_count: int, stats_queue) -> None:
+    """Child process entrypoint: configure sharding via env, then start the bot."""
+    os.environ["SHARD_COUNT"] = str(shard_count)
+    os.environ["SHARD_IDS"] = ",".join(map(str, shard_ids))
+    os.environ["CLUSTER_ID"] = str(cluster_id)
+
+    import bot  # imported after env is set: bot.py builds the AutoShardedBot at import time
+    bot.main(stats_queue=stats_queue)
+
+
+def print_stats(latest: dict[int, dict]) -> None:
+    print(f"📊 Cluster stats @ {time.strftime('%H:%M:%S')}")
+    for cluster_id in sorted(latest):
+        snap = latest[cluster_id]
+        print(f"   cluster {cluster_id}: {snap['events']} events, up {snap['uptime_s']}s, top={snap['top_events']}")
+        for shard_id, shard in sorted(snap["shards"].items(), key=lambda kv: int(kv[0])):
+            print(
+                f"      shard {shard_id}: latency={shard.get('latency_ms')}ms guilds={shard.get('guilds', 0)}"
+                f" interactions={shard.get('interactions', 0)} connects={shard.get('connects', 0)}"
+                f" disconnects={shard.get('disconnects', 0)} resumes={shard.get('resumes', 0)}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run PartyCrusher as several sharded processes.")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", "2")), help="total shard count")
+    parser.add_argument("--per-cluster", type=int, default=int(os.getenv("SHARDS_PER_CLUSTER", "1")),
+                        help="shards per process")
+    parser.add_argument("--report-every", type=float, default=30.0, help="seconds between stats printouts")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    stats_queue = ctx.Queue()
+    clusters = plan_clusters(args.shards, args.per_cluster)
+    procs: dict[int, mp.Process] = {}
+
+    def start(cluster_id: int):
+        proc = ctx.Process(
+            target=run_cluster,
+            args=(cluster_id, clusters[cluster_id], args.shards, stats_queue),
+            name=f"cluster-{cluster_id}",
+        )
+        proc.start()
+        procs[cluster_id] = proc
+        print(f"🚀 Cluster {cluster_id} (pid {proc.pid}) → shards {clusters[cluster_id]}")
+
+    for cluster_id in range(len(clusters)):
+        start(cluster_id)
+
+    stopping = False
+
+    def shutdown(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for proc in procs.values():
+            if proc.is_alive():
+                os.kill(proc.pid, signum)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    latest: dict[int, dict] = {}
+    next_report = time.monotonic() + args.report_every
+    while procs:
+        try:
+            snap = stats_queue.get(timeout=1.0)
+            latest[snap["cluster"]] = snap
+        except queue.Empty:
+            pass
+
+        for cluster_id, proc in list(procs.items()):
+            if proc.is_alive():
+                continue
+            procs.pop(cluster_id)
+            if not stopping:
+                print(f"⚠️ Cluster {cluster_id} exited with {proc.exitcode}; restarting in 5s.")
+                time.sleep(5)
+                start(cluster_id)
+
+        if latest and time.monotonic() >= next_report:
+            print_stats(latest)
+            next_report = time.monotonic() + args.report_every
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
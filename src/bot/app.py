@@ -0,0 +1,574 @@
+# src/bot/app.py
+# -----------------------
+# PartyCrusher — the client, shared state and lifecycle (startup, rehydrate, shutdown).
+# Slash commands live in src/bot/commands.py; the UI modules (src/bot/views.py for
+# listings, src/bot/pages.py for /lfghistory and /lfgstats) are imported on first use,
+# so none of them is on the path to the gateway connection.
+# -----------------------
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import signal
+import string
+import time
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import discord
+from discord.ext import commands
+
+from src.core.client_profile import PROFILE_DEFAULT, client_options
+from src.core.command_sync import sync_if_changed
+from src.core.dm_queue import DMDispatcher
+from src.core.edit_scheduler import EditScheduler
+from src.core.expiry import ExpiryScheduler
+from src.core.health import HealthMonitor, LoopLagProbe, SlowCallbackDetector, health_routes
+from src.core.history import HistoryLog
+from src.core.listing_index import ListingIndex
+from src.core.matchmaking import MatchQueue
+from src.core.metrics import (
+    METRICS, REST_HOOKS, SPAN_START_HOOKS, install_rest_hooks, start_metrics_server,
+)
+from src.core.mirrors import MirrorMap
+from src.core.profiler import Profiler, ProfileResult, ProfilerError
+from src.core.rest_priority import ACK_GUARD, REST_SCHEDULER, install_rest_scheduler, reply
+from src.core.roles import RoleIndex
+from src.core.settings import get_settings
+from src.core.sharding import ShardStats, shard_for_guild
+from src.core.shutdown import GracefulShutdown, drain
+from src.core.stats import StatsRollups
+from src.core.store import GroupStore
+from src.core.trace import TraceRecorder, on_rest
+
+if TYPE_CHECKING:
+    from src.bot.views import LFGButtonView
+
+# =========================
+# Environment / Constants
+# =========================
+
+# Loaded once from the environment + .env.<APP_ENV>; raises SettingsError listing every bad value
+SETTINGS = get_settings()
+APP_ENV = SETTINGS.app_env
+
+# Startup phases in seconds since bot.py started importing (see startup_phase)
+STARTUP: dict[str, float] = {}
+_startup_origin = time.perf_counter()
+
+# Canonical display names used in UI and per-guild role resolution
+ROLE_TITLES = ["Tank", "Healer", "Melee DPS", "Ranged DPS"]
+
+# Internal role keys -> display titles
+ROLE_KEY_TO_TITLE = {
+    "tank": "Tank",
+    "healer": "Healer",
+    "meleedps": "Melee DPS",
+    "rangeddps": "Ranged DPS",
+}
+
+# Per-guild role index: { guild_id: { "melee dps": role_id, ... } }, misses included
+ROLE_INDEX = RoleIndex(ROLE_TITLES)
+
+# Button presses inside this window (seconds) are merged into a single message edit.
+# Edits are also paced per channel (5 per 5s, Discord's edit limit) before they take a REST slot.
+EDIT_COALESCE_WINDOW = SETTINGS.edit_coalesce_window
+EDIT_SCHEDULER = EditScheduler(window=EDIT_COALESCE_WINDOW, bucket_rate=1.0, bucket_burst=5)
+
+# Extra channels per guild that get a copy of each new listing (MIRROR_CHANNELS)
+MIRRORS = MirrorMap(SETTINGS.mirror_channels)
+
+# Listing lifetime (seconds) and the on-disk group store that survives restarts
+LISTING_TTL = 1800
+DATA_DIR = SETTINGS.data_dir
+GROUP_STORE = GroupStore(DATA_DIR / "groups.db")
+
+# Append-only log of group lifecycle events (create/join/leave/close/expire), written in batches
+HISTORY = HistoryLog(DATA_DIR / "history.db")
+HISTORY_PAGE_SIZE = 5
+
+# Waitlist DMs: the next WAITLIST_NOTIFY users per reopened slot are notified through the
+# background DM queue (folded per user, rate limited, DM channels reused)
+WAITLIST_NOTIFY = SETTINGS.waitlist_notify
+
+
+async def _open_dm(user_id: int) -> int:
+    channel = await bot.create_dm(discord.Object(id=user_id))
+    return channel.id
+
+async def _send_dm(channel_id: int, content: str) -> None:
+    await bot.get_partial_messageable(channel_id, type=discord.ChannelType.private).send(content)
+
+DM_QUEUE = DMDispatcher(_open_dm, _send_dm, fold_window=SETTINGS.dm_fold_window, rate=SETTINGS.dm_rate)
+
+# /queue matchmaking: entries older than QUEUE_TTL seconds are dropped by a periodic sweep
+QUEUE_TTL = SETTINGS.queue_ttl
+MATCH_QUEUE = MatchQueue()
+
+# Open listings by message id; every deadline is owned by one central expiry scheduler
+OPEN_VIEWS: dict[int, "LFGButtonView"] = {}
+# The same listings by guild, dungeon, key level and open role, for /lfgbrowse
+LISTING_INDEX = ListingIndex()
+BROWSE_PAGE_SIZE = 8
+
+
+async def _expire_listing(message_id: int):
+    view = OPEN_VIEWS.pop(message_id, None)
+    if view is not None:
+        await view.on_timeout()
+
+EXPIRY = ExpiryScheduler(
+    on_expire=_expire_listing,
+    batch_size=SETTINGS.expiry_batch_size,
+    batch_interval=SETTINGS.expiry_batch_interval,
+)
+
+# On SIGTERM: stop taking new groups, then within SHUTDOWN_BUDGET seconds either
+#   pause   — re-render open listings with disabled buttons until the next start (default)
+#   expire  — end them like a 30-minute timeout
+#   persist — leave messages as they are, only flush state (buttons fail until we're back)
+# with at most SHUTDOWN_CONCURRENCY listing edits in flight. Keep the budget below the
+# container's stop_grace_period.
+SHUTDOWN_MODE = SETTINGS.shutdown_mode
+SHUTDOWN_BUDGET = SETTINGS.shutdown_budget
+SHUTDOWN_CONCURRENCY = SETTINGS.shutdown_concurrency
+
+# Commands that create new groups; refused while draining
+DRAIN_REFUSED_COMMANDS = frozenset({"lfg", "lfgquick", "queue join"})
+
+# =========================
+# Bot Setup
+# =========================
+
+# Intents and caches: "lean" (default) receives guild/role/channel events only and caches no
+# messages or members beyond the bot itself; "default" is discord.py's stock setup
+CLIENT_OPTIONS = client_options(
+    SETTINGS.client_profile,
+    SETTINGS.max_messages if SETTINGS.max_messages is not None else PROFILE_DEFAULT,
+)
+# No prefix commands: mentioning the bot is the only prefix that needs no message_content intent
+COMMAND_PREFIX = commands.when_mentioned if SETTINGS.client_profile == "lean" else "!"
+
+# Sharding: SHARD_COUNT=0 keeps a single gateway connection. With SHARD_COUNT set,
+# this process runs SHARD_IDS (all shards if empty) — launcher.py sets these per cluster.
+SHARD_COUNT = SETTINGS.shard_count
+SHARD_IDS = list(SETTINGS.shard_ids) if SETTINGS.shard_ids is not None else None
+CLUSTER_ID = SETTINGS.cluster_id
+STATS_INTERVAL = SETTINGS.stats_interval
+
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(
+        command_prefix=COMMAND_PREFIX, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **CLIENT_OPTIONS,
+    )
+else:
+    bot = commands.Bot(command_prefix=COMMAND_PREFIX, **CLIENT_OPTIONS)
+
+SHARD_STATS = ShardStats(SHARD_COUNT, cluster_id=CLUSTER_ID)
+
+# Prometheus-format metrics endpoint (local only by default); METRICS_PORT=0 disables it
+METRICS_HOST = SETTINGS.metrics_host
+METRICS_PORT = SETTINGS.metrics_port
+
+# Health: /healthz and /readyz on the metrics server, fed by the gateway listeners below
+LOOP_PROBE = LoopLagProbe()
+HEALTH = HealthMonitor(
+    LOOP_PROBE,
+    shard_ids=SHARD_IDS if SHARD_IDS is not None else range(SHARD_COUNT or 1),
+    max_loop_lag=SETTINGS.health_max_loop_lag,
+    disconnect_grace=SETTINGS.health_disconnect_grace,
+)
+SLOW_CALLBACKS = SlowCallbackDetector(SETTINGS.slow_callback_threshold)
+# Opt-in interaction trace (TRACE_FILE) for offline replay with benchmarks/replay.py
+TRACE = TraceRecorder(SETTINGS.trace_file) if SETTINGS.trace_file else None
+# On-demand sampling profiler (/lfgprofile or SIGUSR1); writes to DATA_DIR/profiles
+PROFILE_SECONDS = SETTINGS.profile_seconds
+PROFILER = Profiler(DATA_DIR / "profiles", interval=SETTINGS.profile_interval)
+
+# Set by launcher.py: a multiprocessing queue that receives periodic stats snapshots
+_STATS_QUEUE = None
+
+
+def _owns_guild(guild_id: Optional[int]) -> bool:
+    return SHARD_IDS is None or shard_for_guild(guild_id, SHARD_COUNT) in SHARD_IDS
+
+# /lfgstats rollups: updated from the history log as events are written, checkpointed per cluster.
+# Restored in the background after startup; /lfgstats waits for STATS_RESTORED.
+LFG_STATS = StatsRollups(DATA_DIR / f"lfgstats.{CLUSTER_ID}.json", accept=_owns_guild if SHARD_COUNT else None)
+STATS_RESTORED: Optional[asyncio.Task] = None
+
+
+# =========================
+# Utilities
+# =========================
+
+def generate_listed_as(dungeon: str, length: int = 8) -> str:
+    """Return the title prefix for the embed."""
+    alphabet = string.ascii_letters + string.digits
+    concat = "".join(random.choices(alphabet, k=length))
+    return "KC: " + dungeon + " - " + concat 
+
+def generate_passphrase(length: int = 8) -> str:
+    """Create a random passphrase for a group."""
+    alphabet = string.ascii_letters + string.digits
+    return "".join(random.choices(alphabet, k=length))
+
+def get_role_ping(guild: Optional[discord.Guild], title: str) -> str:
+    """Return a mention string for the display title, or a readable fallback like @Tank."""
+    return ROLE_INDEX.ping(guild, title)
+
+def get_role_pings(guild: Optional[discord.Guild], titles: Iterable[str]) -> str:
+    """Comma-joined pings for a set of display titles (memoized per guild + set)."""
+    return ROLE_INDEX.pings(guild, titles)
+
+
+# =========================
+# Event Hooks
+# =========================
+
+def startup_phase(name: str, since: Optional[float] = None) -> float:
+    """Record (and return) seconds from the start of the import to `name`; `since` moves the origin earlier."""
+    global _startup_origin
+    if since is not None:
+        _startup_origin = min(_startup_origin, since)
+    STARTUP[name] = time.perf_counter() - _startup_origin
+    return STARTUP[name]
+
+@bot.event
+async def setup_hook():
+    """
+    Runs once before connecting to the gateway (not on every reconnect like on_ready).
+    Only what must exist before the first event is done here; replaying the stats rollups
+    and the slash command sync run in the background while the gateway connects.
+    """
+    if _STATS_QUEUE is not None:
+        bot.loop.create_task(_report_stats())
+
+    # Both stores before anything can save: expiry batches, early interactions, a SIGTERM
+    await asyncio.gather(HISTORY.open(), GROUP_STORE.open())
+    bot.loop.create_task(_sweep_queue())
+    DM_QUEUE.start()
+    global STATS_RESTORED
+    STATS_RESTORED = bot.loop.create_task(_restore_stats())
+
+    SHUTDOWN.install(bot.loop)
+    bot.tree.interaction_check = _refuse_while_draining
+
+    install_rest_hooks(bot.http)
+    # Acks/defers/modals > ephemeral follow-ups > embed edits; slow handlers get deferred before 3s
+    install_rest_scheduler(bot.http)
+    SPAN_START_HOOKS.append(ACK_GUARD.watch)
+    # Modal openers: a deferred interaction can no longer answer with a modal
+    ACK_GUARD.exempt("edit_requirements")
+    LOOP_PROBE.start()
+    SLOW_CALLBACKS.install()
+    if TRACE is not None:
+        TRACE.open()
+        SPAN_START_HOOKS.append(TRACE.start_span)
+        REST_HOOKS.append(on_rest)
+        print(f"🎞️ Recording interaction traces to {TRACE.path} (hashed ids).")
+    try:
+        bot.loop.add_signal_handler(signal.SIGUSR1, start_profile)
+    except (NotImplementedError, RuntimeError, AttributeError):
+        pass  # no SIGUSR1 (e.g. Windows): /lfgprofile only
+    METRICS.gauge_source(_runtime_gauges)
+    if METRICS_PORT:
+        # Each cluster process gets its own port
+        port = METRICS_PORT + CLUSTER_ID
+        await start_metrics_server(METRICS_HOST, port, routes=health_routes(_health_check))
+        print(f"📈 Metrics on http://{METRICS_HOST}:{port}/metrics (health: /healthz, /readyz)")
+
+    # In a multi-process deployment only the first cluster syncs the (shared) command tree
+    if CLUSTER_ID == 0:
+        bot.loop.create_task(_sync_commands())
+    print(f"⏱️ Connecting to the gateway {startup_phase('setup'):.2f}s after start "
+          f"(imports {STARTUP.get('import', 0):.2f}s).")
+
+async def _restore_stats():
+    """Load the rollup checkpoint and replay the history written since, then follow new events."""
+    # Subscribed before the replay, so no event written during it is missed. Those events are
+    # held until the replay is done: applied first, a new event would move last_event_id past
+    # older ones the replay hasn't read yet. apply() skips the held ones the replay already read.
+    held: list = []
+    replaying = True
+
+    def follow(event):
+        if replaying:
+            held.append(event)
+        else:
+            LFG_STATS.apply(event)
+
+    HISTORY.subscribe(follow)
+    replayed = await LFG_STATS.restore(HISTORY)
+    replaying = False
+    for event in held:
+        LFG_STATS.apply(event)
+    LFG_STATS.start()
+    print(f"📊 Stats rollups restored (replayed {replayed} events since last checkpoint).")
+
+async def _sync_commands():
+    """
+    Syncs slash commands only if the command tree changed since the last sync:
+    dev/qa sync to GUILD_IDS (instant), prod syncs globally.
+    """
+    guild_ids = list(SETTINGS.guild_ids) if APP_ENV in ("dev", "qa") else []
+    try:
+        results = await sync_if_changed(
+            bot.tree,
+            bot.application_id,
+            DATA_DIR,
+            guild_ids=guild_ids,
+            force=SETTINGS.force_command_sync,
+        )
+        for scope, count in results.items():
+            if count is None:
+                print(f"⏭️ Slash commands unchanged ({scope}), skipping sync.")
+            else:
+                print(f"🔁 Synced {count} slash commands ({scope}).")
+    except Exception as e:
+        print(f"❌ Slash command sync failed: {e}")
+
+@bot.event
+async def on_ready():
+    if "ready" not in STARTUP:
+        print(f"✅ Logged in as {bot.user} ({startup_phase('ready'):.2f}s after start)")
+    else:
+        print(f"✅ Logged in as {bot.user}")
+    if not getattr(bot, "_groups_rehydrated", False):
+        bot._groups_rehydrated = True
+        EXPIRY.start()
+        await rehydrate_groups()
+        startup_phase("rehydrated")
+
+async def rehydrate_groups():
+    """
+    Rebuild every open listing from the group store and re-register it as a persistent view.
+    Uses partial messages (no per-message fetch). Stored deadlines go back into the expiry
+    scheduler, so listings that expired while we were down are expired in its next batches.
+    """
+    from src.bot import views
+
+    records = await GROUP_STORE.load_open(
+        shard_count=SHARD_COUNT, shard_ids=SHARD_IDS if SHARD_IDS is not None else list(range(SHARD_COUNT)),
+    )
+    now = time.time()
+    overdue = 0
+
+    resumed = 0
+
+    for record in records:
+        view = views.LFGButtonView.from_record(record)
+        if record.expires_at > now:
+            bot.add_view(view, message_id=record.message_id)
+            for mirror in view.mirrors:
+                bot.add_view(mirror, message_id=mirror.message.id)
+            if view.listing.status == "paused":
+                # Paused by the last shutdown: bring the buttons back
+                view.listing.status = "open"
+                await view.update_embed()
+                resumed += 1
+        else:
+            overdue += 1
+            if view.listing.status == "paused":
+                view.listing.status = "open"
+        view.schedule_expiry()
+
+    print(f"♻️ Restored {len(records) - overdue} open groups ({overdue} expired while offline, {resumed} resumed).")
+
+async def _sweep_queue():
+    """Drop /queue entries nobody matched within QUEUE_TTL."""
+    while True:
+        await asyncio.sleep(60)
+        stale = MATCH_QUEUE.expire_before(time.time() - QUEUE_TTL)
+        if stale:
+            print(f"🧹 Dropped {len(stale)} stale queue entries.")
+
+async def graceful_shutdown(reason: str):
+    """
+    SIGTERM/SIGINT: refuse new groups (see _refuse_while_draining), finish open listings
+    according to SHUTDOWN_MODE within the budget, flush every store, then disconnect.
+    Listings the budget ran out on stay persisted as open and are restored on the next start.
+    """
+    # No expiry batches racing the drain; a batch already expiring finishes its final edits
+    await EXPIRY.stop()
+
+    views = [view for view in OPEN_VIEWS.values() if view.message is not None and not view.closed]
+    print(f"🛑 {reason}: draining {len(views)} open listings "
+          f"(mode={SHUTDOWN_MODE}, budget={SHUTDOWN_BUDGET:g}s, concurrency={SHUTDOWN_CONCURRENCY}).")
+
+    actions = {
+        "pause": lambda view: view.pause(),
+        "expire": lambda view: view.on_timeout(),
+        "persist": _persist_view,
+    }
+    report = await drain(views, actions[SHUTDOWN_MODE], budget=SHUTDOWN_BUDGET, concurrency=SHUTDOWN_CONCURRENCY)
+    print(f"🛑 Finished {report.finished}/{report.total} listings in {report.elapsed:.1f}s "
+          f"({report.failed} failed, {report.unfinished} left for the next start).")
+
+    try:
+        await GROUP_STORE.close()
+        await HISTORY.close()
+        await LFG_STATS.stop()
+    except Exception as e:
+        print(f"⚠️ Flushing state on shutdown failed: {e}")
+    dropped = await DM_QUEUE.stop()
+    if dropped:
+        print(f"🛑 Dropped {dropped} queued waitlist DMs.")
+    await LOOP_PROBE.stop()
+    await PROFILER.stop()
+    if TRACE is not None:
+        TRACE.close()
+        print(f"🎞️ Wrote {TRACE.entries} trace entries to {TRACE.path}.")
+    await bot.close()
+
+def start_profile(seconds: Optional[float] = None) -> Optional[asyncio.Task]:
+    """
+    Profile the event loop for `seconds` (default PROFILE_SECONDS) in the background.
+    Returns the task (its result is the ProfileResult), or None if a profile is already
+    running or profiling isn't supported here.
+    """
+    seconds = seconds or PROFILE_SECONDS
+    try:
+        PROFILER.start()
+    except ProfilerError as e:
+        print(f"🔬 Not profiling: {e}.")
+        return None
+    print(f"🔬 Profiling for {seconds:g}s.")
+    return asyncio.create_task(_finish_profile(seconds), name="profiler")
+
+async def _finish_profile(seconds: float) -> Optional[ProfileResult]:
+    await asyncio.sleep(seconds)
+    result = await PROFILER.stop()
+    if result is not None:
+        print(f"🔬 Profile written: {result.folded_path} (flame graph input), {result.summary_path}")
+    return result
+
+async def _persist_view(view: "LFGButtonView"):
+    view._persist()
+
+SHUTDOWN = GracefulShutdown(graceful_shutdown)
+
+async def _refuse_while_draining(interaction: discord.Interaction) -> bool:
+    """Command tree check: no new groups while the bot is shutting down."""
+    command = interaction.command
+    if SHUTDOWN.draining and command is not None and command.qualified_name in DRAIN_REFUSED_COMMANDS:
+        await reply(interaction, "🔧 The bot is restarting — please try again in a minute.")
+        return False
+    return True
+
+# Per-shard counters (surfaced by launcher.py in multi-process mode)
+@bot.listen()
+async def on_socket_event_type(event_type: str):
+    SHARD_STATS.gateway_event(event_type)
+    HEALTH.event()
+
+@bot.listen()
+async def on_interaction(interaction: discord.Interaction):
+    SHARD_STATS.interaction(interaction.guild_id)
+
+@bot.listen()
+async def on_shard_connect(shard_id: int):
+    SHARD_STATS.shard_event(shard_id, "connects")
+    HEALTH.gateway_up(shard_id)
+
+@bot.listen()
+async def on_shard_disconnect(shard_id: int):
+    SHARD_STATS.shard_event(shard_id, "disconnects")
+    HEALTH.gateway_down(shard_id)
+
+@bot.listen()
+async def on_shard_resumed(shard_id: int):
+    SHARD_STATS.shard_event(shard_id, "resumes")
+    HEALTH.gateway_up(shard_id)
+
+# Unsharded clients only get the non-shard events (sharded ones get both)
+if not SHARD_COUNT:
+    @bot.listen("on_connect")
+    @bot.listen("on_resumed")
+    async def _gateway_up():
+        HEALTH.gateway_up()
+
+    @bot.listen("on_disconnect")
+    async def _gateway_down():
+        HEALTH.gateway_down()
+
+def _health_check():
+    if SHARD_COUNT:
+        latencies = dict(bot.latencies)
+    else:
+        latencies = {0: bot.latency}
+    return HEALTH.check(
+        logged_in=bot.is_ready() and not bot.is_closed(),
+        latencies=latencies,
+        open_listings=len(OPEN_VIEWS),
+        draining=SHUTDOWN.draining,
+    )
+
+def _runtime_gauges() -> dict[str, float]:
+    edits = EDIT_SCHEDULER.stats()
+    expiry = EXPIRY.stats()
+    return {
+        "lfg_open_listings": len(OPEN_VIEWS),
+        "lfg_edit_requests": edits["requests"],
+        "lfg_edits": edits["edits"],
+        "lfg_edits_merged": edits["merged"],
+        "lfg_expiry_pending": expiry["pending"],
+        "lfg_expiry_fired": expiry["fired"],
+        "lfg_expiry_max_lateness_seconds": expiry["max_lateness_s"],
+        "discord_rest_in_flight": REST_SCHEDULER.in_flight,
+        "discord_rest_waiting": REST_SCHEDULER.waiting,
+        "discord_gateway_latency_seconds": bot.latency if bot.latency == bot.latency else -1,
+        "lfg_event_loop_lag_max_seconds": LOOP_PROBE.max_lag(),
+        "lfg_seconds_since_gateway_event": time.monotonic() - HEALTH.last_event if HEALTH.last_event else -1,
+        "lfg_slow_callbacks": SLOW_CALLBACKS.slow,
+        "lfg_dm_queue_depth": DM_QUEUE.depth,
+    }
+
+async def _report_stats():
+    while True:
+        await asyncio.sleep(STATS_INTERVAL)
+        try:
+            _STATS_QUEUE.put_nowait(SHARD_STATS.snapshot(bot))
+        except Exception as e:
+            print(f"⚠️ Could not report cluster stats: {e}")
+
+# Keep the role index in sync: built once per guild, then updated in place
+@bot.event
+async def on_guild_available(guild: discord.Guild):
+    ROLE_INDEX.index_guild(guild)
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    ROLE_INDEX.index_guild(guild)
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    ROLE_INDEX.drop_guild(guild.id)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    ROLE_INDEX.role_created(role)
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    ROLE_INDEX.role_updated(before, after)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    ROLE_INDEX.role_deleted(role)
+
+
+# =========================
+# Entrypoint
+# =========================
+
+def main(stats_queue=None):
+    """Run the bot. launcher.py passes a queue to collect per-shard stats from each cluster."""
+    global _STATS_QUEUE
+    _STATS_QUEUE = stats_queue
+    # Configures the root logger, so src.* loggers (store, history, DM queue, ...) log at LOG_LEVEL too
+    bot.run(SETTINGS.token, log_level=getattr(logging, SETTINGS.log_level), root_logger=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# src/bot/commands.py
+# -----------------------
+# PartyCrusher — slash commands. They are registered on the tree at import (the tree is
+# hashed for the sync check), but each one imports the UI it needs (src/bot/views.py,
+# src/bot/pages.py) only when it first runs.
+# -----------------------
+
+from __future__ import annotations
+
+import asyncio
+from typing import Literal, Optional
+
+import discord
+from discord import app_commands
+
+from src.bot import app
+from src.bot.app import (
+    HISTORY, HISTORY_PAGE_SIZE, LFG_STATS, MATCH_QUEUE, ROLE_KEY_TO_TITLE, bot,
+    generate_listed_as, generate_passphrase,
+)
+from src.core.listing import Listing, normalize_role
+from src.core.matchmaking import QueueEntry
+from src.core.metrics import handler_span
+from src.core.quick import DUNGEONS, KEY_MAX, KEY_MIN, QUICK_INDEX, QuickParseError, parse_quick
+from src.core.rest_priority import reply
+
+# =========================
+# Slash Command: /lfg
+# =========================
+
+@bot.tree.command(name="lfg", description="Create a Mythic+ group")
+@app_commands.describe(
+    dungeon="Dungeon Name",
+    key_level="Keystone level (e.g., 15)",
+    passphrase="Choose a passphrase, or leave empty for auto-generated",
+    timing="Your timing expectation",
+    your_role="Which role are you playing?",
+    listed_as="Optional name this group will be listed as",
+    requirements="Any utilities/requirements teammates should have",
+)
+async def lfg(
+    interaction: discord.Interaction,
+    dungeon: str,
+    key_level: app_commands.Range[int, KEY_MIN, KEY_MAX],
+    timing: Literal["Timed", "Completion"],
+    your_role: Literal["Tank", "Healer", "Melee DPS", "Ranged DPS"],
+    requirements: Optional[str] = None,
+    passphrase: Optional[str] = None,
+    listed_as: Optional[str] = None,
+):
+    """
+    Starts an ephemeral flow where the creator chooses required roles,
+    then posts a public, interactive LFG listing with role buttons.
+    """
+    with handler_span("lfg", interaction):
+        from src.bot.views import RoleMultiSelectView
+
+        hit = QUICK_INDEX.lookup(dungeon)
+        if hit is None or hit[0] != "dungeon":
+            await reply(interaction, f"⚠️ Unknown dungeon: **{dungeon}**. Pick one from the list.")
+            return
+        dungeon = hit[1]
+
+        await reply(
+            interaction,
+            "Please select the roles you're looking for:",
+            view=RoleMultiSelectView(
+                interaction,
+                dungeon,
+                key_level,
+                timing,
+                requirements,
+                passphrase,
+                listed_as,
+                your_role=your_role,
+            ),
+        )
+
+
+@lfg.autocomplete("dungeon")
+async def lfg_dungeon_autocomplete(interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    """Dungeon names matching what's typed so far (full names, shorthand like "pos", or prefixes)."""
+    return [app_commands.Choice(name=name, value=name) for name in QUICK_INDEX.complete("dungeon", current)]
+
+
+# =========================
+# Slash Command: /lfgquick
+# =========================
+
+@bot.tree.command(name="lfgquick", description="Create a Mythic+ group from a short description")
+@app_commands.describe(
+    text='e.g. "pos 14 timed heal need tank,dps lust" (dungeon, key, timing, your role, need ..., extras)',
+)
+async def lfgquick(interaction: discord.Interaction, text: str):
+    """
+    One-shot listing: dungeon, key level and roles are parsed from the shorthand,
+    unrecognized words become the requirements, and the listing is posted right away.
+    """
+    with handler_span("lfgquick", interaction):
+        from src.bot.views import publish_listing
+
+        try:
+            spec = parse_quick(text)
+        except QuickParseError as e:
+            await reply(interaction, f"⚠️ {e}")
+            return
+
+        listing = Listing(
+            dungeon=spec.dungeon,
+            key_level=spec.key_level,
+            timing=spec.timing,
+            your_role=ROLE_KEY_TO_TITLE[spec.your_role],
+            requirements=spec.requirements,
+            passphrase=spec.passphrase or generate_passphrase(),
+            listed_as=spec.listed_as or generate_listed_as(spec.dungeon),
+            required_roles=spec.required_roles,
+        )
+        needed = ", ".join(ROLE_KEY_TO_TITLE[r] for r in listing.required_roles)
+        await reply(
+            interaction,
+            f"✅ Posting **{listing.dungeon} +{listing.key_level}** ({listing.timing}) "
+            f"as {listing.your_role}, looking for {needed}.",
+        )
+        await publish_listing(interaction.channel, interaction.user, interaction.guild_id, listing)
+
+
+# =========================
+# Slash Command: /lfghistory
+# =========================
+
+@bot.tree.command(name="lfghistory", description="View your past groups and passphrases")
+async def lfghistory(interaction: discord.Interaction):
+    """Shows the caller's most recent groups in this server, paginated."""
+    with handler_span("lfghistory", interaction):
+        from src.bot.pages import HistoryPageView, build_history_embed
+
+        # Make sure the caller's latest clicks are in the log before reading it
+        await HISTORY.flush()
+        entries, cursor = await HISTORY.user_history(interaction.user.id, interaction.guild_id, HISTORY_PAGE_SIZE)
+        await reply(
+            interaction,
+            embed=build_history_embed(entries, page=1),
+            view=HistoryPageView(interaction.user.id, interaction.guild_id, cursor),
+        )
+
+
+# =========================
+# Slash Command: /lfgstats
+# =========================
+
+@bot.tree.command(name="lfgstats", description="Group creation stats for this server")
+@app_commands.describe(window="Time window to summarize")
+async def lfgstats(interaction: discord.Interaction, window: Literal["hour", "day", "week", "all"] = "week"):
+    """Answers from incrementally maintained rollups (no history queries at request time)."""
+    with handler_span("lfgstats", interaction):
+        from src.bot.pages import build_stats_embed
+
+        # Rollups are restored in the background at startup
+        if app.STATS_RESTORED is not None and not app.STATS_RESTORED.done():
+            await asyncio.shield(app.STATS_RESTORED)
+        summary = LFG_STATS.summary(interaction.guild_id, window)
+        guild_name = interaction.guild.name if interaction.guild else "DMs"
+        await reply(interaction, embed=build_stats_embed(summary, guild_name))
+
+
+# =========================
+# Slash Command: /lfgbrowse
+# =========================
+
+@bot.tree.command(name="lfgbrowse", description="Find open groups in this server")
+@app_commands.describe(
+    role="Only groups looking for this role",
+    dungeon="Only this dungeon",
+    min_key="Lowest key level",
+    max_key="Highest key level",
+)
+async def lfgbrowse(
+    interaction: discord.Interaction,
+    role: Optional[Literal["Tank", "Healer", "Melee DPS", "Ranged DPS"]] = None,
+    dungeon: Optional[str] = None,
+    min_key: Optional[app_commands.Range[int, KEY_MIN, KEY_MAX]] = None,
+    max_key: Optional[app_commands.Range[int, KEY_MIN, KEY_MAX]] = None,
+):
+    """Pages through the open-listing index (no channel scans), highest keys first, with links."""
+    with handler_span("lfgbrowse", interaction):
+        from src.bot.pages import BrowsePageView
+
+        if dungeon is not None:
+            hit = QUICK_INDEX.lookup(dungeon)
+            if hit is None or hit[0] != "dungeon":
+                await reply(interaction, f"⚠️ Unknown dungeon: **{dungeon}**. Pick one from the list.")
+                return
+            dungeon = hit[1]
+        if min_key is not None and max_key is not None and min_key > max_key:
+            min_key, max_key = max_key, min_key
+
+        view = BrowsePageView(
+            interaction.guild_id, dungeon=dungeon, role=normalize_role(role) if role else None,
+            key_min=min_key, key_max=max_key,
+        )
+        await reply(interaction, embed=view.build_embed(), view=view)
+
+
+lfgbrowse.autocomplete("dungeon")(lfg_dungeon_autocomplete)
+
+
+# =========================
+# Slash Command: /lfgprofile
+# =========================
+
+@bot.tree.command(name="lfgprofile", description="Bot owner only: profile the bot for a while")
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(seconds="How long to sample (default PROFILE_SECONDS)")
+async def lfgprofile(interaction: discord.Interaction, seconds: Optional[app_commands.Range[int, 1, 300]] = None):
+    """Samples the event loop and times handler stages; the summary comes back as an ephemeral follow-up."""
+    with handler_span("lfgprofile", interaction):
+        if not await bot.is_owner(interaction.user):
+            await reply(interaction, "🚫 Only the bot owner can run the profiler.")
+            return
+        task = app.start_profile(seconds)
+        if task is None:
+            await reply(interaction, "⏳ A profile is already running." if app.PROFILER.running
+                        else "⚠️ Profiling isn't supported on this platform.")
+            return
+        await reply(interaction, f"🔬 Profiling for {seconds or app.PROFILE_SECONDS:g}s…")
+
+    # Outside the handler span: the wait isn't handler time
+    result = await task
+    if result is not None:
+        await interaction.followup.send(result.describe()[:2000], ephemeral=True)
+
+
+# =========================
+# Slash Commands: /queue
+# =========================
+
+queue_group = app_commands.Group(name="queue", description="Matchmaking: get grouped automatically")
+
+
+def resolve_dungeons(text: str) -> tuple[list[str], list[str]]:
+    """Comma/slash-separated dungeon names or shorthand ("pos, sky") -> (dungeons, unknown); "any" = all."""
+    parts = [p.strip() for p in text.replace("/", ",").split(",") if p.strip()]
+    if not parts or any(p.lower() in ("any", "all") for p in parts):
+        return list(DUNGEONS), []
+    found, unknown = [], []
+    for part in parts:
+        hit = QUICK_INDEX.lookup(part)
+        if hit is not None and hit[0] == "dungeon":
+            if hit[1] not in found:
+                found.append(hit[1])
+        else:
+            unknown.append(part)
+    return found, unknown
+
+
+@queue_group.command(name="join", description="Queue for a group (1 tank / 1 healer / 3 DPS)")
+@app_commands.describe(
+    dungeons='Dungeons you\'d run, comma-separated (shorthand ok, e.g. "pos, sky"), or "any"',
+    min_key="Lowest key level you'd run",
+    max_key="Highest key level you'd run",
+    timing="Your timing expectation",
+    role="Which role are you playing?",
+)
+async def queue_join(
+    interaction: discord.Interaction,
+    dungeons: str,
+    min_key: app_commands.Range[int, KEY_MIN, KEY_MAX],
+    max_key: app_commands.Range[int, KEY_MIN, KEY_MAX],
+    timing: Literal["Timed", "Completion"],
+    role: Literal["Tank", "Healer", "Melee DPS", "Ranged DPS"],
+):
+    """Adds the caller to the matchmaking queue; a group is posted here as soon as one can be formed."""
+    with handler_span("queue_join", interaction):
+        names, unknown = resolve_dungeons(dungeons)
+        if unknown or not names:
+            await reply(interaction, f"⚠️ Unknown dungeon(s): {', '.join(unknown)}")
+            return
+        if min_key > max_key:
+            min_key, max_key = max_key, min_key
+
+        match = MATCH_QUEUE.enqueue(QueueEntry(
+            user_id=interaction.user.id,
+            guild_id=interaction.guild_id,
+            dungeons=tuple(names),
+            key_min=min_key,
+            key_max=max_key,
+            timing=timing,
+            role=normalize_role(role),
+        ))
+        if match is None:
+            await reply(
+                interaction,
+                f"⏳ Queued as **{role}** for +{min_key}–{max_key} {timing} ({len(names)} dungeons). "
+                f"{MATCH_QUEUE.count(interaction.guild_id)} players in queue. Use `/queue leave` to stop.",
+            )
+            return
+
+        from src.bot.views import publish_match
+
+        await reply(interaction, f"🎉 Group found: **{match.dungeon} +{match.key_level}**!")
+        await publish_match(interaction.channel, match)
+
+
+@queue_group.command(name="leave", description="Leave the matchmaking queue")
+async def queue_leave(interaction: discord.Interaction):
+    with handler_span("queue_leave", interaction):
+        entry = MATCH_QUEUE.dequeue(interaction.guild_id, interaction.user.id)
+        message = "👋 You've left the queue." if entry else "⚠️ You're not in the queue."
+        await reply(interaction, message)
+
+
+bot.tree.add_command(queue_group)
+
+
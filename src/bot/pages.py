@@ -0,0 +1,184 @@
+# src/bot/pages.py
+# -----------------------
+# PartyCrusher — read-only pages: the /lfghistory and /lfgbrowse pagers and the /lfgstats
+# embed. Imported on first use of any of these commands.
+# -----------------------
+
+from __future__ import annotations
+
+from typing import Optional
+
+import discord
+
+from src.bot.app import BROWSE_PAGE_SIZE, HISTORY, HISTORY_PAGE_SIZE, LISTING_INDEX, ROLE_KEY_TO_TITLE
+from src.core.matchmaking import GROUP_TEMPLATE
+from src.core.metrics import instrument
+from src.core.rest_priority import edit_reply
+from src.core.stats import KEY_BUCKETS
+
+# =========================
+# /lfghistory pages
+# =========================
+
+HISTORY_OUTCOMES = {None: "🟢 Open", "close": "✅ Closed", "expire": "⌛ Expired"}
+
+
+def build_history_embed(entries: list, page: int) -> discord.Embed:
+    """One page of a user's past groups (newest first), passphrases behind spoilers."""
+    embed = discord.Embed(title="📜 Your recent groups", color=discord.Color.dark_blue())
+    if not entries:
+        embed.description = "No groups yet. Create one with `/lfg`!" if page == 1 else "No older groups."
+    for entry in entries:
+        role = ROLE_KEY_TO_TITLE.get(entry.role, entry.role or "—")
+        if entry.left:
+            role += " (left)"
+        when = f"<t:{int(entry.created_ts)}:R>" if entry.created_ts else "unknown"
+        embed.add_field(
+            name=f"{entry.dungeon} +{entry.key_level}",
+            value=(
+                f"{entry.listed_as or ''}\n"
+                f"Role: {role} · {HISTORY_OUTCOMES.get(entry.outcome, entry.outcome)} · {when}\n"
+                f"Passphrase: ||{entry.passphrase}||"
+            ),
+            inline=False,
+        )
+    embed.set_footer(text=f"Page {page}")
+    return embed
+
+
+class HistoryPageView(discord.ui.View):
+    """Ephemeral pager for /lfghistory; each page is one cursor query (newest → oldest)."""
+    def __init__(self, user_id: int, guild_id: Optional[int], cursor: Optional[int]):
+        super().__init__(timeout=180)
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.cursor = cursor
+        self.page = 1
+        self.older.disabled = cursor is None
+
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.secondary)
+    @instrument("history_page")
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        entries, self.cursor = await HISTORY.user_history(
+            self.user_id, self.guild_id, HISTORY_PAGE_SIZE, before=self.cursor,
+        )
+        self.page += 1
+        button.disabled = self.cursor is None
+        await edit_reply(interaction, embed=build_history_embed(entries, self.page), view=self)
+
+
+# =========================
+# /lfgstats embed
+# =========================
+
+STATS_WINDOW_LABELS = {"hour": "last hour", "day": "last 24 hours", "week": "last 7 days", "all": "all time"}
+
+
+def build_stats_embed(summary, guild_name: str) -> discord.Embed:
+    """Render a StatsSummary: groups per dungeon/key range, fill rates, time to fill, close vs. expire."""
+    embed = discord.Embed(
+        title=f"📊 LFG stats — {STATS_WINDOW_LABELS[summary.window]}",
+        description=f"**{summary.groups}** groups created in {guild_name}",
+        color=discord.Color.dark_blue(),
+    )
+    if summary.by_dungeon:
+        order = [label for _, label in KEY_BUCKETS]
+        lines = []
+        for dungeon, buckets in sorted(summary.by_dungeon.items(), key=lambda kv: -sum(kv[1].values())):
+            ranges = ", ".join(f"{b}: {buckets[b]}" for b in order if buckets.get(b))
+            lines.append(f"**{dungeon}** — {sum(buckets.values())} ({ranges})")
+        embed.add_field(name="Groups by dungeon", value="\n".join(lines)[:1024], inline=False)
+
+    fill = "\n".join(
+        f"{ROLE_KEY_TO_TITLE[role]}: {'—' if rate is None else f'{rate:.0%}'}"
+        for role, rate in summary.fill_rate.items()
+    )
+    embed.add_field(name="Fill rate", value=fill, inline=True)
+
+    median = summary.median_fill_seconds
+    embed.add_field(
+        name="Time to fill",
+        value=f"Median ~{median / 60:.1f} min\n{summary.filled} groups filled" if median is not None else "—",
+        inline=True,
+    )
+    ratio = summary.expiry_ratio
+    embed.add_field(
+        name="Closed vs. expired",
+        value=f"✅ {summary.closed} · ⌛ {summary.expired}" + (f"\n{ratio:.0%} expired" if ratio is not None else ""),
+        inline=True,
+    )
+    return embed
+
+
+# =========================
+# /lfgbrowse pages
+# =========================
+
+GROUP_SIZE = sum(GROUP_TEMPLATE.values())
+
+
+class BrowsePageView(discord.ui.View):
+    """
+    Ephemeral pager for /lfgbrowse. Every page is a fresh index query, so it always shows
+    the listings that are open right now (a page can shift as groups open and close).
+    """
+    def __init__(self, guild_id: Optional[int], *, dungeon: Optional[str] = None, role: Optional[str] = None,
+                 key_min: Optional[int] = None, key_max: Optional[int] = None):
+        super().__init__(timeout=180)
+        self.guild_id = guild_id
+        self.filters = {"dungeon": dungeon, "role": role, "key_min": key_min, "key_max": key_max}
+        self.page = 0
+
+    def build_embed(self) -> discord.Embed:
+        """Query the current page (clamped to the last one) and update the buttons."""
+        listings, total = LISTING_INDEX.query(
+            self.guild_id, offset=self.page * BROWSE_PAGE_SIZE, limit=BROWSE_PAGE_SIZE, **self.filters,
+        )
+        pages = max(1, -(-total // BROWSE_PAGE_SIZE))
+        if self.page >= pages:
+            self.page = pages - 1
+            listings, total = LISTING_INDEX.query(
+                self.guild_id, offset=self.page * BROWSE_PAGE_SIZE, limit=BROWSE_PAGE_SIZE, **self.filters,
+            )
+        self.prev_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+
+        embed = discord.Embed(title="🔎 Open groups", description=self._describe_filters(), color=discord.Color.dark_blue())
+        if not listings:
+            embed.description += "\n\nNo open groups match. Create one with `/lfg`!"
+        for listing in listings:
+            needed = ", ".join(ROLE_KEY_TO_TITLE[role] for role in listing.open_roles) or "—"
+            embed.add_field(
+                name=f"{listing.dungeon} +{listing.key_level} ({listing.timing})",
+                value=(
+                    f"{listing.listed_as}\n"
+                    f"Looking for: {needed} · {listing.members}/{GROUP_SIZE} · expires <t:{int(listing.expires_at)}:R>\n"
+                    f"[Jump to listing]({listing.jump_url})"
+                ),
+                inline=False,
+            )
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} · {total} groups")
+        return embed
+
+    def _describe_filters(self) -> str:
+        dungeon, role, low, high = (self.filters[k] for k in ("dungeon", "role", "key_min", "key_max"))
+        keys = (
+            f"+{low}–{high}" if low is not None and high is not None
+            else f"+{low} and up" if low is not None
+            else f"up to +{high}" if high is not None
+            else "any key"
+        )
+        return (f"{ROLE_KEY_TO_TITLE[role] + ' spots' if role else 'Any role'} · "
+                f"{dungeon or 'any dungeon'} · {keys}")
+
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    @instrument("browse_page")
+    async def prev_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await edit_reply(interaction, embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    @instrument("browse_page")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await edit_reply(interaction, embed=self.build_embed(), view=self)
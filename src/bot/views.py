@@ -0,0 +1,821 @@
+# src/bot/views.py
+# -----------------------
+# PartyCrusher — listing UI: the creation role select, the public LFGButtonView and its
+# ephemeral helpers (required-roles select, requirements modal), mirrored copies of a
+# listing in other channels, plus publishing listings and queue matches. Imported on first use (a /lfg command or rehydrating stored listings).
+# -----------------------
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from typing import Literal, Optional
+
+import discord
+
+from src.bot.app import (
+    DM_QUEUE, EDIT_SCHEDULER, EXPIRY, GROUP_STORE, HISTORY, LISTING_INDEX, LISTING_TTL, MIRRORS,
+    OPEN_VIEWS, ROLE_KEY_TO_TITLE, WAITLIST_NOTIFY, bot, generate_listed_as, generate_passphrase, get_role_pings,
+)
+from src.core.actor import ListingActor
+from src.core.group_state import ROLE_KEYS, GroupState, Waitlist
+from src.core.history import GroupEvent
+from src.core.listing import Listing, ListingRenderer, RenderedListing, normalize_role
+from src.core.listing_index import IndexedListing
+from src.core.matchmaking import Match
+from src.core.metrics import instrument, track_edit
+from src.core.profiler import stage
+from src.core.rest_priority import edit_reply, ensure_deferred, reply
+from src.core.store import GroupRecord
+from src.core.trace import note_listing
+
+# =========================
+# UI: Role Select (Creation)
+# =========================
+
+class RoleMultiSelect(discord.ui.Select):
+    """
+    Ephemeral dropdown shown to the creator to select required roles for this listing.
+    Produces the public embed + interactive buttons.
+    """
+    def __init__(self, interaction: discord.Interaction, dungeon: str, key_level: int,
+                 timing: Literal["Timed", "Completion"], requirements: Optional[str],
+                 passphrase: Optional[str], listed_as: Optional[str], your_role: Literal["Tank","Healer","Melee DPS","Ranged DPS"]):
+        all_options = [
+            discord.SelectOption(label="Tank", emoji="🛡️"),
+            discord.SelectOption(label="Healer", emoji="❤️‍🩹"),
+            discord.SelectOption(label="Melee DPS", emoji="⚔️"),
+            discord.SelectOption(label="Ranged DPS", emoji="🏹"),
+        ]
+        # If you want to filter out creator's current role from the required list, uncomment below:
+        # options = [opt for opt in all_options if opt.label != your_role]
+        options = [opt for opt in all_options]
+
+        super().__init__(
+            placeholder="Select required roles",
+            min_values=1,
+            max_values=len(options),
+            options=options,
+        )
+
+        # We carry a small listing model that seeds the embed + view
+        self.interaction = interaction
+        self.listing = Listing(
+            dungeon=dungeon,
+            key_level=key_level,
+            timing=timing,
+            your_role=your_role,
+            requirements=requirements,
+            passphrase=passphrase or generate_passphrase(),
+            listed_as=listed_as or generate_listed_as(dungeon),
+        )
+
+    @instrument("role_select")
+    async def callback(self, interaction: discord.Interaction):
+        self.listing.required_roles = [normalize_role(r) for r in self.values]
+
+        # Acknowledge ephemeral interaction (unless the deadline guard already did)
+        await ensure_deferred(interaction)
+
+        view = await publish_listing(interaction.channel, interaction.user, interaction.guild_id, self.listing)
+
+        # Remove the ephemeral select (the listing was posted fully rendered: no follow-up edit)
+        await interaction.delete_original_response()
+
+
+async def publish_listing(
+    channel: discord.abc.Messageable,
+    creator: discord.abc.Snowflake,
+    guild_id: Optional[int],
+    listing: Listing,
+    *,
+    roster: Optional[GroupState] = None,
+    content: Optional[str] = None,
+) -> "LFGButtonView":
+    """
+    Post the public listing message with its buttons and start tracking it (expiry + history),
+    then post its mirrors in the guild's other configured channels and save it to the group store.
+    Pass `roster` to post an already-formed group (e.g. a /queue match).
+    """
+    view = LFGButtonView(creator=creator, listing=listing, guild_id=guild_id)
+    if roster is not None:
+        view.members = roster
+    view.setup_buttons()  # rows, callbacks, initial enable/disable
+    public_message = await channel.send(content, embed=view.render().embed, view=view)
+    view.message = public_message
+    view.schedule_expiry()
+    note_listing(public_message.id)
+    targets = MIRRORS.targets(guild_id, listing.key_level, exclude=channel.id)
+    if targets:
+        await view.post_mirrors(targets)
+    view._log_event(
+        "create", creator.id, view.creator_original_role,
+        required_roles=list(view.required_roles), timing=listing.timing,
+        listed_as=listing.listed_as, passphrase=listing.passphrase,
+    )
+    for role, user_ids in view.members:
+        for user_id in user_ids:
+            if user_id != creator.id:
+                view._log_event("join", user_id, role, previous=None)
+    # Stored right away (message and mirror ids included), so a restart before the first click restores it
+    view._persist()
+    return view
+
+
+class RoleMultiSelectView(discord.ui.View):
+    """Thin container view for RoleMultiSelect (ephemeral)."""
+    def __init__(self, interaction: discord.Interaction, *args, your_role: str):
+        super().__init__(timeout=180)
+        self.add_item(RoleMultiSelect(interaction, *args, your_role=your_role))
+
+
+# =========================
+# UI: Update Required Roles (Ephemeral)
+# =========================
+
+class UpdateRequiredRoles(discord.ui.Select):
+    """
+    Ephemeral dropdown used to update required roles without recreating the embed.
+    Updates the running LFGButtonView and refreshes the message.
+    """
+    def __init__(self, lfg_view: "LFGButtonView"):
+        self.lfg_view = lfg_view
+
+        options = [
+            discord.SelectOption(label="Tank", emoji="🛡️"),
+            discord.SelectOption(label="Healer", emoji="❤️‍🩹"),
+            discord.SelectOption(label="Melee DPS", emoji="⚔️"),
+            discord.SelectOption(label="Ranged DPS", emoji="🏹"),
+        ]
+        super().__init__(
+            placeholder="Select updated required roles",
+            min_values=1,
+            max_values=len(options),
+            options=options,
+        )
+
+    @instrument("required_roles")
+    async def callback(self, interaction: discord.Interaction):
+        # Normalize to internal keys; applied (and published) by the listing's actor
+        roles = [normalize_role(role) for role in self.values]
+        await self.lfg_view.actor.call(lambda: self.lfg_view._apply_required_roles(interaction.user.id, roles))
+
+        # Replace the ephemeral view with a simple confirmation (and close it)
+        await edit_reply(interaction, content="✅ Required roles updated.", view=None)
+        self.view.stop()
+
+
+class UpdateRequiredRolesView(discord.ui.View):
+    """Thin container view for UpdateRequiredRoles (ephemeral)."""
+    def __init__(self, lfg_view: "LFGButtonView"):
+        super().__init__(timeout=180)
+        self.add_item(UpdateRequiredRoles(lfg_view))
+
+
+# =========================
+# UI: Waitlist Select (Ephemeral)
+# =========================
+
+ROLE_EMOJIS = {"tank": "🛡️", "healer": "❤️‍🩹", "meleedps": "⚔️", "rangeddps": "🏹"}
+
+
+class WaitlistSelect(discord.ui.Select):
+    """
+    Ephemeral dropdown of the roles that aren't open right now. The selection replaces the
+    user's waitlisted roles on this listing (selecting nothing leaves the waitlist).
+    """
+    def __init__(self, lfg_view: "LFGButtonView", roles: list[str], current: list[str]):
+        self.lfg_view = lfg_view
+        options = [
+            discord.SelectOption(label=ROLE_KEY_TO_TITLE[role], value=role, emoji=ROLE_EMOJIS[role],
+                                 default=role in current)
+            for role in roles
+        ]
+        super().__init__(
+            placeholder="Roles to get a DM for",
+            min_values=0,
+            max_values=len(options),
+            options=options,
+        )
+
+    @instrument("waitlist_select")
+    async def callback(self, interaction: discord.Interaction):
+        user_id = interaction.user.id
+        roles = list(self.values)
+        positions = await self.lfg_view.actor.call(lambda: self.lfg_view._apply_waitlist(user_id, roles))
+
+        if positions:
+            spots = ", ".join(f"**{ROLE_KEY_TO_TITLE[role]}** (#{pos})" for role, pos in positions.items())
+            content = f"🔔 You're on the waitlist for {spots}. I'll DM you when a spot opens."
+        else:
+            content = "🔕 You're not on the waitlist for this group."
+        await edit_reply(interaction, content=content, view=None)
+        self.view.stop()
+
+
+class WaitlistSelectView(discord.ui.View):
+    """Thin container view for WaitlistSelect (ephemeral)."""
+    def __init__(self, lfg_view: "LFGButtonView", roles: list[str], current: list[str]):
+        super().__init__(timeout=180)
+        self.add_item(WaitlistSelect(lfg_view, roles, current))
+
+
+# =========================
+# UI: Modal — Edit Requirements Text
+# =========================
+
+class RequirementsEdit(discord.ui.Modal, title="Edit Group Requirements"):
+    """
+    Modal to update the listing's 'Specific Requirements'.
+    Only the creator can open this modal.
+    """
+    def __init__(self, view: "LFGButtonView"):
+        super().__init__()
+        self.view = view
+
+        self.requirements = discord.ui.TextInput(
+            label="New Requirements",
+            placeholder="Enter updated requirements (e.g., interrupt, lust, etc.)",
+            style=discord.TextStyle.paragraph,
+            required=True,
+            max_length=200,
+        )
+        self.add_item(self.requirements)
+
+    @instrument("requirements_edit")
+    async def on_submit(self, interaction: discord.Interaction):
+        text = self.requirements.value
+        await self.view.actor.call(lambda: self.view._apply_requirements(text))
+        await reply(interaction, "✅ Requirements updated!")
+
+
+async def publish_match(channel: discord.abc.Messageable, match: Match) -> "LFGButtonView":
+    """Post a formed queue group as a regular listing, roster pre-filled, pinging every member."""
+    leader = match.leader
+    listing = Listing(
+        dungeon=match.dungeon,
+        key_level=match.key_level,
+        timing=match.timing,
+        your_role=ROLE_KEY_TO_TITLE[leader.role],
+        passphrase=generate_passphrase(),
+        listed_as=generate_listed_as(match.dungeon),
+        required_roles=[],  # full group
+    )
+    roster = GroupState(leader.user_id, leader.role)
+    for entry in match.members:
+        roster.join(entry.user_id, entry.role)
+    pings = " ".join(f"<@{entry.user_id}>" for entry in match.members)
+    return await publish_listing(
+        channel, discord.Object(id=leader.user_id), match.guild_id, listing,
+        roster=roster, content=f"🎉 Queue pop! {pings}",
+    )
+
+
+# =========================
+# View: Mirrored listing copy
+# =========================
+
+class ListingMirrorView(discord.ui.View):
+    """
+    Buttons on a copy of a listing in another channel. Holds no state of its own: every click
+    runs the primary LFGButtonView's handler, so all copies drive the same group.
+    """
+    def __init__(self, primary: "LFGButtonView",
+                 message: Optional[discord.Message | discord.PartialMessage] = None):
+        super().__init__(timeout=None)
+        self.primary = primary
+        self.message = message
+        for button in primary.buttons:
+            copy = discord.ui.Button(
+                label=button.label, style=button.style, custom_id=button.custom_id,
+                row=button.row, disabled=button.disabled,
+            )
+            copy.callback = button.callback
+            self.add_item(copy)
+
+    def apply(self, disabled: dict[str, bool]):
+        for item in self.children:
+            item.disabled = disabled[item.custom_id]
+
+
+# =========================
+# View: LFGButtonView
+# =========================
+
+class LFGButtonView(discord.ui.View):
+    """
+    Main interactive view attached to the public LFG message.
+    Handles:
+      - role buttons (Tank/Healer/Melee/Ranged) with dynamic enabled/disabled states
+      - edit requirements (modal)
+      - waitlist for roles that aren't open (DM when a spot opens)
+      - leave party
+      - close group
+      - auto-prompt creator to update required roles after they switch roles
+    Mirrored copies in other channels (ListingMirrorView) share this state; every edit is
+    fanned out to them.
+    """
+    def __init__(self, creator: discord.abc.Snowflake, listing: Listing,
+                 guild_id: Optional[int] = None, expires_at: Optional[float] = None):
+        # Persistent view: no per-view timeout, expiry is tracked via expires_at
+        super().__init__(timeout=None)
+        self.creator = creator
+        self.creator_role = listing.your_role
+        self.creator_original_role = normalize_role(listing.your_role)
+        self.listing = listing
+        self.renderer = ListingRenderer()
+        self.guild_id = guild_id
+        self.expires_at = expires_at or time.time() + LISTING_TTL
+        # Roster keyed by user id; the creator is auto-assigned to their chosen role
+        self.members = GroupState(creator.id, self.creator_original_role)
+        # Users waiting for a spot in a role that isn't open
+        self.waitlist = Waitlist()
+
+        # Message reference is set after send (or a PartialMessage when rehydrated)
+        self.message: Optional[discord.Message | discord.PartialMessage] = None
+        # Copies of this listing in other channels
+        self.mirrors: list[ListingMirrorView] = []
+
+        # Single writer: roster/status changes are applied in order by this listing's mailbox,
+        # and each batch of clicks is published once
+        self.actor = ListingActor(self._publish_batch, name="listing")
+
+        # Create all buttons up-front (manual approach = full layout control).
+        # Stable custom_ids make the view persistent across restarts (scoped per message).
+        self.tank = discord.ui.Button(label="🛡️ Tank", style=discord.ButtonStyle.primary, custom_id="tank")
+        self.healer = discord.ui.Button(label="❤️‍🩹 Healer", style=discord.ButtonStyle.primary, custom_id="healer")
+        self.meleedps = discord.ui.Button(label="⚔️ Melee DPS", style=discord.ButtonStyle.primary, custom_id="meleedps")
+        self.rangeddps = discord.ui.Button(label="🏹 Ranged DPS", style=discord.ButtonStyle.primary, custom_id="rangeddps")
+
+        self.edit_requirements = discord.ui.Button(label="✏️ Edit Requirements", style=discord.ButtonStyle.secondary, custom_id="edit_requirements")
+        self.join_waitlist = discord.ui.Button(label="🔔 Waitlist", style=discord.ButtonStyle.secondary, custom_id="waitlist")
+        self.leave = discord.ui.Button(label="🚪 Leave Party", style=discord.ButtonStyle.secondary, custom_id="leave")
+        self.cancel = discord.ui.Button(label="❌ Close Group", style=discord.ButtonStyle.secondary, custom_id="cancel")
+
+    @property
+    def required_roles(self) -> list[str]:
+        return self.listing.required_roles
+
+    @required_roles.setter
+    def required_roles(self, roles: list[str]):
+        self.listing.required_roles = [normalize_role(r) for r in roles]
+
+    @property
+    def closed(self) -> bool:
+        return not self.listing.is_open
+
+    @property
+    def buttons(self) -> tuple[discord.ui.Button, ...]:
+        """Every button, in visual order."""
+        return (
+            self.tank, self.healer, self.meleedps, self.rangeddps,
+            self.edit_requirements, self.join_waitlist, self.leave, self.cancel,
+        )
+
+    # ---- persistence ----
+
+    @classmethod
+    def from_record(cls, record: GroupRecord) -> "LFGButtonView":
+        """Rebuild a view from the group store without fetching the message."""
+        view = cls(
+            creator=discord.Object(id=record.creator_id),
+            listing=Listing.from_context(record.context, record.required_roles),
+            guild_id=record.guild_id,
+            expires_at=record.expires_at,
+        )
+        view.members = GroupState.from_dict(record.creator_id, record.members)
+        view.waitlist = Waitlist.from_dict(record.waitlist)
+        view.setup_buttons()
+        view.message = bot.get_partial_messageable(
+            record.channel_id, guild_id=record.guild_id
+        ).get_partial_message(record.message_id)
+        for channel_id, message_id in record.mirrors:
+            message = bot.get_partial_messageable(channel_id, guild_id=record.guild_id).get_partial_message(message_id)
+            view.mirrors.append(ListingMirrorView(view, message))
+        return view
+
+    def to_record(self) -> GroupRecord:
+        return GroupRecord(
+            message_id=self.message.id,
+            channel_id=self.message.channel.id,
+            guild_id=self.guild_id,
+            creator_id=self.creator.id,
+            creator_role=self.creator_role,
+            required_roles=list(self.required_roles),
+            members=self.members.to_dict(),
+            context=self.listing.to_context(),
+            expires_at=self.expires_at,
+            closed=self.listing.is_final,
+            waitlist=self.waitlist.to_dict(),
+            mirrors=[[mirror.message.channel.id, mirror.message.id] for mirror in self.mirrors],
+        )
+
+    def _persist(self):
+        if self.message is not None:
+            GROUP_STORE.save(self.to_record())
+
+    def _log_event(self, kind: str, user_id: Optional[int] = None, role: Optional[str] = None, **data):
+        """Append a lifecycle event for this listing to the history log (batched, non-blocking)."""
+        if self.message is None:
+            return
+        HISTORY.record(GroupEvent(
+            kind=kind,
+            group_id=self.message.id,
+            guild_id=self.guild_id,
+            dungeon=self.listing.dungeon,
+            key_level=self.listing.key_level,
+            user_id=user_id,
+            role=role,
+            data=data,
+        ))
+
+    def schedule_expiry(self):
+        """Hand this listing's deadline to the central expiry scheduler."""
+        OPEN_VIEWS[self.message.id] = self
+        EXPIRY.schedule(self.message.id, self.expires_at)
+        self._reindex()
+
+    def _reindex(self):
+        """Refresh this listing's /lfgbrowse entry (dropped once it's no longer open)."""
+        if self.message is None:
+            return
+        if self.closed:
+            LISTING_INDEX.remove(self.message.id)
+            return
+        LISTING_INDEX.put(IndexedListing(
+            message_id=self.message.id,
+            channel_id=self.message.channel.id,
+            guild_id=self.guild_id,
+            dungeon=self.listing.dungeon,
+            key_level=self.listing.key_level,
+            timing=self.listing.timing,
+            listed_as=self.listing.listed_as,
+            open_roles=tuple(role for role in ROLE_KEYS if role in self.required_roles),
+            members=len(self.members),
+            expires_at=self.expires_at,
+        ))
+
+    # ---- internal: layout/state helpers ----
+
+    def render(self) -> RenderedListing:
+        """Build the embed + component states from the listing model (never from the message)."""
+        with stage("render"):
+            return self.renderer.render(self.listing, self.members, self._looking_for())
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id or '@me'}/{self.message.channel.id}/{self.message.id}"
+
+    def _looking_for(self) -> str:
+        guild = bot.get_guild(self.guild_id) if self.guild_id else None
+        pings = get_role_pings(guild, (ROLE_KEY_TO_TITLE[k] for k in self.required_roles))
+        return pings if pings else "None"
+
+    def _apply_role_button_states(self, rendered: Optional[RenderedListing] = None):
+        """Enable only required roles (and disable everything once the group is closed)."""
+        if rendered is None:
+            rendered = self.render()
+        for btn in self.buttons:
+            btn.disabled = rendered.disabled[btn.custom_id]
+
+    def setup_buttons(self):
+        """Bind callbacks, set rows, apply states, then add to the view."""
+        # Bind callbacks
+        self.tank.callback = self._handle_tank
+        self.healer.callback = self._handle_healer
+        self.meleedps.callback = self._handle_melee
+        self.rangeddps.callback = self._handle_ranged
+        self.edit_requirements.callback = self._handle_edit_requirements
+        self.join_waitlist.callback = self._handle_waitlist
+        self.leave.callback = self._handle_leave
+        self.cancel.callback = self._handle_cancel
+
+        # Row layout → Row 0: roles, Row 1: edit, Row 2: controls
+        self.tank.row = self.healer.row = self.meleedps.row = self.rangeddps.row = 0
+        self.edit_requirements.row = self.join_waitlist.row = 1
+        self.leave.row = self.cancel.row = 2
+
+        # Apply initial disabled/enabled flags
+        self._apply_role_button_states()
+
+        # Add to view in visual order
+        for btn in self.buttons:
+            self.add_item(btn)
+
+    # ---- button callbacks ----
+
+    async def _handle_tank(self, interaction: discord.Interaction):
+        await self._join_role(interaction, "tank")
+
+    async def _handle_healer(self, interaction: discord.Interaction):
+        await self._join_role(interaction, "healer")
+
+    async def _handle_melee(self, interaction: discord.Interaction):
+        await self._join_role(interaction, "meleedps")
+
+    async def _handle_ranged(self, interaction: discord.Interaction):
+        await self._join_role(interaction, "rangeddps")
+
+    @instrument("edit_requirements")
+    async def _handle_edit_requirements(self, interaction: discord.Interaction):
+        if interaction.user.id != self.creator.id:
+            await reply(interaction, "🚫 Only the group creator can edit the requirements.")
+            return
+        await interaction.response.send_modal(RequirementsEdit(self))
+
+    @instrument("waitlist")
+    async def _handle_waitlist(self, interaction: discord.Interaction):
+        if self.closed:
+            await reply(interaction, "🚫 This group is no longer open.")
+            return
+        user_id = interaction.user.id
+        # Only roles whose button is disabled (and that the user doesn't already hold)
+        roles = [
+            role for role in ROLE_KEYS
+            if role not in self.required_roles and self.members.role_of(user_id) != role
+        ]
+        current = self.waitlist.roles_of(user_id)
+        if not roles and not current:
+            await reply(interaction, "✅ Every role you could take is open — just click it to join.")
+            return
+        roles = [role for role in ROLE_KEYS if role in roles or role in current]
+        await reply(
+            interaction,
+            "🔔 Pick the roles you want a DM for when a spot opens:",
+            view=WaitlistSelectView(self, roles, current),
+        )
+
+    @instrument("leave")
+    async def _handle_leave(self, interaction: discord.Interaction):
+        if interaction.user.id == self.creator.id:
+            await reply(interaction, "🚫 You can't leave the party as the creator. Use **Close Group** instead.")
+            return
+
+        user_id = interaction.user.id
+        left = await self.actor.call(lambda: self._apply_leave(user_id))
+
+        if left:
+            await reply(interaction, "👋 You've left the party.")
+        else:
+            await reply(interaction, "⚠️ You're not in the party.")
+
+    @instrument("cancel")
+    async def _handle_cancel(self, interaction: discord.Interaction):
+        if interaction.user.id != self.creator.id:
+            await reply(interaction, "🚫 Only the creator can close the group.")
+            return
+
+        user_id = interaction.user.id
+        closed = await self.actor.call(lambda: self._apply_close(user_id))
+        await reply(interaction, "✅ Group has been closed.")
+        if closed:
+            await self._publish_final()
+            await self.actor.stop()
+
+    # ---- commands (run on the listing actor, in order; return (result, changed)) ----
+
+    def _apply_join(self, user_id: int, role: str) -> tuple[bool, bool]:
+        if self.closed:
+            return False, False
+        # Single-role membership: joining moves the user out of any previous role
+        previous = self.members.join(user_id, role)
+        if previous == role:
+            return True, False
+        self.waitlist.remove(user_id)
+        self._log_event("join", user_id, role, previous=previous)
+        self._reindex()
+        return True, True
+
+    def _apply_leave(self, user_id: int) -> tuple[Optional[str], bool]:
+        if self.closed:
+            return None, False
+        role = self.members.leave(user_id)
+        if role is not None:
+            self._log_event("leave", user_id, role)
+            if role not in self.required_roles:
+                # The spot they held is free again: reopen it (logged like any re-role) and tell the waitlist
+                self._set_required_roles(None, [*self.required_roles, role], reason="leave")
+            else:
+                self._reindex()
+        return role, role is not None
+
+    def _apply_required_roles(self, user_id: int, roles: list[str]) -> tuple[None, bool]:
+        if self.closed:
+            return None, False
+        self._set_required_roles(user_id, roles)
+        return None, True
+
+    def _set_required_roles(self, user_id: Optional[int], roles: list[str], **data):
+        """Change the open roles: logged as a "reroles" event, newly opened roles notify their waitlist."""
+        previous = set(self.required_roles)
+        self.required_roles = roles
+        self._log_event("reroles", user_id, required_roles=list(self.required_roles), **data)
+        self._notify_waitlist([role for role in self.required_roles if role not in previous])
+        self._reindex()
+
+    def _apply_waitlist(self, user_id: int, roles: list[str]) -> tuple[dict[str, int], bool]:
+        if self.closed:
+            return {}, False
+        positions = self.waitlist.set(user_id, roles)
+        self._persist()
+        # The embed doesn't show the waitlist: nothing to publish
+        return positions, False
+
+    def _apply_requirements(self, text: str) -> tuple[None, bool]:
+        if self.closed:
+            return None, False
+        self.listing.requirements = text
+        return None, True
+
+    def _apply_close(self, user_id: int) -> tuple[bool, bool]:
+        if self.closed:
+            return False, False
+        self.listing.status = "closed"
+        self._cancel_expiry()
+        self._reindex()
+        self._persist()
+        self._log_event("close", user_id)
+        self.stop()
+        # The final edit is published right away by the caller, not batched
+        return True, False
+
+    def _apply_pause(self) -> tuple[bool, bool]:
+        if self.closed:
+            return False, False
+        # Persisted as still open: the next start restores the listing and re-enables it
+        self.listing.status = "paused"
+        self._reindex()
+        self._persist()
+        return True, False
+
+    def _apply_expire(self) -> tuple[bool, bool]:
+        if self.closed:
+            return False, False
+        self.listing.status = "expired"
+        self._reindex()
+        self._persist()
+        self._log_event("expire")
+        self.stop()
+        return True, False
+
+    def _notify_waitlist(self, roles: list[str]):
+        """DM the next WAITLIST_NOTIFY waitlisted users for each reopened role (queued, not awaited)."""
+        if self.message is None:
+            return
+        for role in roles:
+            for user_id in self.waitlist.pop(role, WAITLIST_NOTIFY):
+                DM_QUEUE.notify(
+                    user_id, (self.message.id, role),
+                    f"🔔 A **{ROLE_KEY_TO_TITLE[role]}** spot opened in **{self.listing.dungeon} "
+                    f"+{self.listing.key_level}** ({self.listing.listed_as}): {self.jump_url}",
+                )
+
+    # ---- mirrors ----
+
+    async def post_mirrors(self, channel_ids: list[int]):
+        """Post a copy of the listing in each channel, concurrently; channels that fail are skipped."""
+        rendered = self.render()
+
+        async def post(channel_id: int) -> ListingMirrorView:
+            mirror = ListingMirrorView(self)
+            mirror.apply(rendered.disabled)
+            channel = bot.get_partial_messageable(channel_id, guild_id=self.guild_id)
+            mirror.message = await channel.send(embed=rendered.embed, view=mirror)
+            return mirror
+
+        results = await asyncio.gather(*(post(channel_id) for channel_id in channel_ids), return_exceptions=True)
+        for channel_id, result in zip(channel_ids, results):
+            if isinstance(result, BaseException):
+                print(f"⚠️ Could not mirror listing {self.message.id} to channel {channel_id}: {result}")
+            else:
+                self.mirrors.append(result)
+
+    async def _render_mirror(self, mirror: ListingMirrorView):
+        rendered = self.render()
+        mirror.apply(rendered.disabled)
+        try:
+            with stage("edit"):
+                await mirror.message.edit(embed=rendered.embed, view=mirror)
+        except discord.NotFound:
+            # Deleted (e.g. by a moderator): stop mirroring there
+            if mirror in self.mirrors:
+                self.mirrors.remove(mirror)
+                mirror.stop()
+                self._persist()
+
+    async def _publish_mirror_final(self, mirror: ListingMirrorView):
+        try:
+            await EDIT_SCHEDULER.run_now(mirror.message.id, functools.partial(self._render_mirror, mirror))
+        except Exception as e:
+            print(f"⚠️ Final edit of mirror {mirror.message.id} failed: {e}")
+        finally:
+            EDIT_SCHEDULER.forget(mirror.message.id)
+
+    def stop(self):
+        super().stop()
+        for mirror in self.mirrors:
+            mirror.stop()
+
+    # ---- core behavior ----
+
+    async def update_embed(self, *, wait: bool = False):
+        """
+        Request a re-render of the public message and every mirror.
+        Requests are coalesced per message: a burst of clicks produces one edit of the latest state.
+        Each copy is its own edit, paced by its own channel, so a slow channel only delays its copy.
+        Pass wait=True to block until the edits covering this request have landed.
+        """
+        pending = EDIT_SCHEDULER.schedule(self.message.id, self._render_embed, bucket=self.message.channel.id)
+        track_edit(pending)
+        mirrored = [
+            EDIT_SCHEDULER.schedule(
+                mirror.message.id, functools.partial(self._render_mirror, mirror), bucket=mirror.message.channel.id,
+            )
+            for mirror in self.mirrors
+        ]
+        if wait:
+            await pending
+            await asyncio.gather(*mirrored, return_exceptions=True)
+
+        self._persist()
+
+    def _cancel_expiry(self):
+        EXPIRY.cancel(self.message.id)
+        OPEN_VIEWS.pop(self.message.id, None)
+
+    async def _publish_batch(self):
+        """Actor hook: publish the state after a batch of commands (closed listings publish their own final edit)."""
+        if self.message is not None and not self.closed:
+            await self.update_embed()
+
+    async def _render_embed(self):
+        """Render the latest listing state, reapply button states, then edit the message."""
+        rendered = self.render()
+        self._apply_role_button_states(rendered)
+        with stage("edit"):
+            await self.message.edit(embed=rendered.embed, view=self)
+
+    async def _publish_final(self):
+        """Edit a closed/expired listing (and its mirrors) right away, superseding any debounced roster edit."""
+        mirrors = [asyncio.ensure_future(self._publish_mirror_final(mirror)) for mirror in list(self.mirrors)]
+        try:
+            await EDIT_SCHEDULER.run_now(self.message.id, self._render_embed)
+        finally:
+            EDIT_SCHEDULER.forget(self.message.id)
+            if mirrors:
+                await asyncio.gather(*mirrors)
+
+    @instrument("join_role")
+    async def _join_role(self, interaction: discord.Interaction, role: str):
+        """
+        Assign the interacting user to the chosen role button.
+        If the creator changes roles, prompt them to update required roles (ephemeral).
+        """
+        user_id = interaction.user.id
+        joined = await self.actor.call(lambda: self._apply_join(user_id, role))
+        if not joined:
+            await reply(interaction, "🚫 This group is no longer open.")
+            return
+
+        # Prompt creator to confirm/update required roles every time they switch
+        if interaction.user.id == self.creator.id:
+            await reply(
+                interaction,
+                "👑 You changed your role. Please confirm or update the required roles:",
+                view=UpdateRequiredRolesView(self),
+            )
+        else:
+            await reply(
+                interaction,
+                f"✅ You joined as **{role.replace('dps', ' DPS').capitalize()}**!",
+            )
+
+    async def pause(self) -> bool:
+        """Shutdown: disable the buttons with a "restarting" footer until the listing is restored."""
+        paused = await self.actor.call(self._apply_pause)
+        if paused:
+            await self._publish_final()
+        return paused
+
+    async def on_timeout(self):
+        """
+        Called by the expiry scheduler after 30 minutes to auto-expire the post:
+        - strike title/description (see ListingRenderer)
+        - disable all buttons
+        """
+        if self.closed or not self.message:
+            return
+
+        expired = await self.actor.call(self._apply_expire)
+        if not expired:
+            return
+
+        try:
+            await self._publish_final()
+        except discord.NotFound:
+            pass
+        finally:
+            await self.actor.stop()
+
+
@@ -0,0 +1,118 @@
+"""
+Single-writer mailbox for one listing.
+
+Button handlers don't touch listing state themselves; they submit small synchronous
+commands (join / leave / switch / close ...) to the listing's mailbox. Commands are applied
+strictly in submission order and never interleave with each other or with a render, and
+each command's result is available immediately, so handlers can send their
+acknowledgements right away and concurrently. Publishing is left to the actor's task: it
+runs once per batch — everything applied in the same loop tick, plus whatever arrives while
+the previous publish is still running — always with the final state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.metrics import METRICS
+from src.core.profiler import stage
+
+log = logging.getLogger(__name__)
+
+# A command returns (result for the caller, whether it changed the listing)
+Command = Callable[[], tuple[Any, bool]]
+
+METRICS.describe("lfg_actor_commands_total", "Commands applied by listing actors")
+METRICS.describe("lfg_actor_publishes_total", "State publishes by listing actors (one per batch of commands)")
+
+
+class ListingActor:
+    """
+    - `submit(command)` queues a command and returns a future with its result.
+    - Commands run in order, one at a time; a command submitted from inside another command
+      is queued behind it rather than run re-entrantly.
+    - After a batch changed something, `publish()` runs once on the actor task.
+    """
+
+    def __init__(self, publish: Callable[[], Awaitable[None]], name: str = "listing"):
+        self._publish = publish
+        self.name = name
+        self._mailbox: deque[tuple[Command, asyncio.Future]] = deque()
+        self._applying = False
+        self._dirty = False
+        self._kick_scheduled = False
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = False
+        self.commands = 0
+        self.publishes = 0
+
+    def submit(self, command: Command) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._mailbox.append((command, fut))
+        if not self._applying:
+            self._drain()
+        if self._dirty and not self._stopped and not self._kick_scheduled:
+            # Everything submitted during this loop tick shares one publish
+            self._kick_scheduled = True
+            loop.call_soon(self._kick)
+        return fut
+
+    async def call(self, command: Command) -> Any:
+        """Submit and return the command's result."""
+        return await self.submit(command)
+
+    async def stop(self) -> None:
+        """Stop publishing (the listing published its final state itself); late commands still get answers."""
+        self._stopped = True
+        self._dirty = False
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._mailbox)
+
+    # ---- internal ----
+
+    def _drain(self) -> None:
+        self._applying = True
+        try:
+            while self._mailbox:
+                command, fut = self._mailbox.popleft()
+                self.commands += 1
+                METRICS.inc("lfg_actor_commands_total")
+                try:
+                    with stage("mutation"):
+                        result, changed = command()
+                except Exception as e:
+                    fut.set_exception(e)
+                    continue
+                self._dirty = self._dirty or changed
+                fut.set_result(result)
+        finally:
+            self._applying = False
+
+    def _kick(self) -> None:
+        self._kick_scheduled = False
+        if self._stopped or (self._task is not None and not self._task.done()):
+            return  # the running publish loop will pick the dirty flag up
+        self._task = asyncio.create_task(self._run(), name=f"actor:{self.name}")
+
+    async def _run(self) -> None:
+        while self._dirty and not self._stopped:
+            self._dirty = False
+            self.publishes += 1
+            METRICS.inc("lfg_actor_publishes_total")
+            try:
+                await self._publish()
+            except Exception as e:
+                log.warning("Publishing %s failed: %s", self.name, e)
@@ -0,0 +1,49 @@
+"""
+Gateway intents and client caches per deployment profile.
+
+The bot only reacts to interactions. It never reads message text. It never looks members up,
+because the interaction payload carries the author as a full Member. It only needs guilds with
+their roles and channels, for role pings and posting listings. The "lean" profile subscribes to
+exactly that:
+  - intents: `guilds` only, so no message, typing, reaction, voice or emoji events arrive
+  - no message cache (`max_messages=None`); listings are edited through stored ids/partials
+  - `MemberCacheFlags.none()`, so only the bot's own member is cached; authors stay per-interaction
+  - no member chunking at startup
+"default" keeps what the bot used before (discord.py defaults plus message_content), for
+comparisons.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import discord
+
+PROFILES = ("lean", "default")
+
+# Sentinel: use the profile's own max_messages
+PROFILE_DEFAULT = -1
+
+
+def client_options(profile: str = "lean", max_messages: Optional[int] = PROFILE_DEFAULT) -> dict[str, Any]:
+    """Keyword arguments for discord.Client / commands.Bot. `max_messages` 0 or None disables the cache."""
+    if profile == "lean":
+        intents = discord.Intents.none()
+        intents.guilds = True
+        options: dict[str, Any] = {
+            "intents": intents,
+            "max_messages": None,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+        }
+    elif profile == "default":
+        intents = discord.Intents.default()
+        intents.message_content = True
+        options = {"intents": intents, "max_messages": 1000}
+    else:
+        raise ValueError(f"unknown client profile {profile!r} (expected one of {', '.join(PROFILES)})")
+
+    if max_messages != PROFILE_DEFAULT:
+        # discord.py treats values <= 0 as "use 1000", so disabling has to be None
+        options["max_messages"] = max_messages if max_messages and max_messages > 0 else None
+    return options
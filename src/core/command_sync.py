@@ -0,0 +1,67 @@
+"""
+Skip-if-unchanged slash command sync.
+
+The serialized command tree is hashed and compared with the hash recorded after the
+last successful sync, so restarts and reconnects don't re-upload an unchanged tree.
+Dev/QA sync to specific guilds (instant propagation); prod syncs globally.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+import discord
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+
+def tree_fingerprint(tree: app_commands.CommandTree, application_id: Optional[int],
+                     guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """sha256 over the JSON payload Discord would receive for this scope."""
+    payload = sorted(
+        (cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild)),
+        key=lambda d: (d.get("type", 1), d["name"]),
+    )
+    blob = json.dumps({"app": application_id, "commands": payload}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    application_id: Optional[int],
+    state_dir: Path,
+    guild_ids: Iterable[int] = (),
+    force: bool = False,
+) -> dict[str, Optional[int]]:
+    """
+    Sync each scope whose fingerprint differs from the stored one.
+    Returns {scope: number of synced commands, or None if skipped}.
+    """
+    state_dir.mkdir(parents=True, exist_ok=True)
+    guilds = [discord.Object(id=gid) for gid in guild_ids]
+    scopes: list[tuple[str, Optional[discord.Object]]] = (
+        [(str(g.id), g) for g in guilds] if guilds else [("global", None)]
+    )
+
+    results: dict[str, Optional[int]] = {}
+    for name, guild in scopes:
+        if guild is not None:
+            tree.copy_global_to(guild=guild)
+
+        fingerprint = tree_fingerprint(tree, application_id, guild)
+        stamp = state_dir / f"command_tree.{name}.sha256"
+        previous = stamp.read_text().strip() if stamp.exists() else None
+
+        if not force and previous == fingerprint:
+            results[name] = None
+            continue
+
+        synced = await tree.sync(guild=guild)
+        stamp.write_text(fingerprint)
+        results[name] = len(synced)
+    return results
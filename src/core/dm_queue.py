@@ -0,0 +1,180 @@
+"""
+Background DM delivery for waitlist notifications.
+
+Callers only enqueue (`notify()` is synchronous and never waits on Discord). The workers
+then deliver in the background:
+  - folding: notifications for the same user that arrive within `fold_window` of the first
+    one go out as a single DM, and a repeated key (same listing + role) replaces the old line
+  - DM channels: the user -> DM channel id mapping is cached (LRU), so each user costs one
+    `POST /users/@me/channels` and then only message sends, through partial messageables
+  - rate limits: a token bucket for all DM traffic (it shares Discord's global limit with
+    listing edits) and a separate, slower one for opening DM channels. Every request still
+    goes through the REST priority scheduler at edit priority, so DMs never delay acks.
+Users with DMs closed (403) are dropped without retrying.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable
+
+import discord
+
+from src.core.metrics import METRICS
+from src.core.ratelimit import TokenBucket
+
+log = logging.getLogger(__name__)
+
+METRICS.describe("lfg_dm_total", "Waitlist DMs by outcome (sent, forbidden, failed, dropped)")
+METRICS.describe("lfg_dm_folded_total", "Notifications folded into a DM that was already queued for the user")
+METRICS.describe("lfg_dm_delivery_seconds", "Time from the first queued notification to the DM being sent")
+
+
+@dataclass
+class _PendingDM:
+    queued_at: float
+    lines: dict[Hashable, str] = field(default_factory=dict)
+
+
+class DMDispatcher:
+    """
+    - `notify(user_id, key, text)` queues one line for the user.
+    - `open_dm(user_id) -> channel id` and `send(channel_id, content)` do the REST calls.
+    - `start()` / `stop()` run the workers; `drain()` waits until the queue is empty.
+    """
+
+    def __init__(
+        self,
+        open_dm: Callable[[int], Awaitable[int]],
+        send: Callable[[int, str], Awaitable[None]],
+        *,
+        fold_window: float = 2.0,
+        rate: float = 5.0,
+        burst: int = 10,
+        open_rate: float = 1.0,
+        concurrency: int = 4,
+        channel_cache: int = 10_000,
+    ):
+        self.open_dm = open_dm
+        self.send = send
+        self.fold_window = fold_window
+        self.concurrency = concurrency
+        self.channel_cache = channel_cache
+        self._global = TokenBucket(rate, burst)
+        self._opens = TokenBucket(open_rate, max(1, burst // 2))
+        self._channels: OrderedDict[int, int] = OrderedDict()
+        self._pending: dict[int, _PendingDM] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        self._workers: list[asyncio.Task] = []
+        self._busy = 0
+
+        # Stats
+        self.sent = 0
+        self.failed = 0
+        self.folded = 0
+
+    # ---- producers ----
+
+    def notify(self, user_id: int, key: Hashable, text: str) -> None:
+        pending = self._pending.get(user_id)
+        if pending is not None:
+            pending.lines[key] = text
+            self.folded += 1
+            METRICS.inc("lfg_dm_folded_total")
+            return
+        self._pending[user_id] = _PendingDM(queued_at=time.monotonic(), lines={key: text})
+        if self.fold_window > 0:
+            self._timers[user_id] = asyncio.get_running_loop().call_later(self.fold_window, self._release, user_id)
+        else:
+            self._release(user_id)
+
+    @property
+    def depth(self) -> int:
+        """Users with a DM waiting (folding or queued for a worker)."""
+        return len(self._pending)
+
+    def stats(self) -> dict[str, int]:
+        return {"depth": self.depth, "sent": self.sent, "failed": self.failed, "folded": self.folded,
+                "cached_channels": len(self._channels)}
+
+    # ---- workers ----
+
+    def start(self) -> None:
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._work(), name=f"dm-worker-{len(self._workers)}"))
+
+    async def stop(self) -> int:
+        """Stop the workers; returns how many queued DMs were dropped."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        dropped = len(self._pending)
+        if dropped:
+            METRICS.inc("lfg_dm_total", dropped, outcome="dropped")
+        self._pending.clear()
+        return dropped
+
+    async def drain(self) -> None:
+        """Wait until every queued DM was handled (folding windows included)."""
+        while self._pending or self._busy:
+            await asyncio.sleep(0.05)
+
+    def _release(self, user_id: int) -> None:
+        self._timers.pop(user_id, None)
+        self._ready.put_nowait(user_id)
+
+    async def _work(self) -> None:
+        while True:
+            user_id = await self._ready.get()
+            pending = self._pending.pop(user_id, None)
+            if pending is None:
+                continue
+            self._busy += 1
+            try:
+                await self._deliver(user_id, pending)
+            finally:
+                self._busy -= 1
+
+    async def _deliver(self, user_id: int, pending: _PendingDM) -> None:
+        content = "\n".join(pending.lines.values())
+        try:
+            channel_id = await self._channel_for(user_id)
+            await self._global.acquire()
+            await self.send(channel_id, content)
+        except discord.Forbidden:
+            # DMs closed (or no shared guild); retrying won't help
+            self._channels.pop(user_id, None)
+            METRICS.inc("lfg_dm_total", outcome="forbidden")
+            return
+        except Exception as e:
+            self._channels.pop(user_id, None)
+            self.failed += 1
+            METRICS.inc("lfg_dm_total", outcome="failed")
+            log.warning("Waitlist DM to %s failed: %s", user_id, e)
+            return
+        self.sent += 1
+        METRICS.inc("lfg_dm_total", outcome="sent")
+        METRICS.observe("lfg_dm_delivery_seconds", time.monotonic() - pending.queued_at)
+
+    async def _channel_for(self, user_id: int) -> int:
+        channel_id = self._channels.get(user_id)
+        if channel_id is not None:
+            self._channels.move_to_end(user_id)
+            return channel_id
+        await self._opens.acquire()
+        await self._global.acquire()
+        channel_id = await self.open_dm(user_id)
+        self._channels[user_id] = channel_id
+        if len(self._channels) > self.channel_cache:
+            self._channels.popitem(last=False)
+        return channel_id
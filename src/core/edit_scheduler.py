@@ -0,0 +1,180 @@
+"""
+Per-message edit coalescing for LFG listings.
+
+Every button press used to trigger its own `message.edit(...)`. The scheduler below
+collapses all render requests for the same message that arrive inside a short
+window into a single edit of the *latest* state, and guarantees that at most one
+edit per message is in flight at any time.
+
+Edits can also name a rate-limit bucket (the channel). Discord allows about 5 message
+edits per 5 seconds per channel, so a debounced edit first waits for that channel's
+token bucket. Messages keep coalescing while they wait, and a busy channel waits on
+its own instead of sleeping through 429s in REST slots that other channels need.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Optional
+
+from src.core.ratelimit import TokenBucket
+
+log = logging.getLogger(__name__)
+
+RenderFn = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class _MessageSlot:
+    """Book-keeping for a single message id."""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    render: Optional[RenderFn] = None
+    task: Optional[asyncio.Task] = None
+    dirty: bool = False
+    requests: int = 0
+    edits: int = 0
+    waiters: list[asyncio.Future] = field(default_factory=list)
+    bucket: Optional[Hashable] = None
+
+
+class EditScheduler:
+    """
+    Debounce + coalesce message edits, keyed by message id.
+
+    - `schedule(key, render)` marks the message dirty and returns a future that
+      resolves once an edit covering this request has completed.
+    - `run_now(key, render)` cancels any pending debounce and performs the edit
+      immediately (used for close/expire, which must not be delayed).
+    - Edits for the same key are serialized by a per-key lock.
+    - Debounced edits with a `bucket` are paced to `bucket_rate` per second (bursts of
+      `bucket_burst`) per bucket; `bucket_rate=0` turns pacing off.
+    """
+
+    def __init__(self, window: float = 0.75, bucket_rate: float = 1.0, bucket_burst: int = 5):
+        self.window = window
+        self.bucket_rate = bucket_rate
+        self.bucket_burst = bucket_burst
+        self._slots: dict[int, _MessageSlot] = {}
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self.total_requests = 0
+        self.total_edits = 0
+
+    # ---- public API ----
+
+    def schedule(self, key: int, render: RenderFn, bucket: Optional[Hashable] = None) -> asyncio.Future:
+        """Queue a render for `key`; requests inside the window share one edit."""
+        slot = self._slots.setdefault(key, _MessageSlot())
+        slot.render = render
+        slot.bucket = bucket
+        slot.dirty = True
+        slot.requests += 1
+        self.total_requests += 1
+
+        fut = asyncio.get_running_loop().create_future()
+        slot.waiters.append(fut)
+
+        if slot.task is None or slot.task.done():
+            slot.task = asyncio.create_task(self._drain(key, slot))
+        return fut
+
+    async def run_now(self, key: int, render: RenderFn) -> None:
+        """Perform an edit immediately, superseding anything still debouncing."""
+        slot = self._slots.setdefault(key, _MessageSlot())
+        slot.requests += 1
+        self.total_requests += 1
+        slot.dirty = False
+        waiters, slot.waiters = slot.waiters, []
+
+        async with slot.lock:
+            try:
+                await render()
+            except Exception as e:
+                _resolve(waiters, e)
+                raise
+            finally:
+                slot.edits += 1
+                self.total_edits += 1
+        _resolve(waiters)
+
+    def forget(self, key: int) -> None:
+        """Drop all state for a message (e.g. after it was deleted or expired)."""
+        slot = self._slots.pop(key, None)
+        if slot and slot.task and not slot.task.done():
+            slot.task.cancel()
+        if slot:
+            _resolve(slot.waiters)
+
+    async def drain(self) -> None:
+        """Wait until every debounced edit has been flushed."""
+        while True:
+            running = [slot.task for slot in self._slots.values() if slot.task and not slot.task.done()]
+            if not running:
+                return
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def merged(self, key: Optional[int] = None) -> int:
+        """How many render requests were folded into another edit (per key or overall)."""
+        if key is None:
+            return self.total_requests - self.total_edits
+        slot = self._slots.get(key)
+        return (slot.requests - slot.edits) if slot else 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests": self.total_requests,
+            "edits": self.total_edits,
+            "merged": self.merged(),
+            "tracked_messages": len(self._slots),
+        }
+
+    # ---- internal ----
+
+    async def _drain(self, key: int, slot: _MessageSlot) -> None:
+        """Wait out the window, edit once with the latest render, repeat while dirty."""
+        while slot.dirty:
+            await asyncio.sleep(self.window)
+            if not slot.dirty:
+                break
+            if slot.bucket is not None and self.bucket_rate > 0:
+                await self._pace(slot.bucket)
+                if not slot.dirty:
+                    break
+
+            async with slot.lock:
+                # Snapshot *after* acquiring the lock so we always render the newest state
+                render = slot.render
+                waiters, slot.waiters = slot.waiters, []
+                slot.dirty = False
+                error: Optional[BaseException] = None
+                try:
+                    await render()
+                except Exception as e:
+                    error = e
+                    log.warning("Edit for message %s failed: %s", key, e)
+                finally:
+                    slot.edits += 1
+                    self.total_edits += 1
+                _resolve(waiters, error)
+
+            if len(waiters) > 1:
+                log.debug("Coalesced %d renders into one edit for message %s", len(waiters), key)
+
+    async def _pace(self, bucket: Hashable) -> None:
+        limiter = self._buckets.get(bucket)
+        if limiter is None:
+            limiter = self._buckets[bucket] = TokenBucket(self.bucket_rate, self.bucket_burst)
+        await limiter.acquire()
+
+
+def _resolve(waiters: list[asyncio.Future], error: Optional[BaseException] = None) -> None:
+    for fut in waiters:
+        if fut.done():
+            continue
+        if error is None:
+            fut.set_result(None)
+        else:
+            fut.set_exception(error)
+            # Callers that fire-and-forget shouldn't produce "exception never retrieved" noise
+            fut.exception()
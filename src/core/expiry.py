@@ -0,0 +1,168 @@
+"""
+Central expiry scheduler for listings.
+
+A single task owns every listing deadline (a min-heap with lazy deletion), instead of
+discord.py running one timeout task per view. Deadlines are wall-clock timestamps so
+they survive restarts together with the group store. Due expiries are processed in
+bounded batches with a pause between batches so a raid-night wave of expiries doesn't
+turn into a burst of message edits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Hashable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class ExpiryScheduler:
+    """
+    - `schedule(key, deadline)` adds or replaces a deadline (unix timestamp), so moving a
+      deadline earlier or later is another `schedule()`.
+    - `cancel(key)` forgets it.
+    Replaced/cancelled heap entries are skipped when popped (lazy deletion).
+    `stop()` lets the batch being expired finish, so no listing is left half-expired.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[Hashable], Awaitable[None]],
+        batch_size: int = 10,
+        batch_interval: float = 1.0,
+        concurrency: int = 5,
+    ):
+        self.on_expire = on_expire
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.concurrency = concurrency
+
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._live: dict[Hashable, tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # The batch being expired (shielded from stop(), which waits for it instead)
+        self._batch: Optional[asyncio.Future] = None
+
+        # Stats
+        self.fired = 0
+        self.failed = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+        self._total_lateness = 0.0
+
+    # ---- deadlines ----
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        seq = next(self._seq)
+        self._live[key] = (deadline, seq)
+        heapq.heappush(self._heap, (deadline, seq, key))
+        # Only wake the runner if this deadline is now the earliest one
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        return self._live.pop(key, None) is not None
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        current = self._live.get(key)
+        return current[0] if current else None
+
+    @property
+    def pending(self) -> int:
+        return len(self._live)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "pending": self.pending,
+            "fired": self.fired,
+            "failed": self.failed,
+            "last_lateness_s": round(self.last_lateness, 3),
+            "max_lateness_s": round(self.max_lateness, 3),
+            "avg_lateness_s": round(self._total_lateness / self.fired, 3) if self.fired else 0.0,
+        }
+
+    # ---- runner ----
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="expiry-scheduler")
+
+    async def stop(self) -> None:
+        """Stop firing new batches and wait for the one in flight."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._batch is not None:
+            await self._batch
+            self._batch = None
+
+    def _peek(self) -> Optional[float]:
+        """Earliest live deadline, discarding stale heap entries on the way."""
+        while self._heap:
+            deadline, seq, key = self._heap[0]
+            if self._live.get(key) == (deadline, seq):
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> list[tuple[Hashable, float]]:
+        due = []
+        while len(due) < self.batch_size:
+            deadline = self._peek()
+            if deadline is None or deadline > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._live[key]
+            due.append((key, deadline))
+        return due
+
+    async def _run(self) -> None:
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def fire(key: Hashable, deadline: float):
+            async with sem:
+                lateness = max(0.0, time.time() - deadline)
+                self.last_lateness = lateness
+                self.max_lateness = max(self.max_lateness, lateness)
+                self._total_lateness += lateness
+                self.fired += 1
+                try:
+                    await self.on_expire(key)
+                except Exception as e:
+                    self.failed += 1
+                    log.warning("Expiry for %s failed: %s", key, e)
+
+        while True:
+            self._wakeup.clear()
+            deadline = self._peek()
+            if deadline is None:
+                await self._wakeup.wait()
+                continue
+
+            delay = deadline - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = self._pop_due(time.time())
+            self._batch = asyncio.gather(*(fire(key, dl) for key, dl in batch))
+            await asyncio.shield(self._batch)
+            self._batch = None
+
+            # More already due? Pace the next batch to stay clear of edit rate limits
+            next_deadline = self._peek()
+            if next_deadline is not None and next_deadline <= time.time():
+                await asyncio.sleep(self.batch_interval)
@@ -0,0 +1,167 @@
+"""
+Compact roster model for a single LFG listing.
+
+Members are keyed by integer user id. A user→role index makes join/leave/switch O(1),
+each role keeps its join order (dicts preserve insertion order), and mention strings
+are only produced when the roster is rendered. `Waitlist` keeps the users waiting for a
+spot in a role that isn't open, in signup order.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Iterable, Iterator, Optional
+
+# Internal role keys, in display order
+ROLE_KEYS: tuple[str, ...] = ("tank", "healer", "meleedps", "rangeddps")
+
+
+class GroupState:
+    """Roster of one group: role -> ordered user ids, plus user id -> role."""
+
+    __slots__ = ("creator_id", "_roster", "_role_of")
+
+    def __init__(self, creator_id: int, creator_role: Optional[str] = None):
+        self.creator_id = creator_id
+        self._roster: dict[str, dict[int, None]] = {role: {} for role in ROLE_KEYS}
+        self._role_of: dict[int, str] = {}
+        if creator_role is not None:
+            self.join(creator_id, creator_role)
+
+    # ---- mutations ----
+
+    def join(self, user_id: int, role: str) -> Optional[str]:
+        """
+        Put the user in `role` (single-role membership).
+        Returns the role they switched away from, or None if they weren't in the group.
+        Re-joining the same role is a no-op and keeps their place in line.
+        """
+        previous = self._role_of.get(user_id)
+        if previous == role:
+            return previous
+        if previous is not None:
+            del self._roster[previous][user_id]
+        self._roster[role][user_id] = None
+        self._role_of[user_id] = role
+        return previous
+
+    def leave(self, user_id: int) -> Optional[str]:
+        """Remove the user; returns the role they held, or None if they weren't in the group."""
+        role = self._role_of.pop(user_id, None)
+        if role is not None:
+            del self._roster[role][user_id]
+        return role
+
+    # ---- queries ----
+
+    def role_of(self, user_id: int) -> Optional[str]:
+        return self._role_of.get(user_id)
+
+    def count(self, role: str) -> int:
+        return len(self._roster[role])
+
+    def members(self, role: str) -> Iterable[int]:
+        """User ids in `role`, in join order."""
+        return self._roster[role].keys()
+
+    def mentions(self, role: str) -> list[str]:
+        """Render-time mention strings for `role`, in join order."""
+        return [f"<@{uid}>" for uid in self._roster[role]]
+
+    def numbered(self, role: str) -> list[str]:
+        """Render-time roster lines for `role`: "1. <@id>", with a crown on the creator."""
+        creator = self.creator_id
+        return [
+            f"{i}. <@{uid}> 👑" if uid == creator else f"{i}. <@{uid}>"
+            for i, uid in enumerate(self._roster[role], 1)
+        ]
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._role_of
+
+    def __len__(self) -> int:
+        return len(self._role_of)
+
+    def __iter__(self) -> Iterator[tuple[str, Iterable[int]]]:
+        for role in ROLE_KEYS:
+            yield role, self._roster[role].keys()
+
+    # ---- serialization ----
+
+    def to_dict(self) -> dict[str, list[int]]:
+        return {role: list(users) for role, users in self._roster.items()}
+
+    @classmethod
+    def from_dict(cls, creator_id: int, data: dict[str, list]) -> "GroupState":
+        """Inverse of to_dict; also accepts legacy "<@id>" mention strings."""
+        state = cls(creator_id)
+        for role in ROLE_KEYS:
+            for user in data.get(role, ()):
+                state.join(_as_user_id(user), role)
+        return state
+
+
+class Waitlist:
+    """Per-role queues of user ids waiting for a spot, oldest first. Queues are created on first use."""
+
+    __slots__ = ("_queues",)
+
+    def __init__(self):
+        self._queues: dict[str, dict[int, None]] = {}
+
+    def set(self, user_id: int, roles: Iterable[str]) -> dict[str, int]:
+        """
+        Make `roles` the user's waitlisted roles; roles they keep stay at their place in line.
+        Returns role -> position (1-based) for each of them.
+        """
+        wanted = set(roles)
+        roles = [role for role in ROLE_KEYS if role in wanted]
+        for role, queue in self._queues.items():
+            if role not in roles:
+                queue.pop(user_id, None)
+        positions = {}
+        for role in roles:
+            queue = self._queues.setdefault(role, {})
+            queue.setdefault(user_id, None)
+            positions[role] = list(queue).index(user_id) + 1
+        return positions
+
+    def remove(self, user_id: int) -> None:
+        for queue in self._queues.values():
+            queue.pop(user_id, None)
+
+    def pop(self, role: str, n: int) -> list[int]:
+        """Take (and remove) up to `n` users from the front of `role`'s queue."""
+        queue = self._queues.get(role)
+        if not queue:
+            return []
+        taken = list(itertools.islice(queue, n))
+        for user_id in taken:
+            del queue[user_id]
+        return taken
+
+    def roles_of(self, user_id: int) -> list[str]:
+        return [role for role in ROLE_KEYS if user_id in self._queues.get(role, ())]
+
+    def count(self, role: str) -> int:
+        return len(self._queues.get(role, ()))
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def to_dict(self) -> dict[str, list[int]]:
+        return {role: list(queue) for role, queue in self._queues.items() if queue}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, list[int]]) -> "Waitlist":
+        waitlist = cls()
+        for role in ROLE_KEYS:
+            if data.get(role):
+                waitlist._queues[role] = dict.fromkeys(int(user_id) for user_id in data[role])
+        return waitlist
+
+
+def _as_user_id(value: int | str) -> int:
+    if isinstance(value, int):
+        return value
+    return int(value.strip("<@!>"))
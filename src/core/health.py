@@ -0,0 +1,192 @@
+"""
+Liveness/readiness for the container health check, plus event-loop blocking diagnostics.
+
+- `LoopLagProbe` sleeps a fixed interval in a background task and records how late it woke
+  up. That lateness is time the loop spent running something else without yielding.
+- `SlowCallbackDetector` times every loop callback (one task step each). It logs the ones
+  that ran longer than a threshold, naming the interaction handler whose step it was.
+- `HealthMonitor` combines gateway state, the time since the last gateway event, loop lag and
+  open listings. `check()` answers two questions:
+    live   the loop is responsive, and no shard has been disconnected longer than the grace period
+    ready  logged in, every shard connected, and not draining for shutdown
+`health_routes()` serves both as JSON on the metrics server (`/healthz`, `/readyz`); each
+returns 503 when its answer is no.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
+
+from src.core.metrics import CURRENT_HANDLER, METRICS
+
+log = logging.getLogger(__name__)
+
+METRICS.describe("lfg_event_loop_lag_seconds", "How late the loop lag probe woke up")
+METRICS.describe("lfg_slow_callbacks_total", "Loop callbacks that blocked the loop longer than the threshold, per handler")
+
+
+class LoopLagProbe:
+    """`lag` is the last measurement; `max_lag()` the worst one within `window` seconds."""
+
+    def __init__(self, interval: float = 0.5, window: float = 60.0):
+        self.interval = interval
+        self.window = window
+        self.lag = 0.0
+        self.last_tick: Optional[float] = None
+        self._recent: deque[tuple[float, float]] = deque()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="loop-lag-probe")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def max_lag(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._recent.popleft()
+        return max((lag for _, lag in self._recent), default=self.lag)
+
+    async def _run(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lag = max(0.0, now - start - self.interval)
+            self.last_tick = now
+            self._recent.append((now, self.lag))
+            METRICS.observe("lfg_event_loop_lag_seconds", self.lag)
+
+
+class SlowCallbackDetector:
+    """
+    Wraps `asyncio.Handle._run`, which every loop callback and task step goes through. The
+    cost is two clock reads per callback. `install()` is process-wide and idempotent.
+    """
+
+    def __init__(self, threshold: float = 0.1):
+        self.threshold = threshold
+        self.slow = 0
+        self.worst: Optional[tuple[str, float]] = None
+        self._original: Optional[Callable] = None
+
+    def install(self) -> None:
+        if self._original is not None or self.threshold <= 0:
+            return
+        original = asyncio.events.Handle._run
+        detector = self
+
+        def _run(handle):
+            start = time.perf_counter()
+            span = handle._context.get(CURRENT_HANDLER)
+            original(handle)
+            elapsed = time.perf_counter() - start
+            if elapsed >= detector.threshold:
+                detector._report(handle, span or handle._context.get(CURRENT_HANDLER), elapsed)
+
+        self._original = original
+        asyncio.events.Handle._run = _run
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            asyncio.events.Handle._run = self._original
+            self._original = None
+
+    def _report(self, handle, span: Optional[tuple[str, float]], elapsed: float) -> None:
+        name = span[0] if span else "other"
+        self.slow += 1
+        if self.worst is None or elapsed > self.worst[1]:
+            self.worst = (name, elapsed)
+        METRICS.inc("lfg_slow_callbacks_total", handler=name)
+        if span:
+            log.warning("Handler %s blocked the event loop for %.0f ms", name, elapsed * 1000)
+        else:
+            log.warning("Callback %r blocked the event loop for %.0f ms", handle, elapsed * 1000)
+
+
+class HealthMonitor:
+    """
+    Feed it with `event()` (every gateway dispatch) and `gateway_up()` / `gateway_down()`
+    (per shard); `check(...)` returns (live, ready, details).
+    """
+
+    def __init__(self, probe: LoopLagProbe, shard_ids: Iterable[int] = (0,), max_loop_lag: float = 2.0,
+                 disconnect_grace: float = 120.0):
+        self.probe = probe
+        self.max_loop_lag = max_loop_lag
+        self.disconnect_grace = disconnect_grace
+        self.started = time.monotonic()
+        self.last_event: Optional[float] = None
+        # shard id -> monotonic time it went down; every shard is "down" until its first connect
+        self._down_since: dict[int, float] = dict.fromkeys(shard_ids, self.started)
+
+    def event(self) -> None:
+        self.last_event = time.monotonic()
+
+    def gateway_up(self, shard_id: int = 0) -> None:
+        self._down_since.pop(shard_id, None)
+
+    def gateway_down(self, shard_id: int = 0) -> None:
+        self._down_since.setdefault(shard_id, time.monotonic())
+
+    def check(self, *, logged_in: bool, latencies: dict[int, float], open_listings: int,
+              draining: bool = False) -> tuple[bool, bool, dict[str, Any]]:
+        now = time.monotonic()
+        lag = self.probe.lag
+        # A probe that stopped ticking means the loop is stuck (or the probe died)
+        stalled = self.probe.last_tick is not None and now - self.probe.last_tick > self.probe.interval + self.max_loop_lag
+        down_for = {shard: now - since for shard, since in self._down_since.items()}
+        live = lag <= self.max_loop_lag and not stalled and all(d <= self.disconnect_grace for d in down_for.values())
+        ready = live and logged_in and not down_for and not draining
+
+        details = {
+            "status": "ok" if ready else "live" if live else "down",
+            "live": live,
+            "ready": ready,
+            "gateway": {
+                "logged_in": logged_in,
+                "shards": {
+                    str(shard): {
+                        "connected": shard not in down_for,
+                        "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+                        **({"down_s": round(down_for[shard], 1)} if shard in down_for else {}),
+                    }
+                    for shard, latency in sorted({**dict.fromkeys(down_for, math.nan), **latencies}.items())
+                },
+            },
+            "seconds_since_event": round(now - self.last_event, 1) if self.last_event is not None else None,
+            "loop_lag_ms": round(lag * 1000, 1),
+            "loop_lag_max_ms": round(self.probe.max_lag(now) * 1000, 1),
+            "open_listings": open_listings,
+            "draining": draining,
+            "uptime_s": round(now - self.started),
+        }
+        return live, ready, details
+
+
+def health_routes(check: Callable[[], tuple[bool, bool, dict[str, Any]]]) -> dict[str, Callable]:
+    """GET routes for start_metrics_server: /healthz (liveness) and /readyz (readiness)."""
+    from aiohttp import web
+
+    async def healthz(_request):
+        live, _, details = check()
+        return web.json_response(details, status=200 if live else 503)
+
+    async def readyz(_request):
+        _, ready, details = check()
+        return web.json_response(details, status=200 if ready else 503)
+
+    return {"/healthz": healthz, "/readyz": readyz}
@@ -0,0 +1,270 @@
+"""
+Append-only group event log backing /lfghistory (and the /lfgstats rollups).
+
+Events are buffered in memory and written in batches on a dedicated SQLite thread; a batch
+whose write fails (e.g. SQLITE_BUSY from another cluster process) stays buffered and is retried.
+Besides the raw `events` table (indexed by user, guild, dungeon and time), the writer
+maintains two small derived tables in the same transaction:
+  - `group_summary`: one row per group (dungeon, key, passphrase, outcome, ...)
+  - `participation`: one row per (user, group), ordered by a monotonic sequence
+A history page is a single index range scan on participation(user_id, guild_id, seq)
+with a cursor, so reading never touches the rest of the log.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts        REAL    NOT NULL,
+    kind      TEXT    NOT NULL,
+    group_id  INTEGER NOT NULL,
+    guild_id  INTEGER,
+    user_id   INTEGER,
+    role      TEXT,
+    dungeon   TEXT,
+    key_level INTEGER,
+    data      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_user    ON events (user_id, id);
+CREATE INDEX IF NOT EXISTS idx_events_guild   ON events (guild_id, id);
+CREATE INDEX IF NOT EXISTS idx_events_dungeon ON events (dungeon, id);
+CREATE INDEX IF NOT EXISTS idx_events_ts      ON events (ts);
+
+CREATE TABLE IF NOT EXISTS group_summary (
+    group_id   INTEGER PRIMARY KEY,
+    guild_id   INTEGER,
+    creator_id INTEGER,
+    dungeon    TEXT,
+    key_level  INTEGER,
+    timing     TEXT,
+    listed_as  TEXT,
+    passphrase TEXT,
+    created_ts REAL,
+    ended_ts   REAL,
+    outcome    TEXT
+);
+
+CREATE TABLE IF NOT EXISTS participation (
+    user_id  INTEGER NOT NULL,
+    group_id INTEGER NOT NULL,
+    guild_id INTEGER,
+    seq      INTEGER NOT NULL,
+    role     TEXT,
+    left     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, group_id)
+);
+CREATE INDEX IF NOT EXISTS idx_participation_page ON participation (user_id, guild_id, seq);
+"""
+
+
+@dataclass
+class GroupEvent:
+    """One lifecycle event: create | join | leave | reroles | close | expire."""
+    kind: str
+    group_id: int
+    guild_id: Optional[int]
+    dungeon: str
+    key_level: int
+    user_id: Optional[int] = None
+    role: Optional[str] = None
+    data: dict[str, Any] = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+    # Assigned by the log once written (monotonic across restarts)
+    id: Optional[int] = None
+
+
+@dataclass
+class HistoryEntry:
+    group_id: int
+    seq: int
+    dungeon: str
+    key_level: int
+    timing: Optional[str]
+    listed_as: Optional[str]
+    passphrase: Optional[str]
+    role: Optional[str]
+    left: bool
+    created_ts: Optional[float]
+    outcome: Optional[str]
+
+
+class HistoryLog:
+    def __init__(self, path: str | Path, flush_interval: float = 0.5, max_batch: int = 500):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-log")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._buffer: list[GroupEvent] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._subscribers: list[Callable[[GroupEvent], None]] = []
+        self.written = 0
+
+    # ---- lifecycle ----
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    # ---- writes ----
+
+    def subscribe(self, fn: Callable[[GroupEvent], None]) -> None:
+        """Called (on the event loop) for every event once it has been durably written."""
+        self._subscribers.append(fn)
+
+    def record(self, event: GroupEvent) -> None:
+        """Buffer an event; it is written with the next batch (never blocks the loop)."""
+        self._buffer.append(event)
+        if not self.is_open:
+            return
+        if len(self._buffer) >= self.max_batch:
+            asyncio.create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def flush(self) -> None:
+        if not self._buffer or not self.is_open:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            ids = await self._run(self._write_sync, batch)
+        except BaseException:
+            # One transaction, so nothing was written: retry it ahead of the events recorded since
+            self._buffer[:0] = batch
+            raise
+        self.written += len(batch)
+        for event, event_id in zip(batch, ids):
+            event.id = event_id
+            for fn in self._subscribers:
+                try:
+                    fn(event)
+                except Exception as e:
+                    log.warning("History subscriber failed on %s: %s", event.kind, e)
+
+    # ---- reads ----
+
+    async def user_history(self, user_id: int, guild_id: Optional[int], limit: int = 5,
+                           before: Optional[int] = None) -> tuple[list[HistoryEntry], Optional[int]]:
+        """
+        Most recent groups for a user (newest first), one page at a time.
+        Returns (entries, next_cursor); pass next_cursor as `before` to get the next page.
+        """
+        rows = await self._run(self._user_history_sync, user_id, guild_id, limit + 1, before)
+        entries = [HistoryEntry(*row[:8], left=bool(row[8]), created_ts=row[9], outcome=row[10])
+                   for row in rows[:limit]]
+        next_cursor = entries[-1].seq if len(rows) > limit else None
+        return entries, next_cursor
+
+    async def events_since(self, after_id: int, limit: int = 10_000) -> list[GroupEvent]:
+        """Raw events with id > after_id, oldest first (used to replay the log tail)."""
+        rows = await self._run(self._events_since_sync, after_id, limit)
+        return [
+            GroupEvent(kind=kind, group_id=group_id, guild_id=guild_id, dungeon=dungeon, key_level=key_level,
+                       user_id=user_id, role=role, data=json.loads(data or "{}"), ts=ts, id=event_id)
+            for (event_id, ts, kind, group_id, guild_id, user_id, role, dungeon, key_level, data) in rows
+        ]
+
+    # ---- internal ----
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            log.error("History flush failed (%d events kept for a retry): %s", len(self._buffer), e)
+            if self._buffer and self.is_open:
+                self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _open_sync(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conn.commit()
+        self._conn = conn
+
+    def _write_sync(self, batch: list[GroupEvent]) -> list[int]:
+        ids = []
+        with self._conn:
+            cur = self._conn.cursor()
+            for ev in batch:
+                cur.execute(
+                    "INSERT INTO events (ts, kind, group_id, guild_id, user_id, role, dungeon, key_level, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ev.ts, ev.kind, ev.group_id, ev.guild_id, ev.user_id, ev.role, ev.dungeon, ev.key_level,
+                     json.dumps(ev.data) if ev.data else None),
+                )
+                event_id = cur.lastrowid
+                ids.append(event_id)
+                self._apply_derived(cur, ev, event_id)
+        return ids
+
+    def _apply_derived(self, cur: sqlite3.Cursor, ev: GroupEvent, event_id: int) -> None:
+        if ev.kind == "create":
+            cur.execute(
+                "INSERT OR REPLACE INTO group_summary (group_id, guild_id, creator_id, dungeon, key_level, timing,"
+                " listed_as, passphrase, created_ts, ended_ts, outcome) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL)",
+                (ev.group_id, ev.guild_id, ev.user_id, ev.dungeon, ev.key_level, ev.data.get("timing"),
+                 ev.data.get("listed_as"), ev.data.get("passphrase"), ev.ts),
+            )
+        if ev.kind in ("create", "join") and ev.user_id is not None:
+            cur.execute(
+                "INSERT INTO participation (user_id, group_id, guild_id, seq, role, left) VALUES (?, ?, ?, ?, ?, 0)"
+                " ON CONFLICT(user_id, group_id) DO UPDATE SET role = excluded.role, left = 0",
+                (ev.user_id, ev.group_id, ev.guild_id, event_id, ev.role),
+            )
+        elif ev.kind == "leave" and ev.user_id is not None:
+            cur.execute(
+                "UPDATE participation SET left = 1 WHERE user_id = ? AND group_id = ?",
+                (ev.user_id, ev.group_id),
+            )
+        elif ev.kind in ("close", "expire"):
+            cur.execute(
+                "UPDATE group_summary SET ended_ts = ?, outcome = ? WHERE group_id = ?",
+                (ev.ts, ev.kind, ev.group_id),
+            )
+
+    def _user_history_sync(self, user_id: int, guild_id: Optional[int], limit: int,
+                           before: Optional[int]) -> list[tuple]:
+        return self._conn.execute(
+            "SELECT p.group_id, p.seq, g.dungeon, g.key_level, g.timing, g.listed_as, g.passphrase, p.role,"
+            " p.left, g.created_ts, g.outcome"
+            " FROM participation p JOIN group_summary g ON g.group_id = p.group_id"
+            " WHERE p.user_id = ? AND p.guild_id IS ? AND p.seq < ?"
+            " ORDER BY p.seq DESC LIMIT ?",
+            (user_id, guild_id, before if before is not None else 2**63 - 1, limit),
+        ).fetchall()
+
+    def _events_since_sync(self, after_id: int, limit: int) -> list[tuple]:
+        return self._conn.execute(
+            "SELECT id, ts, kind, group_id, guild_id, user_id, role, dungeon, key_level, data"
+            " FROM events WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
@@ -0,0 +1,169 @@
+"""
+Typed listing model and a pure, section-cached renderer.
+
+The renderer builds the public embed and the button states from a `Listing` plus its
+`GroupState` roster — it never looks at message content and needs no Discord
+connection, so it can be benchmarked on its own. Each section (header, one field per
+role, footer) is cached on its inputs, so a click that only changes the healer list
+only rebuilds the healer field.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal, Optional
+
+import discord
+
+from src.core.group_state import ROLE_KEYS, GroupState
+
+ListingStatus = Literal["open", "paused", "closed", "expired"]
+
+# Statuses a listing never leaves ('paused' is only set while the bot restarts)
+FINAL_STATUSES = ("closed", "expired")
+
+ROLE_LABELS = {
+    "tank": "🛡️ Tank",
+    "healer": "❤️‍🩹 Healer",
+    "meleedps": "⚔️ Melee DPS",
+    "rangeddps": "🏹 Ranged DPS",
+}
+
+FOOTERS = {
+    "open": "Click a role to join. Group expires in 30 minutes.",
+    "paused": "⏸️ The bot is restarting — buttons will work again in a minute.",
+    "closed": "❌ This group has been closed.",
+    "expired": "⏳ Group expired after 30 minutes.",
+}
+
+
+def normalize_role(role: str) -> str:
+    """"Melee DPS" -> "meleedps" (internal role key)."""
+    return role.lower().replace(" ", "")
+
+
+@dataclass
+class Listing:
+    """Everything shown on a listing except the roster."""
+    dungeon: str
+    key_level: int
+    timing: str
+    your_role: str
+    listed_as: str
+    passphrase: str
+    requirements: Optional[str] = None
+    required_roles: list[str] = field(default_factory=list)
+    status: ListingStatus = "open"
+
+    def __post_init__(self):
+        self.required_roles = [normalize_role(r) for r in self.required_roles]
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == "open"
+
+    @property
+    def is_final(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def to_context(self) -> dict[str, Any]:
+        """Serializable form (stored as the group's context)."""
+        return asdict(self)
+
+    @classmethod
+    def from_context(cls, context: dict[str, Any], required_roles: Optional[list[str]] = None) -> "Listing":
+        known = {k: v for k, v in context.items() if k in cls.__dataclass_fields__}
+        if required_roles is not None:
+            known["required_roles"] = required_roles
+        return cls(**known)
+
+
+@dataclass
+class RenderedListing:
+    """Output of the renderer: the embed plus which components should be disabled."""
+    embed: discord.Embed
+    disabled: dict[str, bool]
+
+
+class ListingRenderer:
+    """
+    Pure render function with per-section memoization.
+
+    `render(listing, roster, looking_for)` always returns the same output for the same
+    inputs; caching only skips string building for sections whose inputs didn't change.
+    """
+
+    def __init__(self, cache: bool = True):
+        self.cache = cache
+        self._header: tuple[Optional[tuple], tuple[str, str]] = (None, ("", ""))
+        self._fields: dict[str, tuple[Optional[tuple], tuple[str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, listing: Listing, roster: GroupState, looking_for: str) -> RenderedListing:
+        title, description = self._render_header(listing, looking_for)
+        embed = discord.Embed(title=title, description=description, color=discord.Color.dark_blue())
+        for role in ROLE_KEYS:
+            name, value = self._render_field(role, listing, roster)
+            embed.add_field(name=name, value=value, inline=False)
+        embed.set_footer(text=FOOTERS[listing.status])
+
+        closed = not listing.is_open
+        disabled = {role: closed or role not in listing.required_roles for role in ROLE_KEYS}
+        for custom_id in ("edit_requirements", "waitlist", "leave", "cancel"):
+            disabled[custom_id] = closed
+        return RenderedListing(embed=embed, disabled=disabled)
+
+    # ---- sections ----
+
+    def _render_header(self, listing: Listing, looking_for: str) -> tuple[str, str]:
+        key = (
+            listing.dungeon, listing.key_level, listing.listed_as, listing.passphrase,
+            listing.timing, listing.requirements, looking_for, listing.status,
+        )
+        cached_key, cached = self._header
+        if self.cache and cached_key == key:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        title = f"KC: {listing.dungeon} +{listing.key_level}"
+        lines = [
+            f"🪪 **Listed As**: `{listing.listed_as}`",
+            f"🔑 **Passphrase**: ||{listing.passphrase}||",
+            f"⏱️ **Timing Expectation**: {listing.timing}",
+            f"👥 **Looking For**: {looking_for}",
+            f"📌 **Specific Requirements**: {listing.requirements or 'None'}",
+        ]
+        if listing.status == "closed":
+            # Strike every line, keeping the passphrase spoiler intact
+            lines = [f"~~{line}~~" for line in lines]
+            lines[1] = f"🔑 **Passphrase**: ||~~{listing.passphrase}~~||"
+            description = "\n".join(lines)
+        elif listing.status == "expired":
+            title = f"~~{title}~~"
+            description = "~~" + "\n".join(lines) + "~~"
+        else:
+            description = "\n".join(lines)
+
+        self._header = (key, (title, description))
+        return title, description
+
+    def _render_field(self, role: str, listing: Listing, roster: GroupState) -> tuple[str, str]:
+        required = role in listing.required_roles
+        key = (roster.creator_id, required, tuple(roster.members(role)))
+        cached_key, cached = self._fields.get(role, (None, ("", "")))
+        if self.cache and cached_key == key:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        user_list = roster.numbered(role)
+        if required:
+            value = "\n".join(user_list) or "*— empty —*"
+        else:
+            value = "\n".join(user_list) if user_list else "*Filled Spot*"
+        out = (f"{ROLE_LABELS[role]} ({len(user_list)})", value)
+
+        self._fields[role] = (key, out)
+        return out
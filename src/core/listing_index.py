@@ -0,0 +1,142 @@
+"""
+In-memory index of open listings, for /lfgbrowse.
+
+Every open listing is filed in the buckets (guild, dungeon or None, open role or None) it
+matches, so at most 2 × (1 + open roles) of them. None means "any". Inside a bucket, listings
+are grouped by key level in posting order. A query is one bucket lookup plus a walk over
+that bucket's key levels (a few dozen at most). Whole levels before the requested page are
+skipped by their size. The cost depends on the page size, not on how many listings are open.
+
+The listing views keep it current: `put()` on create, join, leave, re-role and restore;
+`remove()` once a listing closes, expires or is paused.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# (key level -> {message id: listing}) for one (guild, dungeon, role)
+_Levels = dict[int, dict[int, "IndexedListing"]]
+
+
+@dataclass(frozen=True)
+class IndexedListing:
+    message_id: int
+    channel_id: int
+    guild_id: Optional[int]
+    dungeon: str
+    key_level: int
+    timing: str
+    listed_as: str
+    open_roles: tuple[str, ...]  # internal role keys
+    members: int
+    expires_at: float
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id or '@me'}/{self.channel_id}/{self.message_id}"
+
+    def _buckets(self) -> Iterator[tuple[Optional[int], Optional[str], Optional[str]]]:
+        for dungeon in (None, self.dungeon):
+            for role in (None, *self.open_roles):
+                yield self.guild_id, dungeon, role
+
+
+class ListingIndex:
+    """
+    - `put(listing)` adds or updates a listing (keyed by its message id).
+    - `remove(message_id)` drops it.
+    - `query(guild_id, ...)` returns one page of matches (highest key first, oldest first
+      within a key level) and the total number of matches.
+    """
+
+    def __init__(self):
+        self._buckets: dict[tuple[Optional[int], Optional[str], Optional[str]], _Levels] = {}
+        self._entries: dict[int, IndexedListing] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._entries
+
+    def get(self, message_id: int) -> Optional[IndexedListing]:
+        return self._entries.get(message_id)
+
+    # ---- mutations ----
+
+    def put(self, listing: IndexedListing) -> None:
+        old = self._entries.get(listing.message_id)
+        if old is not None:
+            if (old.guild_id, old.dungeon, old.key_level, old.open_roles) == (
+                listing.guild_id, listing.dungeon, listing.key_level, listing.open_roles,
+            ):
+                # Same buckets (e.g. a join): swap the record in place, keeping its position
+                self._entries[listing.message_id] = listing
+                for key in listing._buckets():
+                    self._buckets[key][listing.key_level][listing.message_id] = listing
+                return
+            self._remove(old)
+        self._entries[listing.message_id] = listing
+        for key in listing._buckets():
+            self._buckets.setdefault(key, {}).setdefault(listing.key_level, {})[listing.message_id] = listing
+
+    def remove(self, message_id: int) -> bool:
+        listing = self._entries.get(message_id)
+        if listing is None:
+            return False
+        self._remove(listing)
+        return True
+
+    # ---- queries ----
+
+    def query(
+        self,
+        guild_id: Optional[int],
+        *,
+        dungeon: Optional[str] = None,
+        role: Optional[str] = None,
+        key_min: Optional[int] = None,
+        key_max: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 10,
+    ) -> tuple[list[IndexedListing], int]:
+        levels = self._buckets.get((guild_id, dungeon, role))
+        if not levels:
+            return [], 0
+        in_range = [
+            level for level in sorted(levels, reverse=True)
+            if (key_min is None or level >= key_min) and (key_max is None or level <= key_max)
+        ]
+        total = sum(len(levels[level]) for level in in_range)
+
+        page: list[IndexedListing] = []
+        skip = offset
+        for level in in_range:
+            pool = levels[level]
+            if skip >= len(pool):
+                skip -= len(pool)
+                continue
+            page.extend(itertools.islice(pool.values(), skip, skip + limit - len(page)))
+            skip = 0
+            if len(page) >= limit:
+                break
+        return page, total
+
+    # ---- internal ----
+
+    def _remove(self, listing: IndexedListing) -> None:
+        del self._entries[listing.message_id]
+        for key in listing._buckets():
+            levels = self._buckets.get(key)
+            if levels is None:
+                continue
+            pool = levels.get(listing.key_level)
+            if pool is not None:
+                pool.pop(listing.message_id, None)
+                if not pool:
+                    del levels[listing.key_level]
+            if not levels:
+                del self._buckets[key]
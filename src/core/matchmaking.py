@@ -0,0 +1,188 @@
+"""
+Matchmaking queue for /queue: players queue with a dungeon set, key-level range, timing
+and role; a 1 tank / 1 healer / 3 DPS group is formed as soon as one is possible.
+
+Entries live in buckets keyed by (guild, dungeon, timing, role slot). Inside a bucket,
+an interval index maps each key level to the entries whose range covers it (insertion
+ordered, so the oldest entry is picked first). Key levels are a small discrete range, so
+a stabbing query ("who can do a +14?") is one dict lookup.
+
+A new group can only ever include the entry that just arrived (anything else would have
+matched earlier), so matching only probes that entry's dungeons × key levels: at most a
+few hundred O(1) lookups, independent of queue size.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+# Role key -> slot in the group template
+ROLE_SLOTS = {"tank": "tank", "healer": "healer", "meleedps": "dps", "rangeddps": "dps"}
+GROUP_TEMPLATE = {"tank": 1, "healer": 1, "dps": 3}
+
+# (level -> {seq: entry}) for one (guild, dungeon, timing, slot)
+_Levels = dict[int, dict[int, "QueueEntry"]]
+
+
+@dataclass
+class QueueEntry:
+    user_id: int
+    guild_id: Optional[int]
+    dungeons: tuple[str, ...]  # in order of preference
+    key_min: int
+    key_max: int
+    timing: str
+    role: str  # internal role key
+    queued_at: float = field(default_factory=time.time)
+    seq: int = 0
+
+    @property
+    def slot(self) -> str:
+        return ROLE_SLOTS[self.role]
+
+
+@dataclass
+class Match:
+    guild_id: Optional[int]
+    dungeon: str
+    key_level: int
+    timing: str
+    tank: QueueEntry
+    healer: QueueEntry
+    dps: list[QueueEntry]
+
+    @property
+    def members(self) -> list[QueueEntry]:
+        return [self.tank, self.healer, *self.dps]
+
+    @property
+    def leader(self) -> QueueEntry:
+        """Whoever has waited longest leads the group."""
+        return min(self.members, key=lambda e: e.seq)
+
+
+class MatchQueue:
+    """
+    - `enqueue(entry)` adds (or replaces) a player's entry; returns a Match if one formed.
+    - `dequeue(guild_id, user_id)` removes a player's entry.
+    - `expire_before(ts)` drops entries queued before ts.
+    Matched entries are removed from the queue.
+    """
+
+    def __init__(self):
+        self._index: dict[tuple[Optional[int], str, str, str], _Levels] = {}
+        self._entries: dict[tuple[Optional[int], int], QueueEntry] = {}
+        # Queued players per guild, kept by _insert/_remove (the /queue join reply shows it)
+        self._per_guild: dict[Optional[int], int] = {}
+        self._seq = itertools.count(1)
+        self.matches = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[QueueEntry]:
+        return iter(self._entries.values())
+
+    def get(self, guild_id: Optional[int], user_id: int) -> Optional[QueueEntry]:
+        return self._entries.get((guild_id, user_id))
+
+    def count(self, guild_id: Optional[int]) -> int:
+        return self._per_guild.get(guild_id, 0)
+
+    # ---- mutations ----
+
+    def enqueue(self, entry: QueueEntry) -> Optional[Match]:
+        if entry.key_min > entry.key_max:
+            raise ValueError("key_min must not exceed key_max")
+        self.dequeue(entry.guild_id, entry.user_id)
+        entry.seq = next(self._seq)
+        self._insert(entry)
+
+        match = self._match(entry)
+        if match is not None:
+            for member in match.members:
+                self._remove(member)
+            self.matches += 1
+        return match
+
+    def dequeue(self, guild_id: Optional[int], user_id: int) -> Optional[QueueEntry]:
+        entry = self._entries.get((guild_id, user_id))
+        if entry is not None:
+            self._remove(entry)
+        return entry
+
+    def expire_before(self, ts: float) -> list[QueueEntry]:
+        stale = [e for e in self._entries.values() if e.queued_at < ts]
+        for entry in stale:
+            self._remove(entry)
+        return stale
+
+    # ---- internal ----
+
+    def _insert(self, entry: QueueEntry) -> None:
+        self._entries[(entry.guild_id, entry.user_id)] = entry
+        self._per_guild[entry.guild_id] = self._per_guild.get(entry.guild_id, 0) + 1
+        for dungeon in entry.dungeons:
+            levels = self._index.setdefault((entry.guild_id, dungeon, entry.timing, entry.slot), {})
+            for level in range(entry.key_min, entry.key_max + 1):
+                levels.setdefault(level, {})[entry.seq] = entry
+
+    def _remove(self, entry: QueueEntry) -> None:
+        if self._entries.pop((entry.guild_id, entry.user_id), None) is None:
+            return
+        remaining = self._per_guild[entry.guild_id] - 1
+        if remaining:
+            self._per_guild[entry.guild_id] = remaining
+        else:
+            del self._per_guild[entry.guild_id]
+        for dungeon in entry.dungeons:
+            key = (entry.guild_id, dungeon, entry.timing, entry.slot)
+            levels = self._index.get(key)
+            if levels is None:
+                continue
+            for level in range(entry.key_min, entry.key_max + 1):
+                pool = levels.get(level)
+                if pool is not None:
+                    pool.pop(entry.seq, None)
+                    if not pool:
+                        del levels[level]
+            if not levels:
+                del self._index[key]
+
+    def _match(self, entry: QueueEntry) -> Optional[Match]:
+        for dungeon in entry.dungeons:
+            buckets = {
+                slot: self._index.get((entry.guild_id, dungeon, entry.timing, slot))
+                for slot in GROUP_TEMPLATE
+            }
+            if any(levels is None for levels in buckets.values()):
+                continue
+            # Highest key the new entry accepts first
+            for level in range(entry.key_max, entry.key_min - 1, -1):
+                pools = {slot: levels.get(level) for slot, levels in buckets.items()}
+                if all(pools[slot] and len(pools[slot]) >= need for slot, need in GROUP_TEMPLATE.items()):
+                    picked = {slot: self._pick(pools[slot], need, entry) for slot, need in GROUP_TEMPLATE.items()}
+                    return Match(
+                        guild_id=entry.guild_id,
+                        dungeon=dungeon,
+                        key_level=level,
+                        timing=entry.timing,
+                        tank=picked["tank"][0],
+                        healer=picked["healer"][0],
+                        dps=picked["dps"],
+                    )
+        return None
+
+    @staticmethod
+    def _pick(pool: dict[int, QueueEntry], need: int, entry: QueueEntry) -> list[QueueEntry]:
+        """The new entry (if it belongs to this slot) plus the oldest others."""
+        picked = [entry] if entry.seq in pool else []
+        for candidate in pool.values():
+            if len(picked) == need:
+                break
+            if candidate is not entry:
+                picked.append(candidate)
+        return picked
@@ -0,0 +1,327 @@
+"""
+Lightweight in-process metrics with a Prometheus text endpoint.
+
+Hot-path cost is a couple of dict updates per observation; formatting only happens when
+the endpoint is scraped. Records:
+  - handler duration, time-to-acknowledge and time until the resulting embed edit landed
+  - REST calls per route (bot HTTP client + interaction webhooks)
+  - 429 responses and total retry-after seconds (from discord.py's rate-limit log records)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self):
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._help: dict[str, str] = {}
+        self._gauges: list[Callable[[], dict[str, float]]] = []
+
+    # ---- recording ----
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = Histogram()
+        hist.observe(value)
+
+    def describe(self, name: str, text: str) -> None:
+        self._help[name] = text
+
+    def gauge_source(self, fn: Callable[[], dict[str, float]]) -> None:
+        """Register a callback returning {metric_name: value}, evaluated at scrape time."""
+        self._gauges.append(fn)
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    # ---- exposition ----
+
+    def render(self) -> str:
+        out: list[str] = []
+        for name, series in sorted(self._counters.items()):
+            self._header(out, name, "counter")
+            for labels, value in series.items():
+                out.append(f"{name}{_fmt_labels(labels)} {value:g}")
+        for name, series in sorted(self._histograms.items()):
+            self._header(out, name, "histogram")
+            for labels, hist in series.items():
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    out.append(f"{name}_bucket{_fmt_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                out.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {hist.count}")
+                out.append(f"{name}_sum{_fmt_labels(labels)} {hist.total:g}")
+                out.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+        for source in self._gauges:
+            try:
+                values = source()
+            except Exception as e:
+                log.warning("Gauge source failed: %s", e)
+                continue
+            for name, value in sorted(values.items()):
+                self._header(out, name, "gauge")
+                out.append(f"{name} {value:g}")
+        return "\n".join(out) + "\n"
+
+    def _header(self, out: list[str], name: str, kind: str) -> None:
+        if name in self._help:
+            out.append(f"# HELP {name} {self._help[name]}")
+        out.append(f"# TYPE {name} {kind}")
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+METRICS = Metrics()
+METRICS.describe("lfg_handler_seconds", "Wall time spent in an interaction handler")
+METRICS.describe("lfg_ack_seconds", "Time from receiving an interaction to its acknowledgement")
+METRICS.describe("lfg_edit_complete_seconds", "Time from receiving an interaction to the embed edit it caused")
+METRICS.describe("lfg_handler_errors_total", "Interaction handlers that raised")
+METRICS.describe("discord_rest_requests_total", "REST calls made, per route")
+METRICS.describe("discord_rest_429_total", "429 responses discord.py retried (global=\"true\" for the global limit)")
+METRICS.describe("discord_rest_retry_after_seconds_total", "Sum of retry-after delays imposed by 429s")
+
+
+# =========================
+# Handler spans
+# =========================
+
+# (handler name, monotonic receive time) of the interaction currently being handled in this task
+CURRENT_HANDLER: contextvars.ContextVar[Optional[tuple[str, float]]] = contextvars.ContextVar(
+    "lfg_current_handler", default=None
+)
+
+# Called as hook(interaction, received_at) when a handler span starts; may return a handle
+# whose .cancel() runs when the span ends (e.g. the ack deadline guard's timer)
+SPAN_START_HOOKS: list[Callable[[Any, float], Any]] = []
+
+# Creation times further back than this are taken as clock skew, not delay
+MAX_RECEIVE_DELAY = 10.0
+
+
+def received_at(interaction: Any) -> float:
+    """
+    Monotonic time the interaction was created: its snowflake timestamp (what Discord's
+    3-second ack deadline counts from), mapped onto perf_counter. discord.py starts the
+    handler before dispatching on_interaction, so nothing earlier on our side sees it.
+    Falls back to now without a usable timestamp.
+    """
+    now = time.perf_counter()
+    created_at = getattr(interaction, "created_at", None)
+    if not isinstance(created_at, datetime):
+        return now
+    delay = time.time() - created_at.timestamp()
+    return now - delay if 0.0 <= delay <= MAX_RECEIVE_DELAY else now
+
+
+class handler_span:
+    """Context manager timing one interaction handler; exposes the span to nested REST calls."""
+
+    __slots__ = ("name", "interaction", "_token", "_start", "_entered", "_handles")
+
+    def __init__(self, name: str, interaction: Any = None):
+        self.name = name
+        self.interaction = interaction
+
+    def __enter__(self):
+        self._entered = time.perf_counter()
+        # Acks and edits are timed from receipt, the handler itself from here
+        self._start = received_at(self.interaction)
+        self._token = CURRENT_HANDLER.set((self.name, self._start))
+        self._handles = [hook(self.interaction, self._start) for hook in SPAN_START_HOOKS]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for handle in self._handles:
+            if handle is not None:
+                handle.cancel()
+        CURRENT_HANDLER.reset(self._token)
+        METRICS.observe("lfg_handler_seconds", time.perf_counter() - self._entered, handler=self.name)
+        if exc_type is not None:
+            METRICS.inc("lfg_handler_errors_total", handler=self.name)
+        return False
+
+
+def instrument(name: str):
+    """Decorator for handler methods/callbacks: `async def cb(self, interaction, ...)`."""
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        async def wrapper(self, interaction, *args, **kwargs):
+            with handler_span(name, interaction):
+                return await fn(self, interaction, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def track_edit(pending) -> None:
+    """Attach to the future returned by the edit scheduler: observe receive → edit landed."""
+    span = CURRENT_HANDLER.get()
+    if span is None:
+        return
+    name, start = span
+    pending.add_done_callback(
+        lambda _: METRICS.observe("lfg_edit_complete_seconds", time.perf_counter() - start, handler=name)
+    )
+
+
+# =========================
+# REST instrumentation
+# =========================
+
+# Called as hook("METHOD /route/{template}") for every REST request (e.g. the trace recorder)
+REST_HOOKS: list[Callable[[str], None]] = []
+
+
+def install_rest_hooks(http_client) -> None:
+    """Count bot REST calls per route and time interaction acks (webhook callback route)."""
+    from discord.webhook.async_ import AsyncWebhookAdapter
+
+    original_request = http_client.request
+
+    async def request(route, **kwargs):
+        _count_request(f"{route.method} {route.path}")
+        return await original_request(route, **kwargs)
+
+    http_client.request = request
+
+    if getattr(AsyncWebhookAdapter.request, "__lfg_instrumented__", False):
+        return
+    original_webhook = AsyncWebhookAdapter.request
+
+    async def webhook_request(self, route, *args, **kwargs):
+        _count_request(f"{route.method} {route.path}")
+        if not route.path.endswith("/callback"):
+            return await original_webhook(self, route, *args, **kwargs)
+        result = await original_webhook(self, route, *args, **kwargs)
+        span = CURRENT_HANDLER.get()
+        if span is not None:
+            METRICS.observe("lfg_ack_seconds", time.perf_counter() - span[1], handler=span[0])
+        return result
+
+    webhook_request.__lfg_instrumented__ = True
+    AsyncWebhookAdapter.request = webhook_request
+
+    # discord.py handles 429s internally and logs each retry with its delay
+    handler = _RateLimitLogHandler()
+    for logger_name in ("discord.http", "discord.webhook.async_"):
+        logging.getLogger(logger_name).addHandler(handler)
+
+
+def _count_request(route: str) -> None:
+    METRICS.inc("discord_rest_requests_total", route=route)
+    for hook in REST_HOOKS:
+        hook(route)
+
+
+# discord.py 2.5 warning templates (discord/http.py, discord/webhook/async_.py) -> index of
+# the retry-after arg. The "Timeout of ... too long, erroring instead" 429 isn't retried and
+# isn't counted.
+_RETRY_TEMPLATES = {
+    "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.": 2,
+    "Webhook ID %s is rate limited. Retrying in %.2f seconds.": 1,
+}
+# Logged right after the per-request record above when the 429 was the global limit
+_GLOBAL_TEMPLATE = "Global rate limit has been hit. Retrying in %.2f seconds."
+
+
+class _RateLimitLogHandler(logging.Handler):
+    """
+    Counts 429s from discord.py's per-request retry records, matched by message template.
+    The global-limit record that follows one is not a second 429: it moves the 429 it
+    follows to global="true". Both records are logged back to back without an await, so a
+    scrape never sees the interim count.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self._last: Optional[tuple[str, float]] = None  # (source, retry_after) of the last counted 429
+
+    def emit(self, record: logging.LogRecord) -> None:
+        args = record.args if isinstance(record.args, tuple) else ()
+        if record.msg == _GLOBAL_TEMPLATE:
+            if self._last is not None and self._last[0] == record.name:
+                source, retry_after = self._last
+                self._count(source, retry_after, "false", -1)
+                self._count(source, retry_after, "true", 1)
+            self._last = None
+            return
+        index = _RETRY_TEMPLATES.get(record.msg)
+        if index is None or len(args) <= index:
+            return
+        try:
+            retry_after = float(args[index])
+        except (TypeError, ValueError):
+            return
+        self._count(record.name, retry_after, "false", 1)
+        self._last = (record.name, retry_after)
+
+    @staticmethod
+    def _count(source: str, retry_after: float, is_global: str, sign: int) -> None:
+        labels = {"source": source, "global": is_global}
+        METRICS.inc("discord_rest_429_total", sign, **labels)
+        METRICS.inc("discord_rest_retry_after_seconds_total", sign * retry_after, **labels)
+
+
+# =========================
+# HTTP endpoint
+# =========================
+
+async def start_metrics_server(host: str, port: int, metrics: Metrics = METRICS, routes: Optional[dict] = None):
+    """Serve /metrics (plus any extra GET routes) on a local aiohttp server."""
+    from aiohttp import web
+
+    async def handle_metrics(_request):
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    for path, handler in (routes or {}).items():
+        app.router.add_get(path, handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    return runner
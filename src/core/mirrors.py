@@ -0,0 +1,65 @@
+"""
+Per-guild listing mirrors: which extra channels get a copy of a new listing.
+
+Rules come from MIRROR_CHANNELS, comma separated:
+    <guild id>:<channel id>              every listing of the guild (e.g. a central #lfg-all)
+    <guild id>:<channel id>@<min>-<max>  only keys in that range (e.g. a +12–15 channel)
+    <guild id>:<channel id>@<min>-       keys from <min> up
+The channel a listing was created in never gets a mirror of it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+@dataclass(frozen=True)
+class MirrorRule:
+    guild_id: int
+    channel_id: int
+    key_min: int = 0
+    key_max: Optional[int] = None
+
+    def matches(self, key_level: int) -> bool:
+        return self.key_min <= key_level and (self.key_max is None or key_level <= self.key_max)
+
+
+def parse_mirror_rules(raw: str) -> tuple[MirrorRule, ...]:
+    """Parse MIRROR_CHANNELS; raises ValueError on anything malformed."""
+    rules = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        target, _, levels = part.partition("@")
+        guild_id, channel_id = (int(x) for x in target.split(":"))
+        key_min, key_max = 0, None
+        if levels:
+            low, sep, high = levels.partition("-")
+            key_min = int(low) if low else 0
+            key_max = int(high) if high else (None if sep else key_min)
+            if key_max is not None and key_max < key_min:
+                raise ValueError(f"empty key range in {part!r}")
+        rules.append(MirrorRule(guild_id, channel_id, key_min, key_max))
+    return tuple(rules)
+
+
+class MirrorMap:
+    """Rules grouped by guild; `targets()` is a scan of that guild's few rules."""
+
+    def __init__(self, rules: Iterable[MirrorRule] = ()):
+        self._by_guild: dict[int, list[MirrorRule]] = {}
+        for rule in rules:
+            self._by_guild.setdefault(rule.guild_id, []).append(rule)
+
+    def targets(self, guild_id: Optional[int], key_level: int, exclude: Optional[int] = None) -> list[int]:
+        """Channel ids that should mirror a listing, in configuration order, without duplicates."""
+        channels: dict[int, None] = {}
+        for rule in self._by_guild.get(guild_id, ()) if guild_id is not None else ():
+            if rule.channel_id != exclude and rule.matches(key_level):
+                channels[rule.channel_id] = None
+        return list(channels)
+
+    def __bool__(self) -> bool:
+        return bool(self._by_guild)
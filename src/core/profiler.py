@@ -0,0 +1,304 @@
+"""
+On-demand profiler for the event loop (owner command /lfgprofile or SIGUSR1).
+
+While a profile runs:
+  - a CPU-time interval timer (SIGPROF) interrupts the loop thread every `interval` seconds
+    of CPU. The signal handler runs on that thread, so it sees the exact Python stack. Each
+    sample is filed under the interaction handler whose loop step was running (the same
+    CURRENT_HANDLER span the metrics use), or "(loop)" for the loop's own work between
+    steps. Waiting for I/O uses no CPU and is not sampled; `busy_ratio` is the share of
+    wall time spent in loop steps.
+  - `stage(name)` times the hot-path stages of every handler: "mutation" (listing actor
+    commands), "render", "ack" / "followup" (replies) and "edit" (listing message edits),
+    plus "handler" for the whole handler span.
+`stop()` writes two files to the output directory:
+    profile-<time>-<pid>.folded        stacks as "handler;module:func;... count", the input
+                                       format of flamegraph.pl, speedscope and inferno
+    profile-<time>-<pid>.summary.json  per handler: samples, stage counts and p50/p99/max ms,
+                                       plus the functions with the most samples
+
+When no profile is running, `stage()` is one global check returning a shared no-op context
+manager. The loop-step hook and the timer only exist during a profile. Needs
+`signal.setitimer` (not on Windows) and the loop in the main thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.metrics import CURRENT_HANDLER, SPAN_START_HOOKS
+
+log = logging.getLogger(__name__)
+
+LOOP = "(loop)"
+OTHER = "(other)"
+
+# Loop machinery between the step hook and the callback itself, left out of the stacks
+_LOOP_FRAMES = frozenset({
+    "asyncio.events:Handle._run",
+    "src.core.health:SlowCallbackDetector.install.<locals>._run",
+})
+
+_NOOP = nullcontext()
+
+# The running profile's session, or None
+_ACTIVE: Optional["_Session"] = None
+
+
+class ProfilerError(RuntimeError):
+    """A profile is already running, or profiling isn't possible here."""
+
+
+def stage(name: str):
+    """`with stage("render"): ...` — timed into the running profile, free otherwise."""
+    session = _ACTIVE
+    if session is None:
+        return _NOOP
+    return _StageTimer(session, name)
+
+
+class _StageTimer:
+    __slots__ = ("session", "name", "start")
+
+    def __init__(self, session: "_Session", name: str):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.session.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _HandlerTimer:
+    """SPAN_START_HOOKS handle: records the whole handler span as the "handler" stage."""
+
+    __slots__ = ("session", "name", "received_at")
+
+    def __init__(self, session: "_Session", name: str, received_at: float):
+        self.session = session
+        self.name = name
+        self.received_at = received_at
+
+    def cancel(self) -> None:
+        self.session.spans[self.name]["handler"].append(time.perf_counter() - self.received_at)
+
+
+@dataclass
+class _Session:
+    interval: float
+    started: float = field(default_factory=time.perf_counter)
+    started_at: float = field(default_factory=time.time)
+    stacks: Counter = field(default_factory=Counter)
+    # handler -> stage -> durations (seconds)
+    spans: defaultdict = field(default_factory=lambda: defaultdict(lambda: defaultdict(list)))
+    # Whether a loop callback is running (set by the loop-step hook), and the wall time spent in them
+    in_step: bool = False
+    busy: float = 0.0
+
+    def record(self, name: str, elapsed: float) -> None:
+        span = CURRENT_HANDLER.get()
+        self.spans[span[0] if span else OTHER][name].append(elapsed)
+
+    def span_started(self, interaction: Any, received_at: float) -> _HandlerTimer:
+        span = CURRENT_HANDLER.get()
+        return _HandlerTimer(self, span[0] if span else OTHER, received_at)
+
+
+@dataclass
+class ProfileResult:
+    folded_path: Path
+    summary_path: Path
+    summary: dict[str, Any]
+
+    def describe(self, limit: int = 8) -> str:
+        """A few lines for chat: busiest handlers with their stage percentiles."""
+        summary = self.summary
+        lines = [
+            f"🔬 {summary['seconds']:.1f}s, {summary['samples']} samples, loop busy {summary['busy_ratio']:.0%}",
+        ]
+        for name, handler in list(summary["handlers"].items())[:limit]:
+            stages = " · ".join(
+                f"{stage_name} {s['p50_ms']:.1f}/{s['p99_ms']:.1f}ms"
+                for stage_name, s in handler["stages"].items()
+            )
+            lines.append(f"**{name}** — {handler['samples']} samples" + (f" · {stages}" if stages else ""))
+        if summary["top_functions"]:
+            lines.append("Top: " + ", ".join(f"`{f['function']}` {f['samples']}" for f in summary["top_functions"][:3]))
+        lines.append(f"Files: `{self.folded_path.name}`, `{self.summary_path.name}`")
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    - `start()` begins sampling and stage timing (raises ProfilerError if already running or
+      unsupported).
+    - `await stop()` ends it and writes the files; returns None if nothing was running.
+    - `await run(seconds)` does both.
+    """
+
+    def __init__(self, out_dir: str | Path, interval: float = 0.005):
+        self.out_dir = Path(out_dir)
+        self.interval = interval
+        self._session: Optional[_Session] = None
+        self._original_run = None
+        self._previous_handler = None
+        self._step_code = None
+
+    @property
+    def running(self) -> bool:
+        return self._session is not None
+
+    def start(self) -> None:
+        global _ACTIVE
+        if self._session is not None:
+            raise ProfilerError("a profile is already running")
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            raise ProfilerError("profiling needs signal.setitimer and the event loop in the main thread")
+        session = self._session = _Session(self.interval)
+        self._install_step_hook(session)
+        SPAN_START_HOOKS.append(session.span_started)
+        _ACTIVE = session
+
+        self._previous_handler = signal.signal(signal.SIGPROF, functools.partial(self._sample, session))
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    async def stop(self) -> Optional[ProfileResult]:
+        global _ACTIVE
+        session = self._session
+        if session is None:
+            return None
+        _ACTIVE = None
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        if session.span_started in SPAN_START_HOOKS:
+            SPAN_START_HOOKS.remove(session.span_started)
+        self._uninstall_step_hook()
+        self._session = None
+
+        seconds = time.perf_counter() - session.started
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(session.started_at))
+        base = self.out_dir / f"profile-{stamp}-{os.getpid()}"
+        result = ProfileResult(
+            folded_path=base.parent / f"{base.name}.folded",
+            summary_path=base.parent / f"{base.name}.summary.json",
+            summary=summarize(session, seconds),
+        )
+        await asyncio.to_thread(self._write, session, result)
+        log.info("Profile of %.1fs written to %s", seconds, result.folded_path)
+        return result
+
+    async def run(self, seconds: float) -> ProfileResult:
+        self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = await self.stop()
+        return result
+
+    # ---- internal ----
+
+    def _install_step_hook(self, session: _Session) -> None:
+        """Wrap asyncio.Handle._run (every loop callback / task step) to publish the running step."""
+        original = asyncio.events.Handle._run
+
+        def _run(handle):
+            session.in_step = True
+            start = time.perf_counter()
+            try:
+                original(handle)
+            finally:
+                session.busy += time.perf_counter() - start
+                session.in_step = False
+
+        self._original_run = original
+        self._step_code = _run.__code__
+        asyncio.events.Handle._run = _run
+
+    def _uninstall_step_hook(self) -> None:
+        if self._original_run is not None:
+            asyncio.events.Handle._run = self._original_run
+            self._original_run = None
+
+    def _sample(self, session: _Session, signum: int, frame) -> None:
+        """SIGPROF handler (runs on the loop thread between bytecodes): file the interrupted stack."""
+        if not session.in_step:
+            session.stacks[LOOP] += 1
+            return
+        frames = []
+        # Innermost → outermost, up to the loop-step hook (the loop machinery above it is noise)
+        while frame is not None and frame.f_code is not self._step_code:
+            name = f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+            if name not in _LOOP_FRAMES:
+                frames.append(name)
+            frame = frame.f_back
+        span = CURRENT_HANDLER.get()
+        frames.append(span[0] if span else OTHER)
+        session.stacks[";".join(reversed(frames))] += 1
+
+    def _write(self, session: _Session, result: ProfileResult) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        with result.folded_path.open("w", encoding="utf-8") as f:
+            for stack, count in session.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        result.summary_path.write_text(json.dumps(result.summary, indent=2), encoding="utf-8")
+
+
+def summarize(session: _Session, seconds: float) -> dict[str, Any]:
+    samples = sum(session.stacks.values())
+    per_handler: Counter[str] = Counter()
+    leaves: Counter[str] = Counter()
+    for stack, count in session.stacks.items():
+        frames = stack.split(";")
+        per_handler[frames[0]] += count
+        if len(frames) > 1:
+            leaves[frames[-1]] += count
+
+    handlers: dict[str, Any] = {}
+    for name in sorted(set(per_handler) | set(session.spans), key=lambda n: -per_handler.get(n, 0)):
+        handlers[name] = {
+            "samples": per_handler.get(name, 0),
+            "stages": {
+                stage_name: _stats(durations)
+                for stage_name, durations in sorted(session.spans.get(name, {}).items())
+            },
+        }
+    return {
+        "started_at": round(session.started_at, 3),
+        "seconds": round(seconds, 3),
+        "interval_ms": session.interval * 1000,
+        "samples": samples,
+        "busy_ratio": round(session.busy / seconds, 4) if seconds else 0.0,
+        "handlers": handlers,
+        "top_functions": [{"function": name, "samples": count} for name, count in leaves.most_common(20)],
+    }
+
+
+def _stats(durations: list[float]) -> dict[str, float]:
+    ordered = sorted(durations)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 2),
+        "p50_ms": round(pct(50), 3),
+        "p99_ms": round(pct(99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
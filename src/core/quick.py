@@ -0,0 +1,266 @@
+"""
+Dungeon catalog, alias/prefix index and the /lfgquick shorthand parser.
+
+`QUICK_INDEX` is built once at import: every alias of every dungeon, role and timing
+plus each unambiguous prefix of those aliases, so resolving a token is a dict lookup.
+The same index drives dungeon autocomplete on /lfg.
+
+The parser runs one precompiled regex over the input and walks the tokens once:
+    "pos 14 timed heal need tank,dps lust"
+    -> Pit of Saron, +14, Timed, you: healer, need: tank/melee/ranged, requirements: "lust"
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from src.core.group_state import ROLE_KEYS
+
+DUNGEONS = (
+    "Magister's Terrace",
+    "Maisara Caverns",
+    "Nexus-Point Xenas",
+    "Windrunner Spire",
+    "Algeth'ar Academy",
+    "Seat of the Triumvirate",
+    "Skyreach",
+    "Pit of Saron",
+)
+
+# Community shorthand, in addition to the full names
+DUNGEON_ALIASES = {
+    "Magister's Terrace": ("mgt", "magi", "magisters"),
+    "Maisara Caverns": ("mc", "maisara", "caverns"),
+    "Nexus-Point Xenas": ("npx", "nexus", "xenas"),
+    "Windrunner Spire": ("wrs", "windrunner", "spire"),
+    "Algeth'ar Academy": ("aa", "algethar", "academy"),
+    "Seat of the Triumvirate": ("sott", "seat", "triumvirate"),
+    "Skyreach": ("sr", "sky"),
+    "Pit of Saron": ("pos", "pit", "saron"),
+}
+
+ROLE_ALIASES = {
+    ("tank",): ("tank", "tanks", "t", "prot"),
+    ("healer",): ("healer", "healers", "heal", "heals", "healz", "h", "resto"),
+    ("meleedps",): ("melee", "meleedps", "mdps", "mdd"),
+    ("rangeddps",): ("ranged", "rangeddps", "range", "rdps", "rdd", "caster"),
+    ("meleedps", "rangeddps"): ("dps", "dd", "damage"),
+}
+
+TIMING_ALIASES = {
+    "Timed": ("timed", "time", "intime"),
+    "Completion": ("completion", "complete", "comp", "untimed", "chill"),
+}
+
+# Words that switch the parser from "what I play" to "what the group needs"
+NEED_WORDS = frozenset({"need", "needs", "lf", "lfm", "looking", "want", "for", "nd"})
+
+PASS_KEYS = frozenset({"pw", "pass", "passphrase"})
+
+_NORMALIZE = re.compile(r"[^a-z0-9]+")
+
+_TOKEN = re.compile(
+    r"""
+      (?P<kv>(?:pw|pass|passphrase|name|as)[:=][^\s,]+)
+    | (?<![\w'+])(?:\+|k)?(?P<key>\d{1,2})\+?(?![\w'+])
+    | (?P<word>[^\W_][\w'\-+]*)
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+MAX_REQUIREMENTS = 200
+
+# Key levels every command accepts (/lfg, /lfgquick, /queue, /lfgbrowse), so any listing can be matched and browsed
+KEY_MIN, KEY_MAX = 2, 40
+
+
+def normalize(text: str) -> str:
+    """"Algeth'ar Academy" -> "algetharacademy"."""
+    return _NORMALIZE.sub("", text.lower())
+
+
+class QuickParseError(ValueError):
+    """The shorthand couldn't be turned into a listing; the message is shown to the user."""
+
+
+class AliasIndex:
+    """
+    - `lookup(token)` -> (category, value) for an exact alias, else for a prefix that
+      resolves to exactly one value; None if unknown or ambiguous.
+    - `complete(category, text)` -> display names for autocomplete (prefix of any alias,
+      falling back to substring of the name).
+    """
+
+    def __init__(self, min_prefix: int = 3):
+        self.min_prefix = min_prefix
+        self.max_words = 1
+        self._exact: dict[str, tuple[str, Any]] = {}
+        self._prefix: dict[str, Optional[tuple[str, Any]]] = {}  # None = ambiguous
+        self._completions: dict[str, dict[str, list[str]]] = {}
+        self._names: dict[str, list[str]] = {}
+
+    def add(self, category: str, value: Any, aliases: tuple[str, ...], display: Optional[str] = None) -> None:
+        if display is not None:
+            self._names.setdefault(category, []).append(display)
+        completions = self._completions.setdefault(category, {})
+        for alias in aliases:
+            key = normalize(alias)
+            self._exact[key] = (category, value)
+            self.max_words = max(self.max_words, len(alias.split()))
+            for end in range(1, len(key) + 1):
+                prefix = key[:end]
+                if display is not None:
+                    names = completions.setdefault(prefix, [])
+                    if display not in names:
+                        names.append(display)
+                if end < self.min_prefix or end == len(key):
+                    continue
+                existing = self._prefix.get(prefix, ...)
+                if existing is ...:
+                    self._prefix[prefix] = (category, value)
+                elif existing != (category, value):
+                    self._prefix[prefix] = None
+
+    def lookup(self, text: str, exact: bool = False) -> Optional[tuple[str, Any]]:
+        key = normalize(text)
+        hit = self._exact.get(key)
+        if hit is not None or exact:
+            return hit
+        return self._prefix.get(key)
+
+    def complete(self, category: str, text: str, limit: int = 25) -> list[str]:
+        key = normalize(text)
+        names = self._names.get(category, [])
+        if not key:
+            return names[:limit]
+        hits = self._completions.get(category, {}).get(key)
+        if hits is None:
+            hits = [name for name in names if key in normalize(name)]
+        return hits[:limit]
+
+
+def build_index() -> AliasIndex:
+    index = AliasIndex()
+    for name in DUNGEONS:
+        index.add("dungeon", name, (name, *DUNGEON_ALIASES.get(name, ())), display=name)
+    for roles, aliases in ROLE_ALIASES.items():
+        index.add("role", roles, aliases)
+    for timing, aliases in TIMING_ALIASES.items():
+        index.add("timing", timing, aliases)
+    return index
+
+
+QUICK_INDEX = build_index()
+
+
+@dataclass
+class QuickSpec:
+    dungeon: str
+    key_level: int
+    your_role: str  # internal role key
+    timing: str = "Timed"
+    required_roles: list[str] = field(default_factory=list)
+    requirements: Optional[str] = None
+    passphrase: Optional[str] = None
+    listed_as: Optional[str] = None
+
+
+def parse_quick(text: str, index: AliasIndex = QUICK_INDEX) -> QuickSpec:
+    """Parse /lfgquick shorthand. Unrecognized words become the requirements text."""
+    tokens = [(m.lastgroup, m.group(m.lastgroup)) for m in _TOKEN.finditer(text)]
+
+    dungeon: Optional[str] = None
+    key_level: Optional[int] = None
+    timing: Optional[str] = None
+    your_role: Optional[str] = None
+    required: list[str] = []
+    extras: list[str] = []
+    passphrase = listed_as = None
+    needing = False
+
+    i, count = 0, len(tokens)
+    while i < count:
+        kind, raw = tokens[i]
+        i += 1
+
+        if kind == "kv":
+            name, value = re.split(r"[:=]", raw, maxsplit=1)
+            if name.lower() in PASS_KEYS:
+                passphrase = value
+            else:
+                listed_as = value
+            continue
+        if kind == "key":
+            if key_level is None:
+                key_level = int(raw)
+            else:
+                extras.append(raw)
+            continue
+
+        if raw.lower() in NEED_WORDS:
+            needing = True
+            continue
+
+        # Multi-word dungeon names ("pit of saron"): longest exact match over the next few words
+        if dungeon is None and index.max_words > 1:
+            matched = False
+            for span in range(min(index.max_words, count - i + 1), 1, -1):
+                window = tokens[i - 1:i - 1 + span]
+                if any(k != "word" for k, _ in window):
+                    continue
+                hit = index.lookup("".join(w for _, w in window), exact=True)
+                if hit is not None and hit[0] == "dungeon":
+                    dungeon = hit[1]
+                    i += span - 1
+                    matched = True
+                    break
+            if matched:
+                continue
+
+        hit = index.lookup(raw)
+        category, value = hit if hit is not None else (None, None)
+
+        if category == "role":
+            if needing:
+                required.extend(r for r in value if r not in required)
+                continue
+            if your_role is None and len(value) == 1:
+                your_role = value[0]
+                continue
+        elif category == "dungeon" and dungeon is None:
+            dungeon = value
+            needing = False
+            continue
+        elif category == "timing" and timing is None:
+            timing = value
+            needing = False
+            continue
+
+        needing = False
+        extras.append(raw)
+
+    if dungeon is None:
+        raise QuickParseError("I couldn't find a dungeon in that. Try e.g. `pos 14 timed heal need tank,dps`.")
+    if key_level is None:
+        raise QuickParseError(f"Which key level for {dungeon}? Add a number like `14`.")
+    if not KEY_MIN <= key_level <= KEY_MAX:
+        raise QuickParseError(f"Key level +{key_level} is out of range: use {KEY_MIN}–{KEY_MAX}.")
+    if your_role is None:
+        raise QuickParseError("Which role are you playing? Add `tank`, `heal`, `melee` or `ranged`.")
+
+    if not required:
+        required = [role for role in ROLE_KEYS if role != your_role]
+    requirements = " ".join(extras)[:MAX_REQUIREMENTS] or None
+
+    return QuickSpec(
+        dungeon=dungeon,
+        key_level=key_level,
+        your_role=your_role,
+        timing=timing or "Timed",
+        required_roles=required,
+        requirements=requirements,
+        passphrase=passphrase,
+        listed_as=listed_as,
+    )
@@ -0,0 +1,31 @@
+"""
+Client-side pacing for REST traffic Discord rate-limits per bucket.
+
+Waiting here, before a request is made, keeps the wait out of the REST scheduler's slots:
+a request that discord.py holds back after a 429 sleeps while holding a slot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` saved; `acquire()` waits for one token."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,272 @@
+"""
+Priority admission for outgoing REST calls, and a guard for the 3-second ack deadline.
+
+Every request (bot HTTP client and interaction webhooks) takes a slot before it is sent and
+holds it until discord.py returns — including any rate-limit sleep. Waiters are admitted
+by priority class, then arrival:
+  ACK       interaction callbacks (responses, defers, modals)
+  FOLLOWUP  interaction webhooks (ephemeral follow-ups, deleting the original response)
+  EDIT      everything else (listing edits, channel messages)
+Lower classes may only use part of the slots, so acks always have free capacity even when
+every edit slot is stuck behind a rate limit.
+
+The deadline guard defers an interaction on its own if the handler hasn't acknowledged it
+shortly before the deadline; `reply()` / `edit_reply()` / `ensure_deferred()` then continue via
+follow-ups or by editing the original response. Handlers that open a modal must answer with
+it first, so they are exempted from the guard (`ACK_GUARD.exempt(name)`).
+Acks that land after the deadline (or bounce with "Unknown interaction") are counted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+import discord
+
+from src.core.metrics import CURRENT_HANDLER, METRICS
+from src.core.profiler import stage
+
+log = logging.getLogger(__name__)
+
+ACK, FOLLOWUP, EDIT = 0, 1, 2
+PRIORITY_NAMES = {ACK: "ack", FOLLOWUP: "followup", EDIT: "edit"}
+
+# Discord invalidates an interaction token that wasn't acknowledged within 3 seconds
+ACK_DEADLINE = 3.0
+
+METRICS.describe("discord_rest_queue_seconds", "Time a REST call waited for a scheduler slot, per priority class")
+METRICS.describe("lfg_ack_deadline_missed_total", "Interaction acks that landed after the 3s deadline or were rejected")
+METRICS.describe("lfg_ack_early_defers_total", "Interactions deferred by the deadline guard because the handler was slow")
+
+
+def classify(method: str, path: str) -> int:
+    if path.endswith("/callback"):
+        return ACK
+    if path.startswith("/webhooks/"):
+        return FOLLOWUP
+    return EDIT
+
+
+class RestScheduler:
+    """
+    - `slot(priority)` is an async context manager holding one in-flight slot.
+    - Class limits: ACK may use all `max_in_flight` slots, FOLLOWUP all but `reserve`,
+      EDIT all but 2 × `reserve`.
+    - `prioritize=False` turns it into a plain FIFO limiter (for comparisons).
+    """
+
+    def __init__(self, max_in_flight: int = 10, reserve: int = 2, prioritize: bool = True):
+        if max_in_flight - 2 * reserve < 1:
+            raise ValueError("max_in_flight must leave at least one slot for edits")
+        self.max_in_flight = max_in_flight
+        self.prioritize = prioritize
+        self._limits = {ACK: max_in_flight, FOLLOWUP: max_in_flight - reserve, EDIT: max_in_flight - 2 * reserve}
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        # interaction id -> future resolved once its callback request finished
+        self._acks: dict[int, asyncio.Future] = {}
+        self.admitted = dict.fromkeys(PRIORITY_NAMES.values(), 0)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, priority: int):
+        start = time.perf_counter()
+        await self._acquire(priority if self.prioritize else EDIT)
+        METRICS.observe("discord_rest_queue_seconds", time.perf_counter() - start, priority=PRIORITY_NAMES[priority])
+        self.admitted[PRIORITY_NAMES[priority]] += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def pending_ack(self, interaction_id: int) -> Optional[asyncio.Future]:
+        return self._acks.get(interaction_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {"in_flight": self._in_flight, "waiting": len(self._waiters), **self.admitted}
+
+    # ---- internal ----
+
+    def _limit(self, priority: int) -> int:
+        return self._limits[priority] if self.prioritize else self._limits[EDIT]
+
+    async def _acquire(self, priority: int) -> None:
+        if not self._waiters and self._in_flight < self._limit(priority):
+            self._in_flight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Admitted just as we were cancelled: hand the slot back
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._waiters:
+            priority, _, fut = self._waiters[0]
+            if fut.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_flight >= self._limit(priority):
+                break
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            fut.set_result(None)
+
+
+REST_SCHEDULER = RestScheduler()
+
+
+def install_rest_scheduler(http_client, scheduler: RestScheduler = REST_SCHEDULER) -> None:
+    """Route the bot HTTP client and interaction webhooks through the priority scheduler."""
+    from discord.webhook.async_ import AsyncWebhookAdapter
+
+    original_request = http_client.request
+
+    async def request(route, **kwargs):
+        async with scheduler.slot(classify(route.method, route.path)):
+            return await original_request(route, **kwargs)
+
+    http_client.request = request
+
+    if getattr(AsyncWebhookAdapter.request, "__lfg_scheduled__", False):
+        return
+    original_webhook = AsyncWebhookAdapter.request
+
+    async def webhook_request(self, route, *args, **kwargs):
+        priority = classify(route.method, route.path)
+        if priority != ACK:
+            async with scheduler.slot(priority):
+                return await original_webhook(self, route, *args, **kwargs)
+
+        interaction_id = route.webhook_id
+        done = asyncio.get_running_loop().create_future()
+        scheduler._acks[interaction_id] = done
+        try:
+            async with scheduler.slot(ACK):
+                result = await original_webhook(self, route, *args, **kwargs)
+        except discord.NotFound as e:
+            if e.code == 10062:  # Unknown interaction: the token expired before we acked
+                _missed_deadline()
+            raise
+        finally:
+            scheduler._acks.pop(interaction_id, None)
+            done.set_result(None)
+        span = CURRENT_HANDLER.get()
+        if span is not None and time.perf_counter() - span[1] > ACK_DEADLINE:
+            _missed_deadline()
+        return result
+
+    webhook_request.__lfg_scheduled__ = True
+    AsyncWebhookAdapter.request = webhook_request
+
+
+def _missed_deadline() -> None:
+    span = CURRENT_HANDLER.get()
+    METRICS.inc("lfg_ack_deadline_missed_total", handler=span[0] if span else "unknown")
+
+
+# =========================
+# Deadline guard
+# =========================
+
+class AckDeadlineGuard:
+    """
+    `watch(interaction, received_at)` arms a timer for `defer_after` seconds after receipt;
+    if the interaction is neither acknowledged nor being acknowledged by then, it is deferred
+    (ephemeral "thinking" for commands, a silent deferred update for components).
+    Handlers named in `exempt()` are never deferred (a deferred interaction can't open a modal).
+    """
+
+    def __init__(self, scheduler: RestScheduler = REST_SCHEDULER, defer_after: float = 2.2):
+        self.scheduler = scheduler
+        self.defer_after = defer_after
+        self.early_defers = 0
+        self._exempt: set[str] = set()
+
+    def exempt(self, *handlers: str) -> None:
+        self._exempt.update(handlers)
+
+    def watch(self, interaction: Any, received_at: float) -> Optional[asyncio.TimerHandle]:
+        if getattr(interaction, "response", None) is None:
+            return None
+        span = CURRENT_HANDLER.get()
+        if span is not None and span[0] in self._exempt:
+            return None
+        delay = max(0.0, received_at + self.defer_after - time.perf_counter())
+        return asyncio.get_running_loop().call_later(delay, self._fire, interaction)
+
+    def _fire(self, interaction) -> None:
+        if interaction.response.is_done() or self.scheduler.pending_ack(interaction.id) is not None:
+            return
+        asyncio.create_task(self._defer(interaction))
+
+    async def _defer(self, interaction) -> None:
+        # Checked again: the handler may have started its own reply since _fire
+        if interaction.response.is_done() or self.scheduler.pending_ack(interaction.id) is not None:
+            return
+        try:
+            await interaction.response.defer(ephemeral=True)
+        except discord.InteractionResponded:
+            return
+        except discord.HTTPException as e:
+            log.debug("Early defer for interaction %s skipped: %s", interaction.id, e)
+            return
+        self.early_defers += 1
+        span = CURRENT_HANDLER.get()
+        METRICS.inc("lfg_ack_early_defers_total", handler=span[0] if span else "unknown")
+
+
+ACK_GUARD = AckDeadlineGuard()
+
+
+async def _settle(interaction) -> None:
+    pending = REST_SCHEDULER.pending_ack(interaction.id)
+    if pending is not None:
+        await asyncio.shield(pending)
+
+
+async def reply(interaction, content: Optional[str] = None, **kwargs):
+    """Ephemeral reply that still works if the deadline guard already deferred the interaction."""
+    await _settle(interaction)
+    if interaction.response.is_done():
+        with stage("followup"):
+            return await interaction.followup.send(content, ephemeral=True, **kwargs)
+    with stage("ack"):
+        return await interaction.response.send_message(content, ephemeral=True, **kwargs)
+
+
+async def edit_reply(interaction, **kwargs):
+    """Edit the message a component belongs to, also after the deadline guard deferred the interaction."""
+    await _settle(interaction)
+    if interaction.response.is_done():
+        with stage("followup"):
+            return await interaction.edit_original_response(**kwargs)
+    with stage("ack"):
+        return await interaction.response.edit_message(**kwargs)
+
+
+async def ensure_deferred(interaction) -> None:
+    """Defer unless the interaction was already acknowledged (e.g. by the deadline guard)."""
+    await _settle(interaction)
+    if not interaction.response.is_done():
+        with stage("ack"):
+            await interaction.response.defer()
@@ -0,0 +1,91 @@
+"""
+Per-guild role index used to turn role titles ("Melee DPS") into role pings.
+
+Built once per guild from `guild.roles` (keyed by casefolded name) and kept current from
+role create/update/delete events. Because the index holds the guild's complete role set,
+a missing name is a cached miss — we never rescan `guild.roles` for it. Joined ping
+strings are memoized per (guild, required-roles set).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import discord
+
+
+class RoleIndex:
+    def __init__(self, titles_order: Iterable[str]):
+        # Display order for joined pings (e.g. Tank, Healer, Melee DPS, Ranged DPS)
+        self._order = {title: i for i, title in enumerate(titles_order)}
+        self._by_guild: dict[int, dict[str, int]] = {}
+        self._pings: dict[int, dict[frozenset[str], str]] = {}
+
+    # ---- building / events ----
+
+    def index_guild(self, guild: discord.Guild) -> dict[str, int]:
+        """(Re)build the name -> role id map for a guild. First role wins on duplicate names."""
+        index: dict[str, int] = {}
+        for role in guild.roles:
+            index.setdefault(role.name.casefold(), role.id)
+        self._by_guild[guild.id] = index
+        self._pings.pop(guild.id, None)
+        return index
+
+    def role_created(self, role: discord.Role) -> None:
+        index = self._by_guild.get(role.guild.id)
+        if index is not None:
+            index.setdefault(role.name.casefold(), role.id)
+            self._pings.pop(role.guild.id, None)
+
+    def role_updated(self, before: discord.Role, after: discord.Role) -> None:
+        if before.name == after.name:
+            return
+        self.role_deleted(before)
+        self.role_created(after)
+
+    def role_deleted(self, role: discord.Role) -> None:
+        index = self._by_guild.get(role.guild.id)
+        if index is None:
+            return
+        name = role.name.casefold()
+        if index.get(name) == role.id:
+            del index[name]
+            # Another role may share the name; fall back to it like a fresh scan would
+            for other in role.guild.roles:
+                if other.id != role.id and other.name.casefold() == name:
+                    index[name] = other.id
+                    break
+        self._pings.pop(role.guild.id, None)
+
+    def drop_guild(self, guild_id: int) -> None:
+        self._by_guild.pop(guild_id, None)
+        self._pings.pop(guild_id, None)
+
+    # ---- lookups ----
+
+    def role_id(self, guild: discord.Guild, title: str) -> Optional[int]:
+        index = self._by_guild.get(guild.id)
+        if index is None:
+            index = self.index_guild(guild)
+        return index.get(title.casefold())
+
+    def ping(self, guild: Optional[discord.Guild], title: str) -> str:
+        """Mention for a role title, or a readable fallback like @Tank."""
+        rid = self.role_id(guild, title) if guild else None
+        return f"<@&{rid}>" if rid else f"@{title}"
+
+    def pings(self, guild: Optional[discord.Guild], titles: Iterable[str]) -> str:
+        """Comma-joined pings for a set of role titles (memoized per guild + set)."""
+        key = frozenset(titles)
+        if guild is None:
+            return self._join(None, key)
+        memo = self._pings.setdefault(guild.id, {})
+        joined = memo.get(key)
+        if joined is None:
+            joined = memo[key] = self._join(guild, key)
+        return joined
+
+    def _join(self, guild: Optional[discord.Guild], titles: frozenset[str]) -> str:
+        ordered = sorted(titles, key=lambda t: self._order.get(t, len(self._order)))
+        return ", ".join(self.ping(guild, t) for t in ordered)
@@ -1,21 +1,206 @@
+"""
+Typed runtime settings: the process environment plus `.env.<APP_ENV>` from the repo root.
+
+`get_settings()` reads and validates everything on first use and caches the result, so the
+env file is parsed once per process and every bad value is reported together at startup
+instead of surfacing later inside a handler. Nothing is read at import time.
+"""
+
 from __future__ import annotations
+
 import os
-import discord
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Mapping, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from src.core.mirrors import MirrorRule
+
+ROOT = Path(__file__).resolve().parents[2]
+
+APP_ENVS = ("dev", "qa", "prod")
+SHUTDOWN_MODES = ("pause", "expire", "persist")
+CLIENT_PROFILES = ("lean", "default")
+LOG_LEVELS = ("debug", "info", "warning", "error", "critical")
+
+T = TypeVar("T")
+
+
+class SettingsError(RuntimeError):
+    """One or more settings are missing or invalid; the message lists all of them."""
+
+
+@dataclass(frozen=True)
+class Settings:
+    app_env: str
+    token: str = field(repr=False)
+    env_path: Path
+    data_dir: Path
+    # Root logger level (discord.py's and every src.* logger), set up by bot.run
+    log_level: str = "INFO"
+    # Guilds for instant guild-scoped command sync (dev/qa)
+    guild_ids: tuple[int, ...] = ()
+    force_command_sync: bool = False
+    # Sharding (launcher.py sets these per cluster); shard_ids None = all shards
+    shard_count: int = 0
+    shard_ids: Optional[tuple[int, ...]] = None
+    cluster_id: int = 0
+    stats_interval: float = 15.0
+    # Gateway intents/caches (src/core/client_profile.py); max_messages None = profile default, 0 = off
+    client_profile: str = "lean"
+    max_messages: Optional[int] = None
+    # Health: liveness fails past this loop lag or a shard down longer than the grace period;
+    # loop callbacks slower than slow_callback_threshold are logged (0 disables the detector)
+    health_max_loop_lag: float = 2.0
+    health_disconnect_grace: float = 120.0
+    slow_callback_threshold: float = 0.1
+    # Interaction trace for benchmarks/replay.py (src/core/trace.py); None = not recording
+    trace_file: Optional[Path] = None
+    # On-demand profiler (/lfgprofile, SIGUSR1): default window and stack sampling interval in seconds
+    profile_seconds: float = 30.0
+    profile_interval: float = 0.005
+    # Prometheus endpoint (also serves /healthz and /readyz); port 0 disables it
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9108
+    # Listings
+    edit_coalesce_window: float = 0.75
+    expiry_batch_size: int = 10
+    expiry_batch_interval: float = 1.0
+    queue_ttl: int = 1800
+    # Extra channels per guild that get a copy of each listing (src/core/mirrors.py)
+    mirror_channels: tuple["MirrorRule", ...] = ()
+    # Waitlist: users DM'd per reopened slot; DMs to one user within dm_fold_window are merged,
+    # and at most dm_rate DM requests per second are sent
+    waitlist_notify: int = 3
+    dm_fold_window: float = 2.0
+    dm_rate: float = 5.0
+    # Graceful shutdown
+    shutdown_mode: str = "pause"
+    shutdown_budget: float = 20.0
+    shutdown_concurrency: int = 5
+
+
+class _Reader:
+    """Typed env lookups that collect errors instead of raising on the first one."""
+
+    def __init__(self, env: Mapping[str, str]):
+        self.env = env
+        self.errors: list[str] = []
+
+    def text(self, name: str, default: str = "") -> str:
+        return self.env.get(name, default).strip()
+
+    def parse(self, name: str, default: T, convert: Callable[[str], T], check: Optional[Callable[[T], bool]] = None,
+              expected: str = "") -> T:
+        raw = self.env.get(name, "").strip()
+        if not raw:
+            return default
+        try:
+            value = convert(raw)
+        except ValueError:
+            self.errors.append(f"{name}={raw!r} is not {expected or convert.__name__}")
+            return default
+        if check is not None and not check(value):
+            self.errors.append(f"{name}={raw!r} must be {expected}")
+            return default
+        return value
+
+    def choice(self, name: str, default: str, choices: tuple[str, ...]) -> str:
+        value = self.text(name, default).lower() or default
+        if value not in choices:
+            self.errors.append(f"{name}={value!r} must be one of {', '.join(choices)}")
+            return default
+        return value
+
+    def flag(self, name: str) -> bool:
+        return self.text(name).lower() in ("1", "true", "yes")
+
+
+def _int_list(raw: str) -> tuple[int, ...]:
+    return tuple(int(x) for x in raw.split(",") if x.strip())
+
+
+def _shard_ids(raw: str) -> tuple[int, ...]:
+    from src.core.sharding import parse_shard_ids
+    return tuple(parse_shard_ids(raw) or ())
+
+
+def _mirror_rules(raw: str) -> tuple["MirrorRule", ...]:
+    from src.core.mirrors import parse_mirror_rules
+    return parse_mirror_rules(raw)
+
+
+def load_settings(env: Optional[Mapping[str, str]] = None) -> Settings:
+    """
+    Build and validate Settings. With no `env`, `.env.<APP_ENV>` (default prod) is loaded into
+    the process environment first; values in the file win over the shell, as before.
+    """
+    app_env = (env if env is not None else os.environ).get("APP_ENV", "prod").strip().lower() or "prod"
+    env_path = ROOT / f".env.{app_env}"
+    if env is None:
+        # Works both locally and in Docker (compose mounts the env file)
+        if env_path.exists():
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=str(env_path), override=True)
+        env = os.environ
+
+    read = _Reader(env)
+    if app_env not in APP_ENVS:
+        read.errors.append(f"APP_ENV={app_env!r} must be one of {', '.join(APP_ENVS)}")
+    token = read.text("DISCORD_TOKEN")
+    if not token:
+        read.errors.append(f"DISCORD_TOKEN is missing (looked in {env_path.name} and process env)")
 
-# Decide which .env file to load (default to .env.dev for safety)
-APP_ENV = os.getenv("APP_ENV", "dev").lower()
-load_dotenv(dotenv_path=f".env.{APP_ENV}")  # loads .env.dev / .env.uat / .env.prod
+    positive = lambda v: v > 0  # noqa: E731
+    non_negative = lambda v: v >= 0  # noqa: E731
 
-TOKEN = os.getenv("DISCORD_TOKEN")
-if not TOKEN:
-    raise RuntimeError("DISCORD_TOKEN missing. Put it in the selected .env file.")
+    settings = Settings(
+        app_env=app_env,
+        token=token,
+        env_path=env_path,
+        data_dir=Path(read.text("DATA_DIR") or ROOT / "data"),
+        log_level=read.choice("LOG_LEVEL", "info", LOG_LEVELS).upper(),
+        guild_ids=read.parse("GUILD_IDS", (), _int_list, expected="a comma-separated list of guild ids"),
+        force_command_sync=read.flag("FORCE_COMMAND_SYNC"),
+        shard_count=read.parse("SHARD_COUNT", 0, int, non_negative, expected="an integer >= 0"),
+        shard_ids=read.parse("SHARD_IDS", None, _shard_ids, expected='shard ids like "0,1" or "0-3"') or None,
+        cluster_id=read.parse("CLUSTER_ID", 0, int, non_negative, expected="an integer >= 0"),
+        stats_interval=read.parse("STATS_INTERVAL", 15.0, float, positive, expected="a number > 0"),
+        client_profile=read.choice("CLIENT_PROFILE", "lean", CLIENT_PROFILES),
+        max_messages=read.parse("MAX_MESSAGES", None, int, non_negative, expected="an integer >= 0 (0 disables)"),
+        health_max_loop_lag=read.parse("HEALTH_MAX_LOOP_LAG", 2.0, float, positive, expected="a number > 0"),
+        health_disconnect_grace=read.parse("HEALTH_DISCONNECT_GRACE", 120.0, float, positive, expected="a number > 0"),
+        slow_callback_threshold=read.parse("SLOW_CALLBACK_THRESHOLD", 0.1, float, non_negative,
+                                           expected="seconds >= 0 (0 disables)"),
+        trace_file=read.parse("TRACE_FILE", None, Path, expected="a file path"),
+        profile_seconds=read.parse("PROFILE_SECONDS", 30.0, float, lambda v: 0 < v <= 300,
+                                   expected="seconds in (0, 300]"),
+        profile_interval=read.parse("PROFILE_INTERVAL", 0.005, float, positive, expected="a number > 0"),
+        metrics_host=read.text("METRICS_HOST", "127.0.0.1") or "127.0.0.1",
+        metrics_port=read.parse("METRICS_PORT", 9108, int, lambda v: 0 <= v < 65536, expected="a port (0 disables)"),
+        edit_coalesce_window=read.parse("EDIT_COALESCE_WINDOW", 0.75, float, non_negative, expected="a number >= 0"),
+        expiry_batch_size=read.parse("EXPIRY_BATCH_SIZE", 10, int, positive, expected="an integer > 0"),
+        expiry_batch_interval=read.parse("EXPIRY_BATCH_INTERVAL", 1.0, float, non_negative, expected="a number >= 0"),
+        mirror_channels=read.parse("MIRROR_CHANNELS", (), _mirror_rules,
+                                   expected='"guild:channel" or "guild:channel@12-15", comma separated'),
+        waitlist_notify=read.parse("WAITLIST_NOTIFY", 3, int, positive, expected="an integer > 0"),
+        dm_fold_window=read.parse("DM_FOLD_WINDOW", 2.0, float, non_negative, expected="a number >= 0"),
+        dm_rate=read.parse("DM_RATE", 5.0, float, positive, expected="a number > 0"),
+        queue_ttl=read.parse("QUEUE_TTL", 1800, int, positive, expected="an integer > 0"),
+        shutdown_mode=read.choice("SHUTDOWN_MODE", "pause", SHUTDOWN_MODES),
+        shutdown_budget=read.parse("SHUTDOWN_BUDGET", 20.0, float, positive, expected="a number > 0"),
+        shutdown_concurrency=read.parse("SHUTDOWN_CONCURRENCY", 5, int, positive, expected="an integer > 0"),
+    )
+    if settings.shard_ids and settings.shard_count and max(settings.shard_ids) >= settings.shard_count:
+        read.errors.append(f"SHARD_IDS {list(settings.shard_ids)} exceed SHARD_COUNT={settings.shard_count}")
 
-# Optional
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    if read.errors:
+        raise SettingsError("Invalid configuration:\n  - " + "\n  - ".join(read.errors))
+    return settings
 
-# Guilds to use for guild-scoped sync (for dev/uat quick command propagation)
-GUILD_IDS = [int(x) for x in os.getenv("GUILD_IDS", "").split(",") if x.strip().isdigit()]
 
-INTENTS = discord.Intents.default()
-INTENTS.message_content = True
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """The process-wide settings, loaded and validated on first call."""
+    return load_settings()
@@ -0,0 +1,80 @@
+"""
+Sharding helpers shared by bot.py and the cluster launcher.
+
+Guilds map to shards with Discord's formula `(guild_id >> 22) % shard_count`; a cluster
+is one process running a contiguous group of shards. Per-shard counters are collected
+in-process and periodically pushed to the launcher.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+import discord
+
+
+def shard_for_guild(guild_id: Optional[int], shard_count: int) -> int:
+    """Shard that owns a guild (DMs and unknown guilds land on shard 0)."""
+    if not guild_id or shard_count <= 1:
+        return 0
+    return (guild_id >> 22) % shard_count
+
+
+def plan_clusters(shard_count: int, shards_per_cluster: int) -> list[list[int]]:
+    """Split shard ids 0..N-1 into contiguous groups, one per process."""
+    per = max(1, shards_per_cluster)
+    return [list(range(i, min(i + per, shard_count))) for i in range(0, shard_count, per)]
+
+
+def parse_shard_ids(raw: str) -> Optional[list[int]]:
+    """"0,1,2" or "0-3" -> [0, 1, 2(, 3)]; empty -> None (all shards)."""
+    raw = raw.strip()
+    if not raw:
+        return None
+    if "-" in raw:
+        lo, hi = raw.split("-", 1)
+        return list(range(int(lo), int(hi) + 1))
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+class ShardStats:
+    """Per-shard interaction/connection counters plus per-event-type totals for this process."""
+
+    def __init__(self, shard_count: int, cluster_id: Optional[int] = None):
+        self.shard_count = max(1, shard_count)
+        self.cluster_id = cluster_id
+        self.started = time.time()
+        self.events: Counter[str] = Counter()
+        self.shards: dict[int, Counter[str]] = defaultdict(Counter)
+
+    def gateway_event(self, event_type: str) -> None:
+        self.events[event_type] += 1
+
+    def interaction(self, guild_id: Optional[int]) -> None:
+        self.shards[shard_for_guild(guild_id, self.shard_count)]["interactions"] += 1
+
+    def shard_event(self, shard_id: int, kind: str) -> None:
+        self.shards[shard_id][kind] += 1
+
+    def snapshot(self, client: discord.Client) -> dict:
+        if isinstance(client, discord.AutoShardedClient):
+            latencies = dict(client.latencies)
+        else:
+            latencies = {0: client.latency}
+        shards = {}
+        for shard_id, latency in latencies.items():
+            counters = self.shards.get(shard_id, Counter())
+            shards[shard_id] = {
+                "latency_ms": round(latency * 1000, 1) if latency == latency else None,  # NaN before connect
+                "guilds": sum(1 for g in client.guilds if g.shard_id == shard_id),
+                **counters,
+            }
+        return {
+            "cluster": self.cluster_id,
+            "uptime_s": round(time.time() - self.started),
+            "events": sum(self.events.values()),
+            "top_events": dict(self.events.most_common(5)),
+            "shards": shards,
+        }
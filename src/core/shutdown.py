@@ -0,0 +1,106 @@
+"""
+Graceful shutdown on SIGTERM/SIGINT.
+
+`GracefulShutdown` turns the first signal into one call of the bot's shutdown coroutine and
+exposes `draining`, so command handlers can refuse new work while it runs. `drain()` applies
+an async action (pause / expire / persist) to every open listing with a bounded number in
+flight and a hard time budget; whatever isn't finished when the budget runs out is cancelled
+and reported, so the process still exits before the orchestrator's kill timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from src.core.metrics import METRICS
+
+log = logging.getLogger(__name__)
+
+METRICS.describe("lfg_shutdown_listings_total", "Open listings handled by the shutdown drain, by outcome")
+
+
+@dataclass
+class DrainReport:
+    total: int
+    finished: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def unfinished(self) -> int:
+        """Listings the budget ran out on (still persisted as open)."""
+        return self.total - self.finished - self.failed
+
+
+async def drain(
+    items: Iterable[Any],
+    action: Callable[[Any], Awaitable[Any]],
+    *,
+    budget: float,
+    concurrency: int,
+) -> DrainReport:
+    """Run `action` on every item, at most `concurrency` at a time, for at most `budget` seconds."""
+    items = list(items)
+    report = DrainReport(total=len(items))
+    if not items:
+        return report
+
+    start = time.perf_counter()
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(item) -> None:
+        async with gate:
+            try:
+                await action(item)
+            except Exception as e:
+                report.failed += 1
+                METRICS.inc("lfg_shutdown_listings_total", outcome="failed")
+                log.warning("Shutdown action failed for %r: %s", item, e)
+                return
+        report.finished += 1
+        METRICS.inc("lfg_shutdown_listings_total", outcome="finished")
+
+    tasks = [asyncio.create_task(one(item)) for item in items]
+    _, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if pending:
+        METRICS.inc("lfg_shutdown_listings_total", len(pending), outcome="unfinished")
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+class GracefulShutdown:
+    """
+    - `install(loop)` routes SIGTERM and SIGINT to `trigger()` (no-op where the loop
+      doesn't support signal handlers, e.g. Windows).
+    - `trigger(reason)` sets `draining` and starts `on_shutdown(reason)` once; further
+      signals while draining are ignored.
+    """
+
+    def __init__(self, on_shutdown: Callable[[str], Awaitable[None]]):
+        self._on_shutdown = on_shutdown
+        self.draining = False
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self, loop: asyncio.AbstractEventLoop, signals=(signal.SIGTERM, signal.SIGINT)) -> None:
+        for sig in signals:
+            try:
+                loop.add_signal_handler(sig, self.trigger, sig.name)
+            except (NotImplementedError, RuntimeError):
+                log.debug("Signal handlers unavailable; %s keeps its default behaviour", sig.name)
+
+    def trigger(self, reason: str = "shutdown") -> Optional[asyncio.Task]:
+        if self.draining:
+            log.info("Already draining, ignoring %s", reason)
+            return self._task
+        self.draining = True
+        self._task = asyncio.get_running_loop().create_task(self._on_shutdown(reason), name="graceful-shutdown")
+        return self._task
@@ -0,0 +1,367 @@
+"""
+Incrementally maintained /lfgstats rollups.
+
+Every group event from the history log updates a handful of counters as it is written;
+/lfgstats only merges a bounded number of pre-aggregated buckets (12 five-minute slots
+for the last hour, up to 168 hourly slots for the last week, or the all-time totals),
+so answering never depends on how long the history is.
+
+Rollups plus the in-flight state of open groups are checkpointed to a JSON file together
+with the id of the last applied event; on restart only the log tail after that id is
+replayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core.group_state import ROLE_KEYS
+from src.core.history import GroupEvent, HistoryLog
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Key-level buckets: (lowest level, label)
+KEY_BUCKETS = ((2, "2-5"), (6, "6-9"), (10, "10-12"), (13, "13-15"), (16, "16+"))
+
+# Time-to-fill histogram upper bounds (seconds); the last bin is open-ended
+FILL_BOUNDS = (30, 60, 120, 180, 300, 450, 600, 900, 1200, 1800)
+
+# Window name -> (granularity in seconds, number of slots)
+WINDOWS = {"hour": (300, 12), "day": (3600, 24), "week": (3600, 168)}
+
+# Open groups with no close/expire after this long are dropped from in-flight tracking
+MAX_OPEN_AGE = 7 * 24 * 3600
+
+
+def key_bucket(level: int) -> str:
+    label = KEY_BUCKETS[0][1]
+    for low, name in KEY_BUCKETS:
+        if level >= low:
+            label = name
+    return label
+
+
+class Rollup:
+    """Additive counters for one guild over one time slot (or all time)."""
+
+    __slots__ = ("groups", "roles_required", "roles_filled", "fill_bins", "filled", "closed", "expired")
+
+    def __init__(self):
+        self.groups: dict[str, dict[str, int]] = {}  # dungeon -> key bucket -> count
+        self.roles_required = dict.fromkeys(ROLE_KEYS, 0)
+        self.roles_filled = dict.fromkeys(ROLE_KEYS, 0)
+        self.fill_bins = [0] * (len(FILL_BOUNDS) + 1)
+        self.filled = 0
+        self.closed = 0
+        self.expired = 0
+
+    def merge(self, other: "Rollup") -> None:
+        for dungeon, buckets in other.groups.items():
+            mine = self.groups.setdefault(dungeon, {})
+            for bucket, count in buckets.items():
+                mine[bucket] = mine.get(bucket, 0) + count
+        for role in ROLE_KEYS:
+            self.roles_required[role] += other.roles_required[role]
+            self.roles_filled[role] += other.roles_filled[role]
+        self.fill_bins = [a + b for a, b in zip(self.fill_bins, other.fill_bins)]
+        self.filled += other.filled
+        self.closed += other.closed
+        self.expired += other.expired
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rollup":
+        rollup = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(rollup, name, data[name])
+        return rollup
+
+
+class _GuildRollups:
+    __slots__ = ("total", "slots")
+
+    def __init__(self):
+        self.total = Rollup()
+        # granularity -> {slot index: Rollup}
+        self.slots: dict[int, dict[int, Rollup]] = {300: {}, 3600: {}}
+
+    def targets(self, ts: float) -> list[Rollup]:
+        out = [self.total]
+        for granularity, slots in self.slots.items():
+            index = int(ts // granularity)
+            rollup = slots.get(index)
+            if rollup is None:
+                rollup = slots[index] = Rollup()
+                keep = max(n for g, n in WINDOWS.values() if g == granularity)
+                for old in [i for i in slots if i <= index - keep]:
+                    del slots[old]
+            out.append(rollup)
+        return out
+
+
+@dataclass
+class _OpenGroup:
+    """What we need to know about a group still in progress to detect when it fills."""
+    guild_id: Optional[int]
+    created_ts: float
+    creator_id: Optional[int]
+    required: list[str]
+    counted: list[str] = field(default_factory=list)  # required roles already counted
+    filled_roles: list[str] = field(default_factory=list)
+    members: dict[str, str] = field(default_factory=dict)  # user id (str for JSON) -> role
+    filled_at: Optional[float] = None
+
+
+@dataclass
+class StatsSummary:
+    window: str
+    groups: int
+    by_dungeon: dict[str, dict[str, int]]
+    fill_rate: dict[str, Optional[float]]
+    median_fill_seconds: Optional[float]
+    filled: int
+    closed: int
+    expired: int
+
+    @property
+    def expiry_ratio(self) -> Optional[float]:
+        ended = self.closed + self.expired
+        return self.expired / ended if ended else None
+
+
+class StatsRollups:
+    """
+    - `apply(event)` folds one history event into the rollups (idempotent by event id).
+    - `restore(history)` loads the checkpoint and replays the log tail after it.
+    - `summary(guild_id, window)` answers /lfgstats from the pre-aggregated buckets.
+    """
+
+    def __init__(self, checkpoint_path: str | Path, checkpoint_interval: float = 60.0,
+                 accept: Optional[Callable[[Optional[int]], bool]] = None):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.checkpoint_interval = checkpoint_interval
+        # Optional guild filter (e.g. only guilds on this cluster's shards)
+        self.accept = accept
+        self.last_event_id = 0
+        self._guilds: dict[Optional[int], _GuildRollups] = {}
+        self._open: dict[int, _OpenGroup] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    # ---- updates ----
+
+    def apply(self, event: GroupEvent) -> None:
+        if event.id is not None:
+            if event.id <= self.last_event_id:
+                return
+            self.last_event_id = event.id
+        if self.accept is not None and not self.accept(event.guild_id):
+            return
+        self._dirty = True
+
+        guild = self._guilds.get(event.guild_id)
+        if guild is None:
+            guild = self._guilds[event.guild_id] = _GuildRollups()
+        targets = guild.targets(event.ts)
+
+        if event.kind == "create":
+            required = list(event.data.get("required_roles", ()))
+            group = self._open[event.group_id] = _OpenGroup(
+                guild_id=event.guild_id, created_ts=event.ts, creator_id=event.user_id, required=required,
+            )
+            bucket = key_bucket(event.key_level)
+            for rollup in targets:
+                per_dungeon = rollup.groups.setdefault(event.dungeon, {})
+                per_dungeon[bucket] = per_dungeon.get(bucket, 0) + 1
+            self._count_required(group, targets)
+            return
+
+        group = self._open.get(event.group_id)
+        if event.kind in ("close", "expire"):
+            self._open.pop(event.group_id, None)
+            for rollup in targets:
+                if event.kind == "close":
+                    rollup.closed += 1
+                else:
+                    rollup.expired += 1
+            return
+        if group is None:
+            return
+
+        if event.kind == "join" and event.user_id != group.creator_id:
+            group.members[str(event.user_id)] = event.role
+            if event.role in group.required and event.role not in group.filled_roles:
+                group.filled_roles.append(event.role)
+                for rollup in targets:
+                    rollup.roles_filled[event.role] += 1
+        elif event.kind == "leave":
+            group.members.pop(str(event.user_id), None)
+        elif event.kind == "reroles":
+            group.required = list(event.data.get("required_roles", ()))
+            self._count_required(group, targets)
+        self._check_filled(group, event.ts, targets)
+
+    def _count_required(self, group: _OpenGroup, targets: list[Rollup]) -> None:
+        for role in group.required:
+            if role in ROLE_KEYS and role not in group.counted:
+                group.counted.append(role)
+                for rollup in targets:
+                    rollup.roles_required[role] += 1
+
+    def _check_filled(self, group: _OpenGroup, ts: float, targets: list[Rollup]) -> None:
+        if group.filled_at is not None or not group.required:
+            return
+        occupied = set(group.members.values())
+        if not all(role in occupied for role in group.required):
+            return
+        group.filled_at = ts
+        index = bisect_left(FILL_BOUNDS, ts - group.created_ts)
+        for rollup in targets:
+            rollup.filled += 1
+            rollup.fill_bins[index] += 1
+
+    # ---- queries ----
+
+    def summary(self, guild_id: Optional[int], window: str = "week", now: Optional[float] = None) -> StatsSummary:
+        guild = self._guilds.get(guild_id) or _GuildRollups()
+        if window == "all":
+            merged = guild.total
+        else:
+            granularity, count = WINDOWS[window]
+            current = int((now or time.time()) // granularity)
+            merged = Rollup()
+            slots = guild.slots[granularity]
+            for index in range(current - count + 1, current + 1):
+                rollup = slots.get(index)
+                if rollup is not None:
+                    merged.merge(rollup)
+
+        return StatsSummary(
+            window=window,
+            groups=sum(sum(b.values()) for b in merged.groups.values()),
+            by_dungeon=merged.groups,
+            fill_rate={
+                role: (merged.roles_filled[role] / merged.roles_required[role]) if merged.roles_required[role] else None
+                for role in ROLE_KEYS
+            },
+            median_fill_seconds=_histogram_median(merged.fill_bins),
+            filled=merged.filled,
+            closed=merged.closed,
+            expired=merged.expired,
+        )
+
+    # ---- checkpointing ----
+
+    async def restore(self, history: HistoryLog, page: int = 10_000) -> int:
+        """Load the checkpoint (if any), then replay events written after it. Returns events replayed."""
+        if self.checkpoint_path.exists():
+            try:
+                data = await asyncio.to_thread(lambda: json.loads(self.checkpoint_path.read_text()))
+                self._load(data)
+            except Exception as e:
+                log.warning("Ignoring unreadable stats checkpoint %s: %s", self.checkpoint_path, e)
+
+        replayed = 0
+        while True:
+            events = await history.events_since(self.last_event_id, limit=page)
+            for event in events:
+                self.apply(event)
+            replayed += len(events)
+            if len(events) < page:
+                break
+        return replayed
+
+    async def checkpoint(self) -> None:
+        if not self._dirty:
+            return
+        self._dirty = False
+        cutoff = time.time() - MAX_OPEN_AGE
+        for group_id in [g for g, group in self._open.items() if group.created_ts < cutoff]:
+            del self._open[group_id]
+        payload = json.dumps(self._dump())
+        await asyncio.to_thread(_atomic_write, self.checkpoint_path, payload)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._checkpoint_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.checkpoint()
+
+    async def _checkpoint_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                log.error("Stats checkpoint failed: %s", e)
+
+    def _dump(self) -> dict:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "last_event_id": self.last_event_id,
+            "guilds": [
+                {
+                    "guild_id": guild_id,
+                    "total": guild.total.to_dict(),
+                    "slots": {
+                        str(granularity): {str(i): r.to_dict() for i, r in slots.items()}
+                        for granularity, slots in guild.slots.items()
+                    },
+                }
+                for guild_id, guild in self._guilds.items()
+            ],
+            "open": {str(group_id): vars(group) for group_id, group in self._open.items()},
+        }
+
+    def _load(self, data: dict) -> None:
+        if data.get("version") != CHECKPOINT_VERSION:
+            log.warning("Stats checkpoint version mismatch, rebuilding from the full log")
+            return
+        self.last_event_id = data["last_event_id"]
+        self._guilds = {}
+        for entry in data["guilds"]:
+            guild = self._guilds[entry["guild_id"]] = _GuildRollups()
+            guild.total = Rollup.from_dict(entry["total"])
+            for granularity, slots in entry["slots"].items():
+                guild.slots[int(granularity)] = {int(i): Rollup.from_dict(r) for i, r in slots.items()}
+        self._open = {int(group_id): _OpenGroup(**group) for group_id, group in data["open"].items()}
+
+
+def _histogram_median(bins: list[int]) -> Optional[float]:
+    """Median estimate from FILL_BOUNDS bins (linear interpolation inside the median bin)."""
+    total = sum(bins)
+    if not total:
+        return None
+    half = total / 2
+    cumulative = 0
+    for index, count in enumerate(bins):
+        if cumulative + count >= half and count:
+            low = FILL_BOUNDS[index - 1] if index else 0
+            high = FILL_BOUNDS[index] if index < len(FILL_BOUNDS) else FILL_BOUNDS[-1]
+            return low + (high - low) * (half - cumulative) / count
+        cumulative += count
+    return float(FILL_BOUNDS[-1])
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
@@ -0,0 +1,226 @@
+"""
+Durable group store (SQLite, WAL mode).
+
+Holds the state needed to rebuild every open LFGButtonView after a restart.
+All SQLite work runs on a single dedicated thread so the event loop never blocks;
+saves are write-behind and coalesced per message id, then flushed in one transaction.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    message_id     INTEGER PRIMARY KEY,
+    channel_id     INTEGER NOT NULL,
+    guild_id       INTEGER,
+    creator_id     INTEGER NOT NULL,
+    creator_role   TEXT    NOT NULL,
+    required_roles TEXT    NOT NULL,
+    members        TEXT    NOT NULL,
+    context        TEXT    NOT NULL,
+    closed         INTEGER NOT NULL DEFAULT 0,
+    expires_at     REAL    NOT NULL,
+    updated_at     REAL    NOT NULL,
+    waitlist       TEXT    NOT NULL DEFAULT '{}',
+    mirrors        TEXT    NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_groups_open ON groups (closed, expires_at);
+"""
+
+# Columns added after the first release; stores created before them are migrated on open
+_ADDED_COLUMNS = {
+    "waitlist": "TEXT NOT NULL DEFAULT '{}'",
+    "mirrors": "TEXT NOT NULL DEFAULT '[]'",
+}
+
+_UPSERT = """
+INSERT INTO groups (message_id, channel_id, guild_id, creator_id, creator_role,
+                    required_roles, members, context, closed, expires_at, updated_at, waitlist,
+                    mirrors)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(message_id) DO UPDATE SET
+    channel_id=excluded.channel_id, guild_id=excluded.guild_id,
+    creator_id=excluded.creator_id, creator_role=excluded.creator_role,
+    required_roles=excluded.required_roles, members=excluded.members,
+    context=excluded.context, closed=excluded.closed,
+    expires_at=excluded.expires_at, updated_at=excluded.updated_at,
+    waitlist=excluded.waitlist, mirrors=excluded.mirrors
+"""
+
+
+@dataclass
+class GroupRecord:
+    """Serializable snapshot of one listing."""
+    message_id: int
+    channel_id: int
+    guild_id: Optional[int]
+    creator_id: int
+    creator_role: str
+    required_roles: list[str]
+    members: dict[str, list[Any]]
+    context: dict[str, Any]
+    expires_at: float
+    closed: bool = False
+    updated_at: float = field(default_factory=time.time)
+    # role -> user ids waiting for a spot, oldest first
+    waitlist: dict[str, list[int]] = field(default_factory=dict)
+    # [channel id, message id] of each mirrored copy
+    mirrors: list[list[int]] = field(default_factory=list)
+
+    def to_row(self) -> tuple:
+        return (
+            self.message_id, self.channel_id, self.guild_id, self.creator_id, self.creator_role,
+            json.dumps(self.required_roles), json.dumps(self.members), json.dumps(self.context),
+            int(self.closed), self.expires_at, self.updated_at,
+            json.dumps(self.waitlist), json.dumps(self.mirrors),
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "GroupRecord":
+        (message_id, channel_id, guild_id, creator_id, creator_role,
+         required_roles, members, context, closed, expires_at, updated_at, waitlist, mirrors) = row
+        return cls(
+            message_id=message_id,
+            channel_id=channel_id,
+            guild_id=guild_id,
+            creator_id=creator_id,
+            creator_role=creator_role,
+            required_roles=json.loads(required_roles),
+            members=json.loads(members),
+            context=json.loads(context),
+            closed=bool(closed),
+            expires_at=expires_at,
+            updated_at=updated_at,
+            waitlist=json.loads(waitlist),
+            mirrors=json.loads(mirrors),
+        )
+
+
+class GroupStore:
+    """
+    Async facade over a single SQLite connection owned by one worker thread.
+
+    `save()` is write-behind: the latest record per message id is kept in memory and
+    flushed after `flush_delay` seconds, so a burst of clicks on one listing costs one row write.
+    Saves before `open()` wait in memory for the first flush after it; a batch whose write
+    fails (e.g. SQLITE_BUSY from another cluster process) goes back to the queue and is retried.
+    """
+
+    def __init__(self, path: str | Path, flush_delay: float = 0.5):
+        self.path = Path(path)
+        self.flush_delay = flush_delay
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="group-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: dict[int, GroupRecord] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ---- lifecycle ----
+
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+        if self._pending:
+            self._schedule_flush()
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    # ---- writes ----
+
+    def save(self, record: GroupRecord) -> None:
+        """Queue a snapshot for persistence (non-blocking, coalesced per message)."""
+        record.updated_at = time.time()
+        self._pending[record.message_id] = record
+        self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Write every pending snapshot in one transaction."""
+        if not self._pending or not self.is_open:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            await self._run(self._write_sync, [r.to_row() for r in batch.values()])
+        except BaseException:
+            # Back in the queue, unless the listing was saved again while we were writing
+            for message_id, record in batch.items():
+                self._pending.setdefault(message_id, record)
+            raise
+
+    # ---- reads ----
+
+    async def load_open(self, shard_count: int = 1, shard_ids: Optional[list[int]] = None) -> list[GroupRecord]:
+        """
+        Return every listing that isn't closed (expired ones included, callers expire them).
+        With sharding, only guilds owned by `shard_ids` are returned, so each cluster
+        process rehydrates its own partition of the shared store.
+        """
+        rows = await self._run(self._load_open_sync, shard_count, shard_ids)
+        return [GroupRecord.from_row(r) for r in rows]
+
+    # ---- internal ----
+
+    def _schedule_flush(self) -> None:
+        if self.is_open and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            log.error("Group store flush failed (%d listings kept for a retry): %s", len(self._pending), e)
+            self._flush_task = None
+            self._schedule_flush()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _open_sync(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # WAL lets several cluster processes share one store file
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(groups)")}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE groups ADD COLUMN {name} {definition}")
+        conn.commit()
+        self._conn = conn
+
+    def _write_sync(self, rows: list[tuple]) -> None:
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+
+    def _load_open_sync(self, shard_count: int, shard_ids: Optional[list[int]]) -> list[tuple]:
+        sql = (
+            "SELECT message_id, channel_id, guild_id, creator_id, creator_role, required_roles,"
+            " members, context, closed, expires_at, updated_at, waitlist, mirrors"
+            " FROM groups WHERE closed = 0"
+        )
+        params: list = []
+        if shard_ids is not None and shard_count > 1:
+            # Same formula Discord uses to route a guild to a shard; DMs (NULL guild) belong to shard 0
+            sql += f" AND (COALESCE(guild_id, 0) >> 22) % ? IN ({','.join('?' * len(shard_ids))})"
+            params = [shard_count, *shard_ids]
+        return self._conn.execute(sql + " ORDER BY expires_at", params).fetchall()
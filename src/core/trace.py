@@ -0,0 +1,226 @@
+"""
+Opt-in interaction trace recorder (TRACE_FILE) for offline replay.
+
+Every interaction handler span becomes one JSONL line. Each line has the interaction's
+shape, timing and the REST calls it made:
+    {"t": 12.345, "kind": "component", "handler": "join_role", "custom_id": "tank",
+     "component_type": 2, "user": "3f9a…", "guild": "…", "channel": "…", "message": "…",
+     "handler_ms": 41.2, "rest": [["POST /interactions/{interaction_id}/{interaction_token}/callback", 38.9]]}
+Commands carry "command" and "options", selects and modals carry "values", and spans that
+posted listings carry "created" (their message hashes). `t` and REST offsets come from the
+monotonic clock, relative to the recorder start and to the interaction's receipt.
+
+User, guild, channel and message ids are replaced by a keyed hash. The key is random per
+recorder and never written, so hashes are stable within one trace but can't be matched
+back to ids. The /lfg passphrase is not recorded. Each run starts with a header line.
+
+`benchmarks/replay.py` feeds a trace back through the handlers against the offline fakes.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from src.core.metrics import CURRENT_HANDLER
+
+log = logging.getLogger(__name__)
+
+TRACE_FORMAT = "lfg-trace"
+TRACE_VERSION = 1
+
+# Command options never written to a trace
+REDACTED_OPTIONS = frozenset({"passphrase"})
+
+
+class TraceEntry:
+    """One interaction while its handler runs; becomes a trace line when the span ends."""
+
+    __slots__ = ("recorder", "received_at", "record", "rest", "created")
+
+    def __init__(self, recorder: Optional["TraceRecorder"], received_at: float, record: dict[str, Any]):
+        self.recorder = recorder
+        self.received_at = received_at
+        self.record = record
+        self.rest: list[list[Any]] = []
+        self.created: list[int] = []
+
+    def cancel(self) -> None:
+        """Called by handler_span when the handler returns (the SPAN_START_HOOKS handle protocol)."""
+        CURRENT_TRACE.set(None)
+        if self.recorder is not None:
+            self.recorder.finish(self)
+
+
+# The trace entry of the interaction whose handler is running in this task
+CURRENT_TRACE: contextvars.ContextVar[Optional[TraceEntry]] = contextvars.ContextVar("lfg_current_trace", default=None)
+
+
+def note_listing(message_id: int) -> None:
+    """Mark the running interaction as having posted a listing (so replays can map later clicks)."""
+    entry = CURRENT_TRACE.get()
+    if entry is not None:
+        entry.created.append(message_id)
+
+
+def on_rest(route: str) -> None:
+    """REST hook: attach the call to the running interaction's entry."""
+    entry = CURRENT_TRACE.get()
+    if entry is not None:
+        entry.rest.append([route, round((time.perf_counter() - entry.received_at) * 1000, 2)])
+
+
+class TraceRecorder:
+    """
+    `start_span(interaction, received_at)` is a SPAN_START_HOOKS hook: it opens an entry for
+    the interaction and returns it, and the entry is written when the span ends. Lines are
+    buffered and flushed every `flush_every` entries and on `close()`.
+    """
+
+    def __init__(self, path: str | Path, flush_every: int = 100):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.entries = 0
+        self._key = os.urandom(16)
+        self._origin = time.perf_counter()
+        self._file: Optional[IO[str]] = None
+        self._unflushed = 0
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._write({"format": TRACE_FORMAT, "version": TRACE_VERSION, "started_at": round(time.time(), 3)})
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def hash(self, value: Optional[int]) -> Optional[str]:
+        if value is None:
+            return None
+        return hashlib.blake2b(str(value).encode(), key=self._key, digest_size=8).hexdigest()
+
+    # ---- hooks ----
+
+    def start_span(self, interaction: Any, received_at: float) -> Optional[TraceEntry]:
+        if self._file is None or CURRENT_TRACE.get() is not None or getattr(interaction, "id", None) is None:
+            return None
+        entry = TraceEntry(self, received_at, self._describe(interaction, received_at))
+        CURRENT_TRACE.set(entry)
+        return entry
+
+    def finish(self, entry: TraceEntry) -> None:
+        if self._file is None:
+            return
+        record = entry.record
+        record["handler_ms"] = round((time.perf_counter() - entry.received_at) * 1000, 2)
+        if entry.created:
+            record["created"] = [self.hash(message_id) for message_id in entry.created]
+        record["rest"] = entry.rest
+        self._write(record)
+        self.entries += 1
+
+    # ---- internal ----
+
+    def _describe(self, interaction: Any, received_at: float) -> dict[str, Any]:
+        data = getattr(interaction, "data", None) or {}
+        kind = getattr(getattr(interaction, "type", None), "name", "unknown")
+        message = getattr(interaction, "message", None)
+        record: dict[str, Any] = {
+            "t": round(received_at - self._origin, 4),
+            "kind": kind,
+            "handler": _span_name(),
+            "user": self.hash(getattr(interaction.user, "id", None)),
+            "guild": self.hash(getattr(interaction, "guild_id", None)),
+            "channel": self.hash(getattr(interaction, "channel_id", None)),
+            "message": self.hash(message.id) if message is not None else None,
+        }
+        if kind == "application_command":
+            command = getattr(interaction, "command", None)
+            record["command"] = command.qualified_name if command is not None else data.get("name")
+            record["options"] = {
+                name: value for name, value in _leaf_options(data.get("options", ()))
+                if name not in REDACTED_OPTIONS
+            }
+        elif kind == "component":
+            record["custom_id"] = data.get("custom_id")
+            record["component_type"] = data.get("component_type")
+            if "values" in data:
+                record["values"] = list(data["values"])
+        elif kind == "modal_submit":
+            record["custom_id"] = data.get("custom_id")
+            record["values"] = [
+                component.get("value")
+                for row in data.get("components", ())
+                for component in row.get("components", ())
+            ]
+        return record
+
+    def _write(self, record: dict[str, Any]) -> None:
+        try:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+        except OSError as e:
+            log.warning("Trace write to %s failed, recording stopped: %s", self.path, e)
+            self.close()
+
+
+def _span_name() -> Optional[str]:
+    span = CURRENT_HANDLER.get()
+    return span[0] if span else None
+
+
+def _leaf_options(options) -> list[tuple[str, Any]]:
+    """Flatten subcommand (group) nesting: [(option name, value)] of the actual arguments."""
+    leaves = []
+    for option in options:
+        if "options" in option and option.get("type") in (1, 2):
+            leaves.extend(_leaf_options(option["options"]))
+        elif "value" in option:
+            leaves.append((option["name"], option["value"]))
+    return leaves
+
+
+def read_trace(path: str | Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    (first header, entries sorted by t) of a trace file. A file appended to by several runs
+    has a header per run; each run's entries are shifted to start after the previous run's.
+    """
+    header: dict[str, Any] = {}
+    entries: list[dict[str, Any]] = []
+    session: list[dict[str, Any]] = []
+    offset = 0.0
+
+    def close_session():
+        nonlocal offset
+        session.sort(key=lambda record: record["t"])
+        for record in session:
+            record["t"] = round(record["t"] + offset, 4)
+        if session:
+            offset = session[-1]["t"]
+        entries.extend(session)
+        session.clear()
+
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("format") == TRACE_FORMAT:
+                close_session()
+                header = header or record
+            else:
+                session.append(record)
+    close_session()
+    return header, entries